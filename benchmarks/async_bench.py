@@ -0,0 +1,189 @@
+"""
+Concurrent-connection throughput of the sync and async deployments.
+
+    python benchmarks/async_bench.py --scale 20 --workers 2 --connections 10,50,200 --duration 10
+    python benchmarks/async_bench.py --slow-clients 8 --slow-delay 2
+
+Seeds a scratch database (seed_portal --scale) and runs each server on it
+in turn: gunicorn sync workers on the WSGI app, as deployed today, and
+uvicorn workers on the ASGI app with ASYNC_API_VIEWS on (portal.async_views).
+Each level of --connections opens that many keep-alive connections
+(asyncio, one per seeded student) that alternate the internship list and
+my_applications for --duration seconds, and reports throughput and
+latency. With --slow-clients, that many extra connections meanwhile send
+their request headers a line at a time over --slow-delay seconds, as
+clients on poor networks do: each holds a sync worker for that long, but
+costs an async worker nothing while it waits.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import BASE_DIR, setup_django, summarize  # noqa: E402
+
+PATHS = ('/api/internships/', '/api/applications/my_applications/')
+
+
+def server_command(mode, workers, port):
+    if mode == 'sync':
+        return [
+            sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+            '--log-level', 'warning', 'intern_portal.wsgi:application',
+        ], {}
+    return [
+        sys.executable, '-m', 'uvicorn', 'intern_portal.asgi:application', '--workers', str(workers),
+        '--host', '127.0.0.1', '--port', str(port), '--no-access-log', '--log-level', 'warning',
+    ], {'ASYNC_API_VIEWS': 'True'}
+
+
+def start_server(mode, workers, port):
+    command, extra_env = server_command(mode, workers, port)
+    env = dict(os.environ, DEBUG='False', **extra_env)
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/healthz', timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode} server did not start')
+
+
+async def fetch(reader, writer, request):
+    """Send ``request`` and read the response: (status, keep-alive)."""
+    writer.write(request)
+    await writer.drain()
+    head = (await reader.readuntil(b'\r\n\r\n')).lower()
+    status = int(head.split(b' ', 2)[1])
+    headers = dict(line.split(b': ', 1) for line in head.split(b'\r\n')[1:] if b': ' in line)
+    if headers.get(b'transfer-encoding') == b'chunked':
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    else:
+        await reader.readexactly(int(headers.get(b'content-length', 0)))
+    return status, headers.get(b'connection') != b'close'
+
+
+def request_lines(path, token):
+    return [
+        f'GET {path} HTTP/1.1\r\n'.encode(),
+        b'Host: localhost\r\n',
+        f'Authorization: Bearer {token}\r\n'.encode(),
+        b'Accept: application/json\r\n',
+        b'\r\n',
+    ]
+
+
+async def client(port, token, deadline, samples, errors):
+    requests = [b''.join(request_lines(path, token)) for path in PATHS]
+    reader = writer = None
+    number = 0
+    while time.monotonic() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        start = time.perf_counter()
+        try:
+            status, keep_alive = await fetch(reader, writer, requests[number % len(requests)])
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status, keep_alive = None, False
+        samples.append((time.perf_counter() - start) * 1000)
+        if status != 200:
+            errors.append(status)
+        if not keep_alive:
+            writer.close()
+            writer = None
+        number += 1
+    if writer is not None:
+        writer.close()
+
+
+async def slow_client(port, token, deadline, delay):
+    lines = request_lines(PATHS[0], token)
+    while time.monotonic() < deadline:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            for line in lines[:-1]:
+                writer.write(line)
+                await writer.drain()
+                await asyncio.sleep(delay / (len(lines) - 1))
+            await fetch(reader, writer, lines[-1])
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            pass
+        writer.close()
+
+
+async def run_level(port, tokens, connections, args):
+    samples, errors = [], []
+    deadline = time.monotonic() + args.duration
+    started = time.monotonic()
+    tasks = [
+        client(port, tokens[number % len(tokens)], deadline, samples, errors) for number in range(connections)
+    ] + [
+        slow_client(port, tokens[number % len(tokens)], deadline, args.slow_delay)
+        for number in range(args.slow_clients)
+    ]
+    await asyncio.gather(*tasks)
+    return samples, errors, time.monotonic() - started
+
+
+def student_tokens(count):
+    from django.contrib.auth.models import User
+    from portal.serializers import PortalTokenObtainPairSerializer
+
+    users = User.objects.filter(username__startswith='seed_student_').order_by('pk')[:count]
+    return [str(PortalTokenObtainPairSerializer.get_token(user).access_token) for user in users]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=20, help='seed_portal --scale units')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes per server')
+    parser.add_argument('--connections', default='10,50,200', help='Comma-separated concurrency levels')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per level')
+    parser.add_argument('--slow-clients', type=int, default=0)
+    parser.add_argument('--slow-delay', type=float, default=2, help='Seconds a slow client takes to send its headers')
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    levels = [int(level) for level in args.connections.split(',')]
+
+    setup_django('async')
+    from django.core.management import call_command
+
+    print(f'Seeding --scale {args.scale}...', flush=True)
+    call_command('seed_portal', '--scale', str(args.scale), verbosity=0)
+    tokens = student_tokens(max(levels))
+
+    print(
+        f'{"mode":<6} {"conns":>6} {"reqs":>8} {"errors":>7} {"req/s":>9} '
+        f'{"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}'
+    )
+    for mode in args.modes.split(','):
+        server = start_server(mode, args.workers, args.port)
+        try:
+            for connections in levels:
+                samples, errors, elapsed = asyncio.run(run_level(args.port, tokens, connections, args))
+                stats = summarize(samples) if samples else dict.fromkeys(('p50', 'p95', 'p99'), 0)
+                print(
+                    f'{mode:<6} {connections:>6} {len(samples):>8} {len(errors):>7} {len(samples) / elapsed:>9.1f} '
+                    f'{stats["p50"]:>9.2f} {stats["p95"]:>9.2f} {stats["p99"]:>9.2f}',
+                    flush=True
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
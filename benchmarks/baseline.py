@@ -0,0 +1,52 @@
+"""
+Stored per-endpoint results to compare benchmark runs against.
+
+benchmarks/baseline.json holds one section per suite ('api' for the
+pytest-benchmark suite, 'load' for load_test.py), each mapping an
+endpoint name to its p50/p95/p99 latency in milliseconds and, where
+measured, its query count. Query counts do not depend on the machine,
+so any increase is a regression. Latencies do, so only p50 and p95 (p99
+is too noisy over short runs) are compared, with a tolerance factor, and
+in the pytest suite only when asked to.
+"""
+import json
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).resolve().with_name('baseline.json')
+# A latency regresses when it exceeds the baseline by this factor
+DEFAULT_TOLERANCE = 1.5
+
+
+def load(path=BASELINE_PATH):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save(section, results, path=BASELINE_PATH, **meta):
+    """Replace ``section`` of the baseline file with ``results`` (plus ``meta``)."""
+    path = Path(path)
+    data = load(path)
+    data[section] = {'meta': meta, 'endpoints': results}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + '\n')
+
+
+def regressions(name, current, expected, tolerance=DEFAULT_TOLERANCE, latency=True):
+    """Human-readable regressions of one endpoint's ``current`` results."""
+    if not expected:
+        return []
+    problems = []
+    if 'queries' in expected and current.get('queries', 0) > expected['queries']:
+        problems.append(f'{name}: {current["queries"]} queries, baseline {expected["queries"]}')
+    if latency:
+        for key in ('p50_ms', 'p95_ms'):
+            if key in expected and current[key] > expected[key] * tolerance:
+                problems.append(
+                    f'{name}: {key} {current[key]:.2f}, baseline {expected[key]:.2f} (x{tolerance} allowed)'
+                )
+    return problems
+
+
+def endpoints(section, path=BASELINE_PATH):
+    return load(path).get(section, {}).get('endpoints', {})
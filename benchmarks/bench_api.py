@@ -0,0 +1,78 @@
+"""
+Latency and query counts of the main API endpoints (pytest-benchmark).
+
+    pytest benchmarks/bench_api.py [--scale 20] [--rounds 50] [--compare-latency] [--save-baseline]
+
+Requests go through the full Django stack. Each endpoint's query count
+must not exceed benchmarks/baseline.json; with --compare-latency its
+p50/p95/p99 are checked too (see benchmarks/baseline.py).
+"""
+import itertools
+
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+SEARCHES = ['python', 'machine learning', 'react', 'docker kubernetes']
+
+
+def test_list_internships(measure, anonymous_client):
+    measure('list_internships', lambda: anonymous_client.get('/api/internships/'), 200)
+
+
+def test_list_internships_student(measure, student_client):
+    measure('list_internships_student', lambda: student_client.get('/api/internships/'), 200)
+
+
+def test_search_internships(measure, student_client):
+    measure(
+        'search_internships',
+        lambda q: student_client.get('/api/internships/', {'q': q}),
+        200,
+        ((q,) for q in itertools.cycle(SEARCHES)),
+    )
+
+
+def test_apply(measure, student_client):
+    from django.contrib.auth.models import User
+    from portal.models import Application, Internship
+
+    # A fresh student, so every round applies to a new internship
+    user = User.objects.get(username='seed_student_0')
+    Application.objects.filter(student=user.profile).delete()
+    internships = Internship.objects.filter(is_active=True).values_list('pk', flat=True)
+    measure(
+        'apply',
+        lambda pk: student_client.post('/api/applications/', {'internship_id': pk, 'cover_letter': 'Hello'}),
+        201,
+        ((pk,) for pk in internships),
+    )
+
+
+def test_update_status(measure, company_client):
+    from portal.models import Application
+
+    application = Application.objects.filter(internship__poster__user__username='seed_company_0').first()
+    measure(
+        'update_status',
+        lambda value: company_client.patch(f'/api/applications/{application.pk}/', {'status': value}),
+        200,
+        ((value,) for value in itertools.cycle(['reviewing', 'shortlisted'])),
+    )
+
+
+def test_my_applications(measure, student_client):
+    measure('my_applications', lambda: student_client.get('/api/applications/my_applications/'), 200)
+
+
+def test_profile(measure, student_client):
+    measure('profile', lambda: student_client.get('/api/profile/'), 200)
+
+
+def test_update_profile(measure, student_client):
+    measure(
+        'update_profile',
+        lambda bio: student_client.patch('/api/profile/', {'bio': bio}),
+        200,
+        ((f'Bio {n}',) for n in itertools.count()),
+    )
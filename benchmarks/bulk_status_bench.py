@@ -0,0 +1,78 @@
+"""
+Compare updating many application statuses one PATCH at a time with a
+single bulk_status request.
+
+    python benchmarks/bulk_status_bench.py --applications 500
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+
+
+def seed(applications):
+    from django.contrib.auth.models import User
+    from portal.models import Application, Internship, Profile
+
+    company = User.objects.create_user(username='bench_company', password='x').profile
+    company.role = 'company'
+    company.save()
+    internship = Internship.objects.create(
+        poster=company,
+        title='Bench Intern',
+        description='Benchmark internship',
+        skills_required='Python',
+        stipend=10000,
+        duration='3 months',
+        location='Pune',
+        last_date=date.today() + timedelta(days=30),
+    )
+    users = User.objects.bulk_create([
+        User(username=f'bench_student_{i}') for i in range(applications)
+    ])
+    profiles = Profile.objects.bulk_create([Profile(user=user, role='student') for user in users])
+    Application.objects.bulk_create([
+        Application(internship=internship, student=profile, cover_letter='Hello')
+        for profile in profiles
+    ])
+    return company.user, list(Application.objects.values_list('pk', flat=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--applications', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django('bulk_status')
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from portal.serializers import PortalTokenObtainPairSerializer
+
+    print(f'Seeding {args.applications} applications...', flush=True)
+    user, ids = seed(args.applications)
+    token = PortalTokenObtainPairSerializer.get_token(user)
+    client = APIClient(HTTP_HOST='localhost')
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        for pk in ids:
+            client.patch(f'/api/applications/{pk}/', {'status': 'reviewing'}, format='json')
+        elapsed = (time.perf_counter() - start) * 1000
+    print(f'{"per-id PATCH":<14} {len(ids):>5} requests {len(queries):>6} queries {elapsed:>9.1f} ms')
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        client.post('/api/applications/bulk_status/', {'status': 'shortlisted', 'ids': ids}, format='json')
+        elapsed = (time.perf_counter() - start) * 1000
+    print(f'{"bulk_status":<14} {1:>5} requests {len(queries):>6} queries {elapsed:>9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Measure public internship list latency with and without the response cache.
+
+    python benchmarks/cache_bench.py --internships 20000
+
+Requests go through the full Django stack (middleware, view, renderer).
+Misses are forced by bumping the listing generation before each request.
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django, summarize, timed  # noqa: E402
+
+QUERIES = (
+    {},
+    {'remote': 'true'},
+    {'skills': 'python,django'},
+    {'q': 'backend', 'page': '2'},
+)
+
+
+def seed(internships):
+    from django.contrib.auth.models import User
+    from portal.models import Internship
+    from portal.search import rebuild_index
+    from portal.skills import sync_internship_skills
+
+    company = User.objects.create_user(username='bench_company', password='x').profile
+    company.role = 'company'
+    company.company_name = 'Bench Corp'
+    company.save()
+
+    skills = ('Python, Django', 'React, JavaScript', 'Java, Spring', 'SQL, Python')
+    Internship.objects.bulk_create([
+        Internship(
+            poster=company,
+            title=f'{"Backend" if i % 3 else "Frontend"} Intern {i}',
+            description='Benchmark internship',
+            skills_required=skills[i % len(skills)],
+            stipend=10000,
+            duration='3 months',
+            location='Pune',
+            remote=i % 2 == 0,
+            last_date=date.today() + timedelta(days=30),
+        )
+        for i in range(internships)
+    ], batch_size=5000)
+    rebuild_index()
+    for internship in Internship.objects.all():
+        sync_internship_skills(internship)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--internships', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django('cache')
+    from django.core.cache import cache
+    from django.test import Client
+    from portal.caching import invalidate_internship_responses
+
+    print(f'Seeding {args.internships} internships...', flush=True)
+    seed(args.internships)
+    cache.clear()
+    client = Client(HTTP_HOST='localhost')
+
+    for params in QUERIES:
+        def miss():
+            invalidate_internship_responses()
+            client.get('/api/internships/', params)
+
+        cold = summarize(timed(miss, args.repeat))
+        client.get('/api/internships/', params)
+        warm = summarize(timed(lambda: client.get('/api/internships/', params), args.repeat))
+        label = '&'.join(f'{name}={value}' for name, value in params.items()) or '(none)'
+        print(
+            f'{label:<24} miss p50 {cold["p50"]:7.2f} ms  p95 {cold["p95"]:7.2f} ms   '
+            f'hit p50 {warm["p50"]:6.2f} ms  p95 {warm["p95"]:6.2f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
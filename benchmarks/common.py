@@ -0,0 +1,57 @@
+"""
+Shared helpers for the standalone benchmark scripts.
+
+Benchmarks never touch the development database: unless DATABASE_URL is
+already set (e.g. to a scratch PostgreSQL database) they run against a
+throwaway SQLite file.
+"""
+import os
+import sys
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(name='bench'):
+    """Point Django at a scratch database, set it up and migrate it."""
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    if 'DATABASE_URL' not in os.environ:
+        db_path = Path(tempfile.gettempdir()) / f'internship_portal_{name}.sqlite3'
+        if db_path.exists():
+            db_path.unlink()
+        os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intern_portal.settings')
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command('migrate', verbosity=0, interactive=False)
+
+
+def timed(fn, repeat):
+    """Run ``fn`` ``repeat`` times and return the durations in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        'p50': statistics.median(samples),
+        'p95': percentile(samples, 95),
+        'p99': percentile(samples, 99),
+    }
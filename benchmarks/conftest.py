@@ -0,0 +1,122 @@
+"""
+Fixtures for the pytest-benchmark suite (bench_*.py).
+
+The suite runs in pytest-django's test database (in-memory SQLite, or
+a test_ copy of DATABASE_URL), seeded once per session with
+``seed_portal --scale``.
+"""
+import itertools
+import os
+import sys
+from io import StringIO
+from pathlib import Path
+
+import django
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intern_portal.settings')
+# pytest-django only sets Django up itself when configured before conftests load
+django.setup()
+
+from benchmarks import baseline  # noqa: E402
+from benchmarks.common import summarize  # noqa: E402
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('portal benchmarks')
+    group.addoption('--scale', type=int, default=20, help='seed_portal --scale units to benchmark against')
+    group.addoption('--rounds', type=int, default=50, help='Timed requests per endpoint')
+    group.addoption('--baseline', default=str(baseline.BASELINE_PATH), help='Baseline JSON file')
+    group.addoption(
+        '--compare-latency', action='store_true',
+        help='Also fail on latencies above the baseline (query counts are always compared)'
+    )
+    group.addoption('--tolerance', type=float, default=baseline.DEFAULT_TOLERANCE)
+    group.addoption('--save-baseline', action='store_true', help='Record this run as the baseline')
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker, request):
+    from django.core.management import call_command
+    with django_db_blocker.unblock():
+        call_command('seed_portal', '--scale', str(request.config.getoption('scale')), stdout=StringIO())
+
+
+def api_client(username):
+    from rest_framework.test import APIClient
+    from django.contrib.auth.models import User
+    from portal.serializers import PortalTokenObtainPairSerializer
+
+    token = PortalTokenObtainPairSerializer.get_token(User.objects.get(username=username))
+    client = APIClient(HTTP_HOST='localhost')
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+    return client
+
+
+@pytest.fixture
+def anonymous_client():
+    from rest_framework.test import APIClient
+    return APIClient(HTTP_HOST='localhost')
+
+
+@pytest.fixture
+def student_client(db):
+    return api_client('seed_student_0')
+
+
+@pytest.fixture
+def company_client(db):
+    return api_client('seed_company_0')
+
+
+@pytest.fixture(scope='session')
+def results(request):
+    """Results of this run by endpoint; saved as the baseline on request."""
+    collected = {}
+    yield collected
+    config = request.config
+    if config.getoption('save_baseline') and collected:
+        baseline.save('api', collected, config.getoption('baseline'), scale=config.getoption('scale'))
+
+
+@pytest.fixture
+def measure(benchmark, results, request):
+    """
+    measure(name, call, expected_status, arguments=None): count the
+    queries of one ``call``, time ``--rounds`` more (each given the next
+    tuple from ``arguments``), record p50/p95/p99 and compare them with
+    the baseline.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    config = request.config
+
+    def run(name, call, expected_status, arguments=None):
+        arguments = iter(arguments or itertools.repeat(()))
+
+        def checked(*args):
+            response = call(*args)
+            assert response.status_code == expected_status, response.content[:300]
+
+        with CaptureQueriesContext(connection) as queries:
+            checked(*next(arguments))
+        # Before the next request resets the connection's query log
+        query_count = len(queries)
+        benchmark.pedantic(checked, setup=lambda: (next(arguments), {}), rounds=config.getoption('rounds'))
+
+        stats = summarize([seconds * 1000 for seconds in benchmark.stats.stats.data])
+        result = {f'{key}_ms': round(value, 3) for key, value in stats.items()}
+        result['queries'] = query_count
+        results[name] = result
+        benchmark.extra_info.update(result)
+
+        expected = baseline.endpoints('api', config.getoption('baseline')).get(name)
+        problems = baseline.regressions(
+            name, result, expected, config.getoption('tolerance'), latency=config.getoption('compare_latency')
+        )
+        if problems and not config.getoption('save_baseline'):
+            pytest.fail('\n'.join(problems))
+        return result
+    return run
@@ -0,0 +1,89 @@
+"""
+Measure time and peak Python memory of the streaming application export.
+
+    python benchmarks/export_bench.py --applications 2000 20000
+
+Peak memory is traced while the response is consumed chunk by chunk, as a
+WSGI server would, and should stay flat as the applicant count grows.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+
+
+def seed(applications):
+    from django.contrib.auth.models import User
+    from portal.models import Application, Internship, Profile
+
+    Application.objects.all().delete()
+    Profile.objects.filter(role='student').delete()
+    User.objects.filter(username__startswith='bench_student_').delete()
+
+    company = Profile.objects.filter(role='company').first()
+    if company is None:
+        company = User.objects.create_user(username='bench_company', password='x').profile
+        company.role = 'company'
+        company.save()
+    internship = Internship.objects.filter(poster=company).first() or Internship.objects.create(
+        poster=company,
+        title='Bench Intern',
+        description='Benchmark internship',
+        skills_required='Python',
+        stipend=10000,
+        duration='3 months',
+        location='Pune',
+        last_date=date.today() + timedelta(days=30),
+    )
+    users = User.objects.bulk_create([
+        User(username=f'bench_student_{i}', email=f'student{i}@example.com', first_name='Bench')
+        for i in range(applications)
+    ], batch_size=5000)
+    profiles = Profile.objects.bulk_create([
+        Profile(user=user, role='student', college='Bench College', skills='Python, SQL', cv=f'cvs/{user.pk}.pdf')
+        for user in users
+    ], batch_size=5000)
+    Application.objects.bulk_create([
+        Application(internship=internship, student=profile, cover_letter='Hello ' * 50)
+        for profile in profiles
+    ], batch_size=5000)
+    return internship
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--applications', type=int, nargs='+', default=[2000, 20000])
+    args = parser.parse_args()
+
+    setup_django('export')
+    from django.test import RequestFactory
+    from portal.exports import export_response
+    from portal.models import Application
+
+    for count in args.applications:
+        internship = seed(count)
+        request = RequestFactory().get('/', HTTP_HOST='localhost')
+        for output in ('csv', 'ndjson'):
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = export_response(
+                Application.objects.filter(internship=internship), request, output, 'bench'
+            )
+            size = sum(len(chunk) for chunk in response.streaming_content)
+            elapsed = (time.perf_counter() - start) * 1000
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f'{count:>7} applications {output:<7} {size / 1e6:7.1f} MB out '
+                f'{elapsed:9.1f} ms   peak {peak / 1e6:6.2f} MB'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+Locust-style load test against a running server seeded with seed_portal --scale.
+
+    python manage.py seed_portal --scale 200
+    python benchmarks/load_test.py --url http://localhost:8000 --users 20 --duration 60
+
+Each simulated user logs in as a synthetic student or company (the
+first --companies users are companies) and loops over weighted tasks
+with a short think time, over one keep-alive connection. Per endpoint
+it reports requests, errors, throughput and p50/p95/p99 latency, and
+compares them with the 'load' section of benchmarks/baseline.json
+(--save-baseline records it). Run the server against PostgreSQL
+(DATABASE_URL) for meaningful numbers: SQLite serializes writers and
+fails some of them under concurrent load.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import baseline  # noqa: E402
+from benchmarks.common import summarize  # noqa: E402
+
+SEARCHES = ['python', 'machine learning', 'react', 'docker', 'data analysis', 'marketing']
+STATUSES = ['reviewing', 'shortlisted', 'rejected', 'accepted']
+
+
+class Session:
+    """One simulated user: a keep-alive connection and a bearer token."""
+
+    def __init__(self, url, stats, lock):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.netloc, timeout=30)
+        self.stats = stats
+        self.lock = lock
+        self.token = None
+
+    def request(self, name, method, path, data=None, ok=(200,)):
+        headers = {'Accept': 'application/json'}
+        body = None
+        if data is not None:
+            body = json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            payload, status = b'', None
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.lock:
+            entry = self.stats[name]
+            entry['samples'].append(elapsed)
+            if status not in ok:
+                entry['errors'] += 1
+        if status not in ok or not payload:
+            return None
+        return json.loads(payload)
+
+    def login(self, username, password):
+        data = self.request('login', 'POST', '/api/token/', {'username': username, 'password': password})
+        if data is None:
+            raise RuntimeError(f'Could not log in as {username}')
+        self.token = data['access']
+
+
+def student_tasks(session, rng):
+    internships = []
+
+    def list_internships():
+        data = session.request('list_internships', 'GET', '/api/internships/')
+        if data:
+            internships[:] = [item['id'] for item in data['results']]
+
+    def search():
+        query = urlencode({'q': rng.choice(SEARCHES)})
+        session.request('search_internships', 'GET', f'/api/internships/?{query}')
+
+    def apply():
+        if internships:
+            # 400 when already applied: the request still costs a full round trip
+            session.request(
+                'apply', 'POST', '/api/applications/',
+                {'internship_id': rng.choice(internships), 'cover_letter': 'Load test'}, ok=(201, 400)
+            )
+
+    def profile():
+        session.request('profile', 'GET', '/api/profile/')
+
+    list_internships()
+    return [(list_internships, 5), (search, 3), (apply, 1), (profile, 2)]
+
+
+def company_tasks(session, rng):
+    applications = []
+
+    def list_applications():
+        data = session.request('list_applications', 'GET', '/api/applications/')
+        if data:
+            applications[:] = [item['id'] for item in data['results']]
+
+    def update_status():
+        if applications:
+            session.request(
+                'update_status', 'PATCH', f'/api/applications/{rng.choice(applications)}/',
+                {'status': rng.choice(STATUSES)}
+            )
+
+    def profile():
+        session.request('profile', 'GET', '/api/profile/')
+
+    list_applications()
+    return [(list_applications, 2), (update_status, 3), (profile, 1)]
+
+
+def run_user(number, args, stats, lock, ready, clock):
+    rng = random.Random(args.seed + number)
+    # Logins (a deliberately slow password hash each) happen before the
+    # clock starts and are not part of the results
+    session = Session(args.url, defaultdict(lambda: {'samples': [], 'errors': 0}), lock)
+    try:
+        if number < args.companies:
+            session.login(f'seed_company_{number}', args.password)
+            role = company_tasks
+        else:
+            session.login(f'seed_student_{number - args.companies}', args.password)
+            role = student_tasks
+    except RuntimeError:
+        ready.abort()
+        raise
+    ready.wait()
+    session.stats = stats
+    functions, weights = zip(*role(session, rng))
+    while time.monotonic() < clock['deadline']:
+        rng.choices(functions, weights)[0]()
+        time.sleep(rng.uniform(0, args.think_time))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--companies', type=int, default=2, help='How many of the users are companies')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds')
+    parser.add_argument('--think-time', type=float, default=0.5, help='Maximum pause between tasks, seconds')
+    parser.add_argument('--password', default='password123')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', default=str(baseline.BASELINE_PATH))
+    parser.add_argument('--tolerance', type=float, default=baseline.DEFAULT_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    stats = defaultdict(lambda: {'samples': [], 'errors': 0})
+    lock = threading.Lock()
+    clock = {}
+    # The clock starts once every user has logged in
+    ready = threading.Barrier(
+        args.users + 1, action=lambda: clock.update(deadline=time.monotonic() + args.duration)
+    )
+    threads = [
+        threading.Thread(target=run_user, args=(number, args, stats, lock, ready, clock), daemon=True)
+        for number in range(args.users)
+    ]
+    print(f'Logging in {args.users} users at {args.url}...', flush=True)
+    for thread in threads:
+        thread.start()
+    try:
+        ready.wait()
+    except threading.BrokenBarrierError:
+        sys.exit('Login failed; seed the server with manage.py seed_portal --scale N first.')
+    started = clock['deadline'] - args.duration
+    print(f'Running for {args.duration:.0f}s...', flush=True)
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    results = {}
+    print(f'{"endpoint":<20} {"reqs":>7} {"errors":>7} {"req/s":>8} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}')
+    for name, entry in sorted(stats.items()):
+        summary = summarize(entry['samples'])
+        result = {f'{key}_ms': round(value, 3) for key, value in summary.items()}
+        results[name] = result
+        print(
+            f'{name:<20} {len(entry["samples"]):>7} {entry["errors"]:>7} {len(entry["samples"]) / elapsed:>8.1f} '
+            f'{result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} {result["p99_ms"]:>9.2f}'
+        )
+
+    if args.save_baseline:
+        baseline.save('load', results, args.baseline, users=args.users, duration=args.duration)
+        print(f'Saved baseline to {args.baseline}')
+        return
+    expected = baseline.endpoints('load', args.baseline)
+    problems = [
+        problem for name, result in results.items()
+        for problem in baseline.regressions(name, result, expected.get(name), args.tolerance)
+    ]
+    for problem in problems:
+        print(f'REGRESSION {problem}')
+    errors = sum(entry['errors'] for entry in stats.values())
+    sys.exit(1 if problems or errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure recommendation latency for a student against many active internships.
+
+    python benchmarks/recommend_bench.py --internships 50000
+
+Reports the uncached scoring query and the cached path separately.
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django, summarize, timed  # noqa: E402
+
+SKILLS = [f'skill {i}' for i in range(400)]
+
+
+def seed(internships, rng):
+    from django.contrib.auth.models import User
+    from portal.models import Internship, InternshipSkill
+    from portal.skills import get_or_create_skills
+
+    company = User.objects.create_user(username='bench_company', password='x').profile
+    company.role = 'company'
+    company.save()
+    skill_ids = {skill.name: skill.pk for skill in get_or_create_skills({name: name for name in SKILLS})}
+
+    # Skill popularity is skewed like real listings: a few skills are everywhere
+    weights = [1.0 / (rank + 1) for rank in range(len(SKILLS))]
+    for start in range(0, internships, 5000):
+        batch = []
+        for _ in range(min(5000, internships - start)):
+            skills = set(rng.choices(SKILLS, weights=weights, k=rng.randint(3, 8)))
+            batch.append((Internship(
+                poster=company,
+                title='Bench Intern',
+                description='Benchmark internship',
+                skills_required=', '.join(sorted(skills)),
+                stipend=10000,
+                duration='3 months',
+                location='Pune',
+                last_date=date.today() + timedelta(days=30),
+            ), skills))
+        Internship.objects.bulk_create([internship for internship, _ in batch])
+        InternshipSkill.objects.bulk_create([
+            InternshipSkill(internship=internship, skill_id=skill_ids[name])
+            for internship, skills in batch for name in skills
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--internships', type=int, default=50000)
+    parser.add_argument('--students', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django('recommend')
+    from django.contrib.auth.models import User
+    from portal.recommendations import SkillMatrix, recommend, score_internships
+
+    rng = random.Random(7)
+    print(f'Seeding {args.internships} internships...', flush=True)
+    seed(args.internships, rng)
+
+    profiles = []
+    for i in range(args.students):
+        profile = User.objects.create_user(username=f'bench_student_{i}', password='x').profile
+        profile.skills = ', '.join(rng.sample(SKILLS[:100], 6))
+        profile.save()
+        profiles.append(profile.pk)
+
+    rebuild = timed(SkillMatrix.load, 3)
+    print(f'matrix rebuild p50 {summarize(rebuild)["p50"]:8.2f} ms')
+
+    cold = []
+    for profile_id in profiles:
+        cold += timed(lambda: score_internships(profile_id, args.limit), 3)
+    warm = []
+    for profile_id in profiles:
+        recommend(profile_id, args.limit)
+        warm += timed(lambda: recommend(profile_id, args.limit), 20)
+
+    for label, samples in (('uncached', cold), ('cached', warm)):
+        stats = summarize(samples)
+        print(f'{label:<9} p50 {stats["p50"]:8.2f} ms   p95 {stats["p95"]:8.2f} ms   p99 {stats["p99"]:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Compare full-text search latency against the old LIKE scans.
+
+    python benchmarks/search_bench.py --rows 100000
+
+Each query is timed the way the list endpoint runs it: a COUNT for the
+paginator plus the first page of results.
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django, summarize, timed  # noqa: E402
+
+WORDS = (
+    'python django react javascript java spring docker kubernetes aws linux '
+    'figma design data science machine learning pandas numpy sql postgres '
+    'mobile android ios flutter golang rust devops testing security cloud '
+    'backend frontend fullstack analytics marketing content writing sales'
+).split()
+LOCATIONS = ['Mumbai', 'Bangalore', 'Pune', 'Delhi', 'Hyderabad', 'Chennai']
+QUERIES = ['django', 'machine learning', 'kubernetes aws', 'flutter', 'writing']
+
+
+def seed(rows):
+    from django.contrib.auth.models import User
+    from portal.models import Internship
+    from portal.search import rebuild_index
+
+    rng = random.Random(42)
+    company = User.objects.create_user(username='bench_company', password='x').profile
+    company.role = 'company'
+    company.save()
+
+    # Descriptions are mostly filler vocabulary with a few skill words, so
+    # skill queries are selective the way they are on real listings
+    filler = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9)))
+              for _ in range(5000)]
+
+    batch = []
+    for i in range(rows):
+        description = rng.choices(filler, k=60) + rng.sample(WORDS, 3)
+        rng.shuffle(description)
+        batch.append(Internship(
+            poster=company,
+            title=f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Intern',
+            description=' '.join(description),
+            skills_required=', '.join(rng.sample(WORDS, 4)),
+            stipend=rng.randrange(5000, 40000, 500),
+            duration='3 months',
+            location=rng.choice(LOCATIONS),
+            last_date=date.today() + timedelta(days=30),
+        ))
+        if len(batch) == 5000:
+            Internship.objects.bulk_create(batch)
+            batch = []
+    Internship.objects.bulk_create(batch)
+    rebuild_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django('search')
+    from portal.models import Internship
+    from portal.search import like_search, search_internships
+
+    print(f'Seeding {args.rows} internships...', flush=True)
+    seed(args.rows)
+
+    base = Internship.objects.filter(is_active=True)
+    print(f'{"query":<20} {"engine":<8} {"p50 ms":>9} {"p95 ms":>9} {"hits":>7}')
+    for q in QUERIES:
+        for engine, run_search, ordering in (
+            ('like', like_search, '-created_at'),
+            ('fts', search_internships, '-search_rank'),
+        ):
+            queryset = run_search(base, q).order_by(ordering)
+
+            def page():
+                queryset.count()
+                list(queryset[:10])
+
+            stats = summarize(timed(page, args.repeat))
+            print(f'{q:<20} {engine:<8} {stats["p50"]:>9.2f} {stats["p95"]:>9.2f} {queryset.count():>7}', flush=True)
+
+
+if __name__ == '__main__':
+    main()
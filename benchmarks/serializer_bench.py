@@ -0,0 +1,134 @@
+"""
+Compare payload size and serialization CPU time of list pages: full vs
+compact model serializers vs the .values() serializers, rendered with
+DRF's JSONRenderer and with the orjson renderer.
+
+    python benchmarks/serializer_bench.py --page-size 100
+
+Rows are loaded once up front, so the timings cover serialization and
+JSON rendering only, not database access.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+
+PROFILE_FIELDS = {
+    'bio': 'Computer science student who enjoys building web applications. ' * 4,
+    'skills': 'Python, Django, React, SQL, Docker',
+    'phone': '9876543210',
+    'college': 'Institute of Technology',
+    'degree': 'B.Tech Computer Science',
+    'graduation_year': 2026,
+    'github': 'https://github.com/example',
+    'linkedin': 'https://linkedin.com/in/example',
+    'portfolio': 'https://example.com',
+    'cv': 'cvs/example.pdf',
+    'logo': 'logos/example.png',
+}
+
+
+def seed(rows):
+    from django.contrib.auth.models import User
+    from portal.models import Application, Internship
+
+    company = User.objects.create_user(username='bench_company', password='x').profile
+    company.role = 'company'
+    company.company_name = 'Bench Corp'
+    for field, value in PROFILE_FIELDS.items():
+        setattr(company, field, value)
+    company.save()
+
+    for i in range(rows):
+        internship = Internship.objects.create(
+            poster=company,
+            title=f'Backend Developer Intern {i}',
+            description='Work on scalable backend systems using Django and REST APIs. ' * 6,
+            skills_required='Python, Django, REST API, PostgreSQL, Docker',
+            stipend=18000,
+            duration='6 months',
+            location='Bangalore',
+            last_date=date.today() + timedelta(days=30),
+        )
+        student = User.objects.create_user(username=f'bench_student_{i}', password='x').profile
+        for field, value in PROFILE_FIELDS.items():
+            setattr(student, field, value)
+        student.save()
+        Application.objects.create(
+            internship=internship,
+            student=student,
+            cover_letter='I am excited to apply for this role. ' * 10,
+        )
+
+
+def measure(serialize, renderer, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        body = renderer.render(serialize())
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+    return len(body), cpu_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django('serializers')
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from portal.models import Application
+    from portal.serializers import (
+        ApplicationListSerializer, ApplicationSerializer,
+        InternshipListSerializer, InternshipSerializer,
+    )
+    from portal.fast_serializers import ApplicationListValuesSerializer, InternshipListValuesSerializer
+    from portal.renderers import ORJSONRenderer
+    from portal.views import InternshipViewSet
+    from rest_framework.renderers import JSONRenderer
+
+    print(f'Seeding {args.page_size} internships and applications...', flush=True)
+    seed(args.page_size)
+
+    request = Request(APIRequestFactory().get('/api/internships/', SERVER_NAME='localhost'))
+    view = InternshipViewSet(action='list', request=request, format_kwarg=None, kwargs={})
+    internships = list(view.get_queryset()[:args.page_size])
+    applications = list(
+        Application.objects.select_related('internship__poster__user', 'student__user')[:args.page_size]
+    )
+
+    internship_rows = list(
+        InternshipListValuesSerializer().values(view.get_queryset())[:args.page_size]
+    )
+    application_rows = list(ApplicationListValuesSerializer().values(
+        Application.objects.select_related('internship__poster__user', 'student__user')
+    )[:args.page_size])
+
+    def model_serializer(serializer_class, rows):
+        return lambda: serializer_class(rows, many=True, context={'request': request}).data
+
+    def values_serializer(serializer_class, rows):
+        return lambda: serializer_class(request=request).serialize(rows)
+
+    print(f'{"page":<26} {"renderer":<9} {"bytes":>9} {"bytes/row":>10} {"cpu ms":>8}')
+    for label, serialize in (
+        ('internships (full)', model_serializer(InternshipSerializer, internships)),
+        ('internships (compact)', model_serializer(InternshipListSerializer, internships)),
+        ('internships (values)', values_serializer(InternshipListValuesSerializer, internship_rows)),
+        ('applications (full)', model_serializer(ApplicationSerializer, applications)),
+        ('applications (compact)', model_serializer(ApplicationListSerializer, applications)),
+        ('applications (values)', values_serializer(ApplicationListValuesSerializer, application_rows)),
+    ):
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            size, cpu_ms = measure(serialize, renderer, args.repeat)
+            name = 'orjson' if isinstance(renderer, ORJSONRenderer) else 'json'
+            print(f'{label:<26} {name:<9} {size:>9} {size // args.page_size:>10} {cpu_ms:>8.2f}')
+
+if __name__ == '__main__':
+    main()
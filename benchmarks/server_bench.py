@@ -0,0 +1,123 @@
+"""
+Startup time and memory per worker of the production server settings.
+
+    python benchmarks/server_bench.py --workers 4 --classes sync,gthread,uvicorn
+
+Starts gunicorn with gunicorn.conf.py for each worker class, with and
+without GUNICORN_PRELOAD, on a seeded scratch database. Reports the
+seconds until /healthz first answers, then warms every worker with
+--requests API requests and reads each process's memory from /proc:
+RSS counts pages shared with the master in full in every worker, PSS
+divides them among the processes that share them, and private is what
+each extra worker actually costs (the figure to size
+GUNICORN_WORKER_MEMORY_MB from). Linux only.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import BASE_DIR, setup_django  # noqa: E402
+
+PATHS = ('/api/internships/', '/api/applications/my_applications/')
+
+
+def memory_mb(pid):
+    """(rss, pss, private) of a process, in MB."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    private = fields['Private_Clean'] + fields['Private_Dirty']
+    return fields['Rss'] / 1024, fields['Pss'] / 1024, private / 1024
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def start_server(worker_class, preload, workers, port, pidfile):
+    env = dict(
+        os.environ, DEBUG='False', GUNICORN_WORKER_CLASS=worker_class, GUNICORN_PRELOAD=str(preload),
+        GUNICORN_WORKERS=str(workers), GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_LOG_LEVEL='warning',
+    )
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', '--pid', pidfile], cwd=BASE_DIR, env=env
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/healthz', timeout=1)
+            return process, time.perf_counter() - started
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError(f'{worker_class} server did not start')
+
+
+def warm(port, token, count, concurrency):
+    """Send ``count`` API requests, ``concurrency`` at a time so they reach every worker."""
+    def fetch(number):
+        request = urllib.request.Request(
+            f'http://127.0.0.1:{port}{PATHS[number % len(PATHS)]}', headers={'Authorization': f'Bearer {token}'}
+        )
+        urllib.request.urlopen(request, timeout=10).read()
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(fetch, range(count)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=2, help='seed_portal --scale units')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--classes', default='sync,gthread,uvicorn', help='Comma-separated GUNICORN_WORKER_CLASS values')
+    parser.add_argument('--requests', type=int, default=400, help='Warm-up requests before reading memory')
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    setup_django('server')
+    from django.core.management import call_command
+    from benchmarks.async_bench import student_tokens
+
+    call_command('seed_portal', '--scale', str(args.scale), verbosity=0)
+    token = student_tokens(1)[0]
+    pidfile = os.path.join(tempfile.gettempdir(), 'internship_portal_server_bench.pid')
+
+    print(
+        f'{"class":<8} {"preload":<8} {"start s":>8} {"master MB":>10} {"RSS/wkr":>8} '
+        f'{"PSS/wkr":>8} {"priv/wkr":>9} {"total PSS":>10}'
+    )
+    for worker_class in args.classes.split(','):
+        for preload in (False, True):
+            process, startup = start_server(worker_class, preload, args.workers, args.port, pidfile)
+            try:
+                warm(args.port, token, args.requests, 2 * args.workers)
+                with open(pidfile) as f:
+                    master = int(f.read())
+                workers = [memory_mb(pid) for pid in children(master)]
+                master_rss, master_pss, _ = memory_mb(master)
+                rss, pss, private = (sum(values) / len(workers) for values in zip(*workers))
+                total = master_pss + sum(worker[1] for worker in workers)
+                print(
+                    f'{worker_class:<8} {str(preload):<8} {startup:>8.2f} {master_rss:>10.1f} {rss:>8.1f} '
+                    f'{pss:>8.1f} {private:>9.1f} {total:>10.1f}',
+                    flush=True
+                )
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
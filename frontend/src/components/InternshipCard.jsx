@@ -20,7 +20,7 @@ const InternshipCard = ({ internship }) => {
       </div>
 
       <p style={{ fontWeight: 'bold', color: '#555', marginBottom: '0.5rem' }}>
-        {internship.poster?.company_name || internship.poster?.user?.username}
+        {internship.company_name || internship.poster?.company_name || internship.poster?.user?.username}
       </p>
 
       <p style={{ color: '#666', marginBottom: '0.5rem' }}>
@@ -31,9 +31,11 @@ const InternshipCard = ({ internship }) => {
         💰 ₹{internship.stipend}/month • ⏱️ {internship.duration}
       </p>
 
-      <p className="card-text" style={{ marginBottom: '1rem' }}>
-        {internship.description?.substring(0, 120)}...
-      </p>
+      {internship.description && (
+        <p className="card-text" style={{ marginBottom: '1rem' }}>
+          {internship.description.substring(0, 120)}...
+        </p>
+      )}
 
       <div style={{ display: 'flex', flexWrap: 'wrap', gap: '0.5rem', marginBottom: '1rem' }}>
         {internship.skills_required.split(',').slice(0, 3).map((skill, index) => (
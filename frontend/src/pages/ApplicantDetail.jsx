@@ -22,7 +22,7 @@ const ApplicantDetail = () => {
       // Fetch internship details and its applications
       const [internResponse, appsResponse] = await Promise.all([
         internshipAPI.getById(id),
-        applicationAPI.internshipApplications(id)
+        applicationAPI.internshipApplications(id, { expand: 'cover_letter' })
       ]);
       setInternship(internResponse.data);
       setApplicants(appsResponse.data.results || appsResponse.data);
@@ -107,7 +107,7 @@ const ApplicantDetail = () => {
           {applicants.map((application) => (
             <div key={application.id} className="card">
               <div className="flex justify-between align-center mb-2">
-                <h3>{application.student?.user?.username}</h3>
+                <h3>{application.student?.username}</h3>
                 <span style={{ 
                   background: getStatusColor(application.status) + '20',
                   color: getStatusColor(application.status),
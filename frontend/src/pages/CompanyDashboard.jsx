@@ -124,7 +124,7 @@ const CompanyDashboard = () => {
           <div className="grid">
             {applications.slice(0, 3).map((application) => (
               <div key={application.id} className="card">
-                <h3>{application.student?.user?.username}</h3>
+                <h3>{application.student?.username}</h3>
                 <p><strong>Applied for:</strong> {application.internship?.title}</p>
                 <p><strong>Applied on:</strong> {new Date(application.applied_at).toLocaleDateString()}</p>
                 <p>
@@ -101,7 +101,7 @@ const Landing = () => {
             {featuredInternships.map((internship) => (
               <div key={internship.id} className="card">
                 <h3>{internship.title}</h3>
-                <p><strong>{internship.poster?.company_name || 'Company'}</strong></p>
+                <p><strong>{internship.company_name}</strong></p>
                 <p>{internship.location} {internship.remote && '• Remote'}</p>
                 <p>₹{internship.stipend}/month • {internship.duration}</p>
                 <Link to={`/internships/${internship.id}`} className="btn btn-primary mt-2">View Details</Link>
@@ -14,7 +14,8 @@ const InternshipList = () => {
   const fetchInternships = async (query = '') => {
     setLoading(true);
     try {
-      const params = query ? { q: query } : {};
+      // The list payload leaves out the description unless it is expanded
+      const params = query ? { q: query, expand: 'description' } : { expand: 'description' };
       const response = await internshipAPI.getAll(params);
       setInternships(response.data.results || response.data);
     } catch (error) {
@@ -56,7 +57,7 @@ const InternshipList = () => {
           internships.map((internship) => (
             <div key={internship.id} className="card">
               <h3 className="card-title">{internship.title}</h3>
-              <p><strong>Company:</strong> {internship.poster?.company_name || internship.poster?.user?.username}</p>
+              <p><strong>Company:</strong> {internship.company_name}</p>
               <p><strong>Location:</strong> {internship.location} {internship.remote && '(Remote)'}</p>
               <p><strong>Stipend:</strong> ₹{internship.stipend}</p>
               <p><strong>Duration:</strong> {internship.duration}</p>
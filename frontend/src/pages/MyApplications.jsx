@@ -18,7 +18,7 @@ const MyApplications = () => {
     setLoading(true);
     setError('');
     try {
-      const response = await applicationAPI.getAll();
+      const response = await applicationAPI.getAll({ expand: 'cover_letter' });
       setApplications(response.data.results || response.data);
     } catch (err) {
       setError('Failed to fetch applications');
@@ -123,7 +123,7 @@ const MyApplications = () => {
                 </span>
               </div>
               
-              <p><strong>Company:</strong> {application.internship?.poster?.company_name || 'N/A'}</p>
+              <p><strong>Company:</strong> {application.internship?.company_name || 'N/A'}</p>
               <p><strong>Location:</strong> {application.internship?.location}</p>
               <p><strong>Stipend:</strong> ₹{application.internship?.stipend}/month</p>
               <p><strong>Applied on:</strong> {new Date(application.applied_at).toLocaleDateString()}</p>
@@ -91,7 +91,7 @@ const StudentDashboard = () => {
             {applications.slice(0, 3).map((application) => (
               <div key={application.id} className="card">
                 <h3>{application.internship?.title}</h3>
-                <p><strong>Company:</strong> {application.internship?.poster?.company_name}</p>
+                <p><strong>Company:</strong> {application.internship?.company_name}</p>
                 <p><strong>Applied on:</strong> {new Date(application.applied_at).toLocaleDateString()}</p>
                 <p>
                   <strong>Status:</strong>{' '}
@@ -114,7 +114,7 @@ const StudentDashboard = () => {
           {recommendations.map((internship) => (
             <div key={internship.id} className="card">
               <h3>{internship.title}</h3>
-              <p><strong>{internship.poster?.company_name}</strong></p>
+              <p><strong>{internship.company_name}</strong></p>
               <p>{internship.location} {internship.remote && '• Remote'}</p>
               <p>₹{internship.stipend}/month</p>
               <Link to={`/internships/${internship.id}`} className="btn btn-primary mt-2">
@@ -82,6 +82,51 @@ export const profileAPI = {
   updateProfile: (data) => api.patch('/profile/', data),
 };
 
+// Upload processing state (CV and logo files are checked in the background)
+export const uploadAPI = {
+  getAll: () => api.get('/uploads/'),
+  getById: (id) => api.get(`/uploads/${id}/`),
+};
+
+// Resumable uploads: the file goes up in chunks and, after a network error,
+// continues from the offset the server has (Upload-Offset)
+const UPLOAD_CHUNK_SIZE = 1024 * 1024;
+const UPLOAD_RETRIES = 5;
+
+export const uploadSessionAPI = {
+  create: (data) => api.post('/upload-sessions/', data),
+  getById: (id) => api.get(`/upload-sessions/${id}/`),
+  sendChunk: (id, offset, chunk) => api.patch(`/upload-sessions/${id}/`, chunk, {
+    headers: { 'Content-Type': 'application/offset+octet-stream', 'Upload-Offset': offset },
+  }),
+  cancel: (id) => api.delete(`/upload-sessions/${id}/`),
+
+  // kind: 'cv' | 'logo' | 'application_cv'; resolves to the finished session,
+  // whose `upload` is the processing job
+  upload: async (file, kind, { application, onProgress } = {}) => {
+    let { data: session } = await uploadSessionAPI.create({
+      kind, filename: file.name, length: file.size, application,
+    });
+    let failures = 0;
+    while (session.offset < session.length) {
+      const chunk = file.slice(session.offset, session.offset + UPLOAD_CHUNK_SIZE);
+      try {
+        ({ data: session } = await uploadSessionAPI.sendChunk(session.id, session.offset, chunk));
+        failures = 0;
+      } catch (error) {
+        const status = error.response?.status;
+        if ((status && status !== 409 && status < 500) || ++failures > UPLOAD_RETRIES) {
+          throw error;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 1000 * failures));
+        ({ data: session } = await uploadSessionAPI.getById(session.id));
+      }
+      if (onProgress) onProgress(session.offset / session.length);
+    }
+    return session;
+  },
+};
+
 // Internship API calls
 export const internshipAPI = {
   getAll: (params) => api.get('/internships/', { params }),
@@ -95,12 +140,15 @@ export const internshipAPI = {
 
 // Application API calls
 export const applicationAPI = {
-  getAll: () => api.get('/applications/'),
+  getAll: (params) => api.get('/applications/', { params }),
   getById: (id) => api.get(`/applications/${id}/`),
   create: (data) => api.post('/applications/', data),
   updateStatus: (id, status) => api.patch(`/applications/${id}/`, { status }),
+  bulkStatus: (status, ids) => api.post('/applications/bulk_status/', { status, ids }),
   myApplications: () => api.get('/applications/my_applications/'),
-  internshipApplications: (internshipId) => api.get(`/applications/${internshipId}/internship_applications/`),
+  internshipApplications: (internshipId, params) => api.get(`/applications/${internshipId}/internship_applications/`, { params }),
+  exportApplications: (internshipId, output = 'csv') => api.get(`/applications/${internshipId}/export/`, { params: { output }, responseType: 'blob' }),
+  downloadCvs: (internshipId) => api.get(`/applications/${internshipId}/cvs/`, { responseType: 'blob' }),
 };
 
 // Helper functions
@@ -0,0 +1,146 @@
+"""
+Gunicorn settings, read automatically from the working directory.
+
+Every setting comes from a GUNICORN_* environment variable, and
+command-line flags still override anything here:
+
+    GUNICORN_WORKER_CLASS   sync (default), gthread or uvicorn. uvicorn serves
+                            intern_portal.asgi with ASYNC_API_VIEWS on
+                            (portal.async_views) unless that is set
+    GUNICORN_WORKERS        worker processes; sized from the CPUs and memory
+                            available to the container when unset (see
+                            default_workers())
+    GUNICORN_THREADS        threads per gthread worker (4)
+    GUNICORN_WORKER_MEMORY_MB
+                            memory one worker is expected to use, for sizing (200)
+    GUNICORN_PRELOAD        import the app once in the master, so workers share
+                            its memory copy-on-write (True)
+    GUNICORN_MAX_REQUESTS   restart a worker after this many requests, bounding
+                            memory growth; 0 disables (1000), with
+    GUNICORN_MAX_REQUESTS_JITTER
+                            up to this many more, so workers restart at
+                            different times (100)
+    GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE
+                            seconds (120, 30, 5)
+    GUNICORN_BIND           address (0.0.0.0:$PORT, port 8000 by default)
+    GUNICORN_ACCESS_LOG     access log file, '-' for stdout (off)
+    GUNICORN_LOG_LEVEL      (info)
+
+It also wires up prometheus_client's multiprocess mode for /metrics
+(portal.metrics): workers write their values to PROMETHEUS_MULTIPROC_DIR,
+which must start empty, and the files of exited workers are marked so
+their live gauges stop being reported.
+"""
+import gc
+import math
+import os
+import shutil
+import sys
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn_worker.UvicornWorker',
+}
+
+
+def env_bool(name, default):
+    return os.environ.get(name, default) == 'True'
+
+
+def available_cpus():
+    """CPUs this process may use: its affinity, capped by a cgroup v2 quota."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def available_memory_mb():
+    """The cgroup v2 memory limit, else the memory available now; None if unknown."""
+    try:
+        with open('/sys/fs/cgroup/memory.max') as f:
+            limit = f.read().strip()
+        if limit != 'max':
+            return int(limit) // 2**20
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def default_workers(kind, cpus, memory_mb, worker_memory_mb):
+    """
+    2 * CPUs + 1 sync workers, the usual rule for workers that block on
+    I/O; CPUs + 1 for gthread and uvicorn workers, which already overlap
+    requests within a process. Never more than fit in ``memory_mb``.
+    """
+    workers = 2 * cpus + 1 if kind == 'sync' else cpus + 1
+    if memory_mb is not None:
+        workers = min(workers, memory_mb // worker_memory_mb)
+    return max(1, workers)
+
+
+worker_kind = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+if worker_kind not in WORKER_CLASSES:
+    raise ValueError(f'GUNICORN_WORKER_CLASS must be one of {", ".join(WORKER_CLASSES)}, not {worker_kind!r}')
+worker_class = WORKER_CLASSES[worker_kind]
+if worker_kind == 'uvicorn':
+    wsgi_app = 'intern_portal.asgi:application'
+    os.environ.setdefault('ASYNC_API_VIEWS', 'True')
+else:
+    wsgi_app = 'intern_portal.wsgi:application'
+
+workers = int(os.environ.get('GUNICORN_WORKERS') or default_workers(
+    worker_kind, available_cpus(), available_memory_mb(), int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', '200'))
+))
+threads = int(os.environ.get('GUNICORN_THREADS', '4')) if worker_kind == 'gthread' else 1
+preload_app = env_bool('GUNICORN_PRELOAD', 'True')
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+bind = os.environ.get('GUNICORN_BIND', f'0.0.0.0:{os.environ.get("PORT", "8000")}')
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        # Values left by a previous run would be added to this one's
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        # Objects the master allocated are never collected by the workers:
+        # keep the collector from writing to them, which would copy their
+        # pages into every worker
+        gc.freeze()
+
+
+def pre_fork(server, worker):
+    if 'django.db' in sys.modules:
+        # A connection opened in the master would be shared by the workers
+        from django.db import connections
+        connections.close_all()
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -3,10 +3,21 @@ Custom middleware for the internship portal
 """
 import re
 import logging
-from django.utils.deprecation import MiddlewareMixin
+import random
+import time
+from contextlib import ExitStack, nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from portal import metrics
+from portal.instrumentation import RequestMetrics, current
 
 logger = logging.getLogger(__name__)
+request_logger = logging.getLogger('intern_portal.requests')
 
 class CSRFExemptAPIMiddleware(MiddlewareMixin):
     """
@@ -17,10 +28,163 @@ class CSRFExemptAPIMiddleware(MiddlewareMixin):
         # Check if the path matches any exempt URL patterns
         if hasattr(settings, 'CSRF_EXEMPT_URLS'):
             path = request.path_info.lstrip('/')
-            logger.warning(f"Checking CSRF exempt for path: {path}")
             for pattern in settings.CSRF_EXEMPT_URLS:
                 if re.match(pattern, path):
-                    logger.warning(f"CSRF EXEMPTED for path: {path}")
+                    logger.debug("CSRF exempted for path: %s", path)
                     setattr(request, '_dont_enforce_csrf_checks', True)
                     break
         return None
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that can also sit in an async middleware chain,
+    so requests for other paths reach async views without being passed
+    through a thread. Static files are looked up and served as before.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record the query count, SQL time, serializer time and render time of
+    a sample of requests (REQUEST_METRICS_SAMPLE_RATE, see
+    portal.instrumentation), and report them in a Server-Timing header
+    and one log line per request on the intern_portal.requests logger.
+    Requests over REQUEST_QUERY_BUDGET queries, or repeating one SQL
+    statement REQUEST_DUPLICATE_QUERY_THRESHOLD times or more (usually
+    an N+1 pattern), are logged as warnings.
+
+    With METRICS_ENABLED every request's latency and status, and the
+    sampled requests' query counts, also go to portal.metrics.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        sampled = random.random() < settings.REQUEST_METRICS_SAMPLE_RATE
+        if not sampled:
+            if not settings.METRICS_ENABLED:
+                return self.get_response(request)
+            started = time.perf_counter()
+            with self.in_progress():
+                response = self.get_response(request)
+            metrics.observe_request(request, response, time.perf_counter() - started)
+            return response
+
+        timings = RequestMetrics()
+        token = current.set(timings)
+        try:
+            with self.in_progress(), self.wrap_connections(timings):
+                response = self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request):
+        sampled = random.random() < settings.REQUEST_METRICS_SAMPLE_RATE
+        if not sampled:
+            if not settings.METRICS_ENABLED:
+                return await self.get_response(request)
+            started = time.perf_counter()
+            with self.in_progress():
+                response = await self.get_response(request)
+            metrics.observe_request(request, response, time.perf_counter() - started)
+            return response
+
+        timings = RequestMetrics()
+        token = current.set(timings)
+        try:
+            with self.in_progress():
+                # Database connections belong to threads: wrap the ones of
+                # the thread that runs this request's queries (sync views
+                # and the async ORM alike)
+                wrappers = await sync_to_async(self.wrap_connections)(timings)
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    await sync_to_async(wrappers.close)()
+        finally:
+            current.reset(token)
+        return self.report(request, response, timings)
+
+    def in_progress(self):
+        if settings.METRICS_ENABLED:
+            return metrics.WORKER_REQUESTS_IN_PROGRESS.track_inprogress()
+        return nullcontext()
+
+    def wrap_connections(self, timings):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings.execute))
+        return stack
+
+    def report(self, request, response, timings):
+        total = timings.elapsed()
+        if settings.METRICS_ENABLED:
+            metrics.observe_request(request, response, total, timings.queries)
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response['Server-Timing'] = self.server_timing(timings, total)
+        self.log(request, response, timings, total)
+        return response
+
+    def server_timing(self, timings, total):
+        entries = [f'db;dur={timings.durations["db"] * 1000:.1f};desc="{timings.queries} queries"']
+        entries += [
+            f'{name};dur={timings.durations[name] * 1000:.1f}'
+            for name in ('serialize', 'render') if name in timings.durations
+        ]
+        entries.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(entries)
+
+    def log(self, request, response, timings, total):
+        duplicates = timings.duplicates(settings.REQUEST_DUPLICATE_QUERY_THRESHOLD)
+        over_budget = timings.queries > settings.REQUEST_QUERY_BUDGET
+        level = logging.WARNING if duplicates or over_budget else logging.INFO
+        if not request_logger.isEnabledFor(level):
+            return
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'queries': timings.queries,
+            'db_ms': round(timings.durations['db'] * 1000, 1),
+            'serialize_ms': round(timings.durations['serialize'] * 1000, 1),
+            'render_ms': round(timings.durations['render'] * 1000, 1),
+        }
+        if over_budget:
+            fields['query_budget'] = settings.REQUEST_QUERY_BUDGET
+        if duplicates:
+            fields['duplicate_queries'] = [{'sql': sql[:200], 'count': n} for sql, n in duplicates[:3]]
+        request_logger.log(
+            level, ' '.join(f'{key}=%s' for key in fields), *fields.values(), extra={'request_metrics': fields}
+        )
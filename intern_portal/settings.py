@@ -14,6 +14,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,8 +48,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the rest of the stack
+    'intern_portal.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # WhiteNoise, able to pass requests on to async views (ASYNC_API_VIEWS)
+    'intern_portal.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,6 +83,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'intern_portal.wsgi.application'
 
+# Serve the internship list/detail and my_applications through the async
+# views in portal.async_views. For ASGI servers (uvicorn); keep it off
+# under WSGI, where every async request would start an event loop.
+ASYNC_API_VIEWS = os.environ.get('ASYNC_API_VIEWS', 'False') == 'True'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -105,6 +115,77 @@ else:
     }
 
 
+# Request metrics (intern_portal.middleware.RequestMetricsMiddleware): the
+# fraction of requests timed (0 turns it off), whether they get a
+# Server-Timing header, and when they are logged as warnings: over
+# REQUEST_QUERY_BUDGET queries, or one SQL statement repeated
+# REQUEST_DUPLICATE_QUERY_THRESHOLD times (an N+1 pattern)
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', '1.0' if DEBUG else '0.05'))
+REQUEST_METRICS_SERVER_TIMING = os.environ.get('REQUEST_METRICS_SERVER_TIMING', 'True') == 'True'
+REQUEST_QUERY_BUDGET = int(os.environ.get('REQUEST_QUERY_BUDGET', '20'))
+REQUEST_DUPLICATE_QUERY_THRESHOLD = int(os.environ.get('REQUEST_DUPLICATE_QUERY_THRESHOLD', '5'))
+
+# Prometheus metrics at /metrics (portal.metrics). Under gunicorn, set
+# PROMETHEUS_MULTIPROC_DIR so a scrape adds up all workers (gunicorn.conf.py
+# prepares the directory). METRICS_TOKEN, when set, is required as a
+# bearer token to read them.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # One line per timed request at INFO, flagged requests at WARNING
+        'intern_portal.requests': {
+            'handlers': ['console'],
+            'level': os.environ.get('REQUEST_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+
+# Cache
+# Local memory by default, which is per process. Set CACHE_URL to share the
+# cache between workers (needed for invalidation to reach all of them):
+#   redis://redis:6379/1          (requires the `redis` package)
+#   memcached://memcached:11211   (requires the `pymemcache` package)
+CACHE_URL = os.environ.get('CACHE_URL', '')
+
+if CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith('memcached://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': CACHE_URL[len('memcached://'):],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'intern-portal',
+        }
+    }
+
+# Seconds a cached public internship response (portal.caching) may be served
+INTERNSHIP_CACHE_TIMEOUT = int(os.environ.get('INTERNSHIP_CACHE_TIMEOUT', '300'))
+
+# CV ZIP downloads (portal.archives) a single process streams at once;
+# further requests get 503 until one finishes
+CV_ARCHIVE_MAX_CONCURRENT = int(os.environ.get('CV_ARCHIVE_MAX_CONCURRENT', '2'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -142,14 +223,49 @@ USE_TZ = True
 STATIC_URL = os.environ.get('STATIC_URL', '/static/')
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# React production build (npm run build). index.html is served by
+# intern_portal.views.serve_react; its static/ assets are collected with the
+# Django ones so WhiteNoise serves them under the same /static/ URLs.
+REACT_BUILD_DIR = BASE_DIR / 'frontend' / 'build'
+STATICFILES_DIRS = [REACT_BUILD_DIR / 'static'] if (REACT_BUILD_DIR / 'static').is_dir() else []
+
 MEDIA_URL = os.environ.get('MEDIA_URL', '/media/')
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media URLs for CVs are signed (portal.storage) and checked by portal.media
+STORAGES = {
+    'default': {'BACKEND': 'portal.storage.SignedMediaStorage'},
+    # Profile.cv and Application.cv_copy: deduplicated by content (portal.blobs)
+    'cvs': {'BACKEND': 'portal.storage.ContentAddressedStorage'},
+    # Writes .gz and .br (Brotli, in requirements.txt) next to each collected file
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage'},
+}
+
+# Seconds a signed media URL is issued for; it stays valid up to twice as long.
+# Keep it above INTERNSHIP_CACHE_TIMEOUT so cached payloads carry live links.
+MEDIA_URL_MAX_AGE = int(os.environ.get('MEDIA_URL_MAX_AGE', '3600'))
+
+# Who sends media bytes once access is checked: 'django' (FileResponse with
+# Range support), 'x-accel-redirect' (nginx, see frontend/nginx.conf) or
+# 'x-sendfile' (Apache mod_xsendfile, lighttpd)
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 MAX_UPLOAD_SIZE = 5242880  # 5MB for CV files
 MAX_IMAGE_UPLOAD_SIZE = 2097152  # 2MB for images
+# Resumable uploads (portal.uploads.UploadSession): largest chunk per PATCH
+# (nginx's default client_max_body_size is 1MB), and seconds an unfinished
+# session is kept after its last chunk
+UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get('UPLOAD_CHUNK_MAX_SIZE', 1048576))
+UPLOAD_SESSION_TTL = int(os.environ.get('UPLOAD_SESSION_TTL', 24 * 60 * 60))
+# Local directory unfinished resumable uploads are assembled in (chunks are
+# written at offsets, which the storage API can't do); complete files move
+# to the default storage. Every web process that takes chunks must share it,
+# and so must process_uploads, which deletes the files of expired sessions
+UPLOAD_SESSION_DIR = os.environ.get('UPLOAD_SESSION_DIR', str(BASE_DIR / 'upload_sessions'))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -159,6 +275,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = DEBUG  # Allow all in development only
+# Resumable upload headers (see portal.views.UploadSessionViewSet)
+CORS_ALLOW_HEADERS = (*default_headers, 'upload-offset')
+CORS_EXPOSE_HEADERS = ['Location', 'Upload-Offset', 'Upload-Length', 'Server-Timing']
 
 # Production CORS settings
 if not DEBUG:
@@ -169,6 +288,8 @@ if not DEBUG:
     
     # Security settings for production
     SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'False') == 'True'
+    # Probes and scrapes come over plain HTTP from inside the network
+    SECURE_REDIRECT_EXEMPT = [r'^healthz$', r'^readyz$', r'^metrics$']
     SESSION_COOKIE_SECURE = os.environ.get('SESSION_COOKIE_SECURE', 'False') == 'True'
     CSRF_COOKIE_SECURE = os.environ.get('CSRF_COOKIE_SECURE', 'False') == 'True'
     SECURE_HSTS_SECONDS = int(os.environ.get('SECURE_HSTS_SECONDS', '0'))
@@ -195,13 +316,18 @@ CSRF_USE_SESSIONS = False
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'portal.authentication.JWTAuthenticationWithoutCSRF',
+        'portal.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'portal.renderers.ORJSONRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'portal.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
 }
 
@@ -226,6 +352,8 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    # Adds the role/profile_id claims used by portal.authentication
+    'TOKEN_OBTAIN_SERIALIZER': 'portal.serializers.PortalTokenObtainPairSerializer',
     'TOKEN_TYPE_CLAIM': 'token_type',
 
     'JTI_CLAIM': 'jti',
@@ -235,5 +363,12 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
-# WhiteNoise configuration for production static file serving
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Seconds to keep full User/Profile rows for claims-authenticated requests
+# that need them (portal.authentication.load_account). Per process; 0 disables.
+JWT_ACCOUNT_CACHE_TTL = int(os.environ.get('JWT_ACCOUNT_CACHE_TTL', '0'))
+
+# WhiteNoise configuration for production static file serving (storage: see
+# STORAGES). React build assets carry a content hash in their names
+# (main.1a2b3c4d.js, 453.8e1f2a3b.chunk.css, media/logo.<hash>.svg), so they
+# are sent with a one-year max-age and the immutable directive.
+WHITENOISE_IMMUTABLE_FILE_TEST = r'\.[0-9a-f]{8,}\.(?:chunk\.)?[a-z0-9]+$'
@@ -18,32 +18,33 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from django.views.static import serve
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from .views import serve_react
-import os
+from portal.views import serve_media
+from .views import healthz, metrics, readyz, serve_react
+import re
 
 urlpatterns = [
+    path('healthz', healthz, name='healthz'),
+    path('readyz', readyz, name='readyz'),
+    path('metrics', metrics, name='metrics'),
     path('admin/', admin.site.urls),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/', include('portal.urls')),
 ]
 
-# Serve media files in all modes
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Serve media files in all modes, checking access first (see portal.media)
+urlpatterns += [
+    re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+]
 
-# Serve React build in production
+# Serve React build in production. Its static/ assets are collected into
+# STATIC_ROOT and served by WhiteNoise (see STATICFILES_DIRS).
 if not settings.DEBUG:
-    # Serve React static files
-    REACT_BUILD_DIR = os.path.join(settings.BASE_DIR, 'frontend', 'build')
     urlpatterns += [
-        re_path(r'^static/(?P<path>.*)$', serve, {
-            'document_root': os.path.join(REACT_BUILD_DIR, 'static'),
-        }),
         # Root path
         path('', serve_react, name='react-root'),
         # Catch-all pattern for React SPA routing (must be last!)
@@ -1,15 +1,140 @@
 """
-Views for serving React frontend
+Views for serving React frontend, health probes and metrics
 """
-from django.http import HttpResponse
-from django.conf import settings
+import gzip
+import hashlib
+import hmac
 import os
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import never_cache
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+
+class IndexDocument:
+    """
+    index.html held in memory with its compressed variants and ETag.
+
+    The file is stat()ed on every request and re-read when its mtime or
+    size changes, so a new `npm run build` is picked up without a restart.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.path = None
+        self.signature = None
+        self.variants = {}
+
+    def get(self, path):
+        """{content encoding ('identity', 'gzip', 'br'): (body, etag)} for ``path``."""
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if path != self.path or signature != self.signature:
+            with self.lock:
+                if path != self.path or signature != self.signature:
+                    self.variants = self.load(path)
+                    self.path, self.signature = path, signature
+        return self.variants
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            body = f.read()
+        digest = hashlib.md5(body).hexdigest()
+        variants = {
+            'identity': (body, quote_etag(digest)),
+            'gzip': (gzip.compress(body, compresslevel=9, mtime=0), quote_etag(f'{digest}-gzip')),
+        }
+        if brotli is not None:
+            variants['br'] = (brotli.compress(body, quality=11), quote_etag(f'{digest}-br'))
+        return variants
+
+
+index_document = IndexDocument()
+
+
+def accepted_encoding(request, variants):
+    """
+    The variant to send: the available coding with the highest q-value
+    in Accept-Encoding (br before gzip on a tie), else identity. Codings
+    with q=0, or only matched by a `*;q=0`, are refused.
+    """
+    qualities = {}
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, *params = part.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best, best_quality = 'identity', 0.0
+    for encoding in ('br', 'gzip'):
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if encoding in variants and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
 
 def serve_react(request):
     """Serve the React index.html for all non-API routes"""
     try:
-        index_path = os.path.join(settings.BASE_DIR, 'frontend', 'build', 'index.html')
-        with open(index_path, 'r', encoding='utf-8') as f:
-            return HttpResponse(f.read(), content_type='text/html')
+        variants = index_document.get(os.path.join(settings.REACT_BUILD_DIR, 'index.html'))
     except Exception as e:
         return HttpResponse(f'Error loading frontend: {str(e)}', status=500)
+
+    encoding = accepted_encoding(request, variants)
+    body, etag = variants[encoding]
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='text/html; charset=utf-8')
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    # The page names the current hashed bundles, so it must be revalidated
+    # on every load; the bundles themselves are cached for a year.
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@never_cache
+def healthz(request):
+    """Liveness: the process answers requests. Touches nothing else."""
+    return HttpResponse('ok', content_type='text/plain')
+
+
+@never_cache
+def readyz(request):
+    """Readiness: the database accepts queries."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError as e:
+        return JsonResponse({'status': 'unavailable', 'database': type(e).__name__}, status=503)
+    return JsonResponse({'status': 'ok'})
+
+
+@never_cache
+def metrics(request):
+    """Prometheus exposition of portal.metrics, behind METRICS_TOKEN when set."""
+    from portal.metrics import exposition
+
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), settings.METRICS_TOKEN.encode()):
+            return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    body, content_type = exposition()
+    return HttpResponse(body, content_type=content_type)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Profile, Internship, Application
+from .models import Profile, Internship, Application, Skill, UploadJob, Blob
 
 
 @admin.register(Profile)
@@ -23,3 +23,24 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_filter = ['status', 'applied_at']
     search_fields = ['student__user__username', 'internship__title']
     date_hierarchy = 'applied_at'
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['display_name', 'name']
+    search_fields = ['name', 'display_name']
+
+
+@admin.register(UploadJob)
+class UploadJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'profile', 'original_name', 'attempts', 'created_at']
+    list_filter = ['kind', 'status']
+    search_fields = ['profile__user__username', 'original_name']
+    date_hierarchy = 'created_at'
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'created_at']
+    search_fields = ['name', 'sha256']
+    readonly_fields = ['name', 'sha256', 'size', 'created_at']
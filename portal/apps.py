@@ -7,3 +7,5 @@ class PortalConfig(AppConfig):
     
     def ready(self):
         import portal.signals
+        from portal import instrumentation
+        instrumentation.install()
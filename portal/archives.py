@@ -0,0 +1,118 @@
+"""
+Streaming ZIP archives of applicant CVs.
+
+The archive is written by zipfile straight into a small in-memory buffer
+that is drained after every write, so it is produced while it is being
+sent: nothing is written to disk and at most one read chunk plus the
+compressor's state is held at a time. zipfile handles the unseekable
+output by emitting a data descriptor after each entry, as any streaming
+ZIP writer must, since sizes and CRCs are only known once a file is read.
+
+Files are read from the storage backend, so the same code serves local
+media and remote storages. Each archive occupies a worker for as long as
+the download lasts, so the number built at once in a process is capped
+by settings.CV_ARCHIVE_MAX_CONCURRENT.
+"""
+import os
+import threading
+import zipfile
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.text import slugify
+
+from .models import Application, Profile
+
+# Bytes read from storage per write
+READ_CHUNK_SIZE = 64 * 1024
+
+_archive_slots = threading.BoundedSemaphore(settings.CV_ARCHIVE_MAX_CONCURRENT)
+
+
+class StreamBuffer:
+    """Write-only, unseekable sink whose contents are taken with drain()."""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def archive_entries(queryset):
+    """
+    (archive name, storage, file name) for every application in
+    ``queryset``: the copy attached to the application, else the
+    student's profile CV. Applications with neither are skipped.
+    """
+    cv_copy_storage = Application._meta.get_field('cv_copy').storage
+    cv_storage = Profile._meta.get_field('cv').storage
+
+    rows = queryset.order_by('applied_at', 'id').values_list(
+        'id', 'student__user__username', 'cv_copy', 'student__cv'
+    )
+    for application_id, username, cv_copy, cv in rows.iterator():
+        storage, name = (cv_copy_storage, cv_copy) if cv_copy else (cv_storage, cv)
+        if name:
+            extension = os.path.splitext(name)[1].lower()
+            yield f'{slugify(username) or "applicant"}-{application_id}{extension}', storage, name
+
+
+class CVArchive:
+    """
+    Iterator over the bytes of a ZIP of ``entries``. It holds one of the
+    process's archive slots from construction until close(), which the
+    response calls once the download ends (or is abandoned).
+    """
+    def __init__(self, entries):
+        self.entries = entries
+        self.closed = False
+
+    @classmethod
+    def acquire(cls, entries):
+        """A CVArchive, or None if too many archives are already being built."""
+        if not _archive_slots.acquire(blocking=False):
+            return None
+        return cls(entries)
+
+    def __iter__(self):
+        return (chunk for chunk in self.chunks() if chunk)
+
+    def chunks(self):
+        buffer = StreamBuffer()
+        missing = []
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            for entry_name, storage, name in self.entries:
+                try:
+                    source = storage.open(name, 'rb')
+                except OSError:
+                    missing.append(entry_name)
+                    continue
+                with source, archive.open(entry_name, 'w') as target:
+                    for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b''):
+                        target.write(chunk)
+                        yield buffer.drain()
+                yield buffer.drain()
+            if missing:
+                archive.writestr('MISSING.txt', '\n'.join(missing) + '\n')
+        yield buffer.drain()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            _archive_slots.release()
+
+
+def archive_response(archive, filename):
+    response = StreamingHttpResponse(archive, content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{slugify(filename) or "cvs"}.zip"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
@@ -0,0 +1,162 @@
+"""
+Async versions of the busiest read endpoints, for ASGI deployments.
+
+With settings.ASYNC_API_VIEWS on, portal.urls routes the internship list
+and detail and `my_applications` here. GET and HEAD requests are handled
+on the event loop; other methods, and the rarer variants the views below
+leave out (`expand`, non-students on my_applications), go to the regular
+DRF viewset in a worker thread. The API is the same either way: the views
+reuse the viewsets for request parsing, authentication, permissions,
+filtering and queryset building, none of which queries the database
+(ClaimsJWTAuthentication builds request.user from the token). Only the
+queries themselves differ, going through the async ORM (acount,
+aaggregate, async iteration), with the async versions of pagination,
+portal.conditional and portal.caching. Django still runs each query in
+the request's database thread (its async ORM has no async driver behind
+it yet), but a request holds no thread between queries or while a slow
+client sends or reads it, so one uvicorn worker serves many at once.
+
+Under WSGI these views still work, but each request would start an event
+loop; leave ASYNC_API_VIEWS off there.
+"""
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import SynchronousOnlyOperation, ValidationError
+from django.http import Http404
+from rest_framework.response import Response
+
+from . import caching, conditional
+from .models import Application
+from .views import ApplicationViewSet, InternshipViewSet
+
+
+async def initial(view, request, *args, **kwargs):
+    """APIView.initial(): authentication, permissions and throttling."""
+    try:
+        view.initial(request, *args, **kwargs)
+    except SynchronousOnlyOperation:
+        # Tokens without the role/profile_id claims load the user (and, on
+        # first access, its profile) from the database: do that in a thread
+        def load():
+            view.initial(request, *args, **kwargs)
+            getattr(request.user, 'profile', None)
+        await sync_to_async(load)()
+
+
+def async_viewset_view(viewset, actions, handler, **initkwargs):
+    """
+    An async view for one route of ``viewset``: GET and HEAD run the
+    ``handler`` coroutine as ``actions['get']``, in the way
+    APIView.dispatch() runs an action; other methods go to the viewset.
+    """
+    actions = {**actions, 'head': actions['get']}
+    sync_view = sync_to_async(viewset.as_view(actions, **initkwargs))
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await sync_view(request, *args, **kwargs)
+
+        self = viewset(**initkwargs)
+        self.action_map = actions
+        self.args, self.kwargs = args, kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await initial(self, request, *args, **kwargs)
+            response = await handler(self, request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    view.cls = viewset
+    view.actions = actions
+    view.initkwargs = initkwargs
+    view.csrf_exempt = True
+    return view
+
+
+async def values_list_response(view, queryset):
+    """The ValuesListMixin.list_response() fast path."""
+    serializer = view.get_values_serializer()
+    rows = serializer.values(queryset)
+    page = await view.paginator.apaginate_queryset(rows, view.request, view=view)
+    if page is not None:
+        return view.get_paginated_response(serializer.serialize(page))
+    return Response(serializer.serialize([row async for row in rows]))
+
+
+async def cached_response(view, request, respond, pk=None):
+    """CachedResponseMixin.cached_response() with an async ``respond()``."""
+    cacheable, student, pk = view.get_cache_target(request, pk)
+    if not cacheable:
+        return await respond()
+
+    key = await caching.aresponse_cache_key(request, view.action, pk)
+    data = await caching.aget_cached_response(key)
+    cache_status = 'HIT'
+    if data is None:
+        cache_status = 'MISS'
+        view.shared_response = True
+        response = await respond()
+        if response.status_code != 200:
+            return response
+        data = response.data
+        await caching.aset_cached_response(key, data)
+    if student is not None:
+        data = await caching.amerge_has_applied(data, student)
+    return Response(data, headers={'X-Cache': cache_status})
+
+
+async def internship_list(view, request):
+    if not view.uses_values_serializer():
+        return await sync_to_async(view.list)(request)
+
+    async def respond():
+        return await values_list_response(view, view.filter_queryset(view.get_queryset()))
+    return await cached_response(view, request, respond)
+
+
+async def internship_retrieve(view, request, pk):
+    async def retrieve():
+        queryset = view.filter_queryset(view.get_queryset())
+        # GenericAPIView.get_object()
+        try:
+            instance = await queryset.aget(pk=pk)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        view.check_object_permissions(request, instance)
+        return Response(view.get_serializer(instance).data)
+
+    respond = partial(cached_response, view, request, retrieve, pk)
+    queryset = view.get_version_queryset().filter(pk=pk)
+    return await conditional.aconditional_response(
+        request, queryset, view.version_fields, respond, require_rows=True
+    )
+
+
+async def my_applications(view, request):
+    profile = getattr(request.user, 'profile', None)
+    if profile is None or profile.role != 'student' or not view.uses_values_serializer():
+        return await sync_to_async(view.my_applications)(request)
+
+    applications = view.related_queryset(Application.objects.filter(student=profile))
+    return await conditional.aconditional_response(
+        request, applications, view.version_fields, partial(values_list_response, view, applications)
+    )
+
+
+internship_list_view = async_viewset_view(
+    InternshipViewSet, {'get': 'list', 'post': 'create'}, internship_list,
+    basename='internship', detail=False,
+)
+internship_detail_view = async_viewset_view(
+    InternshipViewSet,
+    {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+    internship_retrieve, basename='internship', detail=True,
+)
+my_applications_view = async_viewset_view(
+    ApplicationViewSet, {'get': 'my_applications'}, my_applications,
+    basename='application', detail=False,
+)
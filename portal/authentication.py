@@ -1,7 +1,28 @@
 """
 Custom authentication classes for the portal app
 """
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import router
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from . import metrics
+from .models import Profile
+
+# Claims added by portal.serializers.PortalTokenObtainPairSerializer
+ROLE_CLAIM = 'role'
+PROFILE_ID_CLAIM = 'profile_id'
+IS_STAFF_CLAIM = 'is_staff'
+
+# In-process cache of full account rows: user id -> (expires, user values, profile values)
+_accounts = {}
+_accounts_lock = threading.Lock()
+MAX_CACHED_ACCOUNTS = 10000
 
 
 class JWTAuthenticationWithoutCSRF(JWTAuthentication):
@@ -10,3 +31,107 @@ class JWTAuthenticationWithoutCSRF(JWTAuthentication):
     """
     def enforce_csrf(self, request):
         return  # Do not enforce CSRF
+
+
+class ClaimsJWTAuthentication(JWTAuthenticationWithoutCSRF):
+    """
+    JWT authentication that builds request.user from the token's claims
+    instead of loading the user from the database.
+
+    request.user is a real User with `id` and `is_staff` loaded and its
+    other fields deferred, with request.user.profile pre-populated (id,
+    user_id and role), so permission checks and profile-scoped queries cost
+    no queries. Reading any other field would quietly query for it: views
+    that serialize the account call load_account() first.
+
+    Tokens issued before these claims existed, and setups that revoke
+    tokens on password change, take the stock database lookup.
+    Deactivating a user takes effect when their access token expires.
+    """
+    def get_user(self, validated_token):
+        if (
+            api_settings.CHECK_REVOKE_TOKEN or
+            ROLE_CLAIM not in validated_token or
+            PROFILE_ID_CLAIM not in validated_token or
+            IS_STAFF_CLAIM not in validated_token
+        ):
+            return super().get_user(validated_token)
+        return user_from_claims(validated_token)
+
+
+def user_from_claims(token):
+    """A deferred User (and Profile) carrying only what the token says."""
+    # simplejwt stores the id as a string
+    user_id = User._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+    user = User.from_db(router.db_for_read(User), ['id', 'is_staff'], [user_id, token[IS_STAFF_CLAIM]])
+
+    profile = None
+    if token[PROFILE_ID_CLAIM] is not None:
+        profile = Profile.from_db(
+            router.db_for_read(Profile),
+            ['id', 'user_id', 'role'],
+            [token[PROFILE_ID_CLAIM], user_id, token[ROLE_CLAIM]]
+        )
+        Profile.user.field.set_cached_value(profile, user)
+    # A cached None makes `user.profile` raise DoesNotExist without a query
+    User.profile.related.set_cached_value(user, profile)
+    return user
+
+
+def load_account_values(user_id):
+    """
+    (user values, profile values) keyed by attname, in one query. Kept for
+    settings.JWT_ACCOUNT_CACHE_TTL seconds when that is set; the cache is
+    per process, so other workers may serve an edit that old.
+    """
+    ttl = settings.JWT_ACCOUNT_CACHE_TTL
+    if ttl:
+        with _accounts_lock:
+            entry = _accounts.get(user_id)
+        hit = entry is not None and entry[0] > time.monotonic()
+        metrics.cache_lookup('accounts', hit)
+        if hit:
+            return entry[1], entry[2]
+
+    user_fields = [field.attname for field in User._meta.concrete_fields]
+    profile_fields = [field.attname for field in Profile._meta.concrete_fields]
+    row = User.objects.filter(pk=user_id).values_list(
+        *user_fields, *[f'profile__{name}' for name in profile_fields]
+    ).first()
+    if row is None:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+
+    user_values = dict(zip(user_fields, row[:len(user_fields)]))
+    profile_values = dict(zip(profile_fields, row[len(user_fields):]))
+    if ttl:
+        with _accounts_lock:
+            if len(_accounts) >= MAX_CACHED_ACCOUNTS:
+                _accounts.clear()
+            _accounts[user_id] = (time.monotonic() + ttl, user_values, profile_values)
+    return user_values, profile_values
+
+
+def forget_account(user_id):
+    """Drop a user's cached account row in this process."""
+    with _accounts_lock:
+        _accounts.pop(user_id, None)
+
+
+def load_account(user):
+    """
+    Fill in the deferred fields of a claims-built ``user`` and its profile,
+    then return the profile (None if the user has none). Fully loaded users
+    are returned as they are.
+    """
+    profile = getattr(user, 'profile', None)
+    user_deferred = user.get_deferred_fields()
+    profile_deferred = profile.get_deferred_fields() if profile is not None else set()
+    if not user_deferred and not profile_deferred:
+        return profile
+
+    user_values, profile_values = load_account_values(user.pk)
+    for attname in user_deferred:
+        user.__dict__[attname] = user_values[attname]
+    for attname in profile_deferred:
+        profile.__dict__[attname] = profile_values[attname]
+    return profile
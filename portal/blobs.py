@@ -0,0 +1,164 @@
+"""
+Reference counting for the content-addressed CV storage.
+
+Profile.cv and Application.cv_copy store their files through
+portal.storage.ContentAddressedStorage, so identical CVs share one blob:
+a student's application points at the same blob as their profile CV
+instead of a copy. Each Blob row counts the field values naming it.
+Signals (portal.signals) adjust the count as rows are saved and
+deleted; the rows themselves stay the source of truth, so recount()
+can always rebuild the counts, and collect_garbage() only deletes blobs
+that have been unreferenced for a grace period (an upload is stored
+before the row naming it is saved).
+"""
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Application, Blob, Profile
+from .storage import cv_storage
+
+# (model, field name) of every FileField using the blob storage
+BLOB_FIELDS = ((Profile, 'cv'), (Application, 'cv_copy'))
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(cv_storage().prefix)
+
+
+def blob_digest(name):
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def incref(name):
+    if not is_blob(name):
+        return
+    if not Blob.objects.filter(name=name).update(ref_count=F('ref_count') + 1):
+        storage = cv_storage()
+        size = storage.size(name) if storage.exists(name) else 0
+        with transaction.atomic():
+            blob, created = Blob.objects.select_for_update().get_or_create(
+                name=name, defaults={'sha256': blob_digest(name), 'size': size, 'ref_count': 1}
+            )
+            if not created:
+                Blob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+
+
+def decref(name):
+    if is_blob(name):
+        Blob.objects.filter(name=name).update(ref_count=F('ref_count') - 1)
+
+
+def field_references():
+    """Counter of blob name -> number of field values naming it, from the rows."""
+    references = Counter()
+    for model, field in BLOB_FIELDS:
+        rows = (
+            model.objects.filter(**{f'{field}__startswith': cv_storage().prefix})
+            .values_list(field).annotate(count=Count('pk')).order_by()
+        )
+        for name, count in rows:
+            references[name] += count
+    return references
+
+
+def recount():
+    """Rebuild every Blob.ref_count from the rows; returns the number corrected."""
+    storage = cv_storage()
+    references = field_references()
+    corrected = 0
+    with transaction.atomic():
+        for blob in Blob.objects.select_for_update().only('name', 'ref_count'):
+            count = references.pop(blob.name, 0)
+            if blob.ref_count != count:
+                Blob.objects.filter(pk=blob.pk).update(ref_count=count)
+                corrected += 1
+        for name, count in references.items():
+            size = storage.size(name) if storage.exists(name) else 0
+            Blob.objects.create(name=name, sha256=blob_digest(name), size=size, ref_count=count)
+            corrected += 1
+    return corrected
+
+
+def stored_blob_names(storage):
+    """Every file under the blob prefix (blobs/<aa>/<bb>/<file>)."""
+    prefix = storage.prefix.rstrip('/')
+    if not storage.exists(prefix):
+        return
+    for first in storage.listdir(prefix)[0]:
+        for second in storage.listdir(f'{prefix}/{first}')[0]:
+            for filename in storage.listdir(f'{prefix}/{first}/{second}')[1]:
+                yield f'{prefix}/{first}/{second}/{filename}'
+
+
+def collect_garbage(grace=timedelta(hours=24), dry_run=False):
+    """
+    Delete blobs nobody references: rows whose count dropped to zero and
+    files with no row at all, if older than ``grace``. Returns the names.
+    """
+    storage = cv_storage()
+    cutoff = timezone.now() - grace
+    removed = []
+
+    for blob in Blob.objects.filter(ref_count__lte=0, created_at__lt=cutoff):
+        # Recheck against the rows, in case the count drifted
+        if any(model.objects.filter(**{field: blob.name}).exists() for model, field in BLOB_FIELDS):
+            continue
+        removed.append(blob.name)
+        if not dry_run:
+            storage.delete(blob.name)
+            blob.delete()
+
+    known = set(Blob.objects.values_list('name', flat=True))
+    for name in stored_blob_names(storage):
+        if name not in known and storage.get_modified_time(name) < cutoff:
+            removed.append(name)
+            if not dry_run:
+                storage.delete(name)
+    return removed
+
+
+def dedup_existing(dry_run=False):
+    """
+    Move CVs stored before the blob storage (cvs/, application_cvs/) into
+    it, pointing every row at the shared blob and deleting the old files.
+    Returns (files converted, bytes freed).
+    """
+    storage = cv_storage()
+    legacy = set()
+    for model, field in BLOB_FIELDS:
+        legacy.update(
+            model.objects.exclude(**{f'{field}__startswith': storage.prefix})
+            .exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+            .values_list(field, flat=True).distinct()
+        )
+
+    converted = freed = 0
+    planned = set()
+    for name in sorted(legacy):
+        if not storage.exists(name):
+            continue
+        size = storage.size(name)
+        with storage.open(name, 'rb') as source:
+            blob_name = storage.blob_name(name, source)
+            if storage.exists(blob_name) or blob_name in planned:
+                freed += size
+            planned.add(blob_name)
+            if not dry_run:
+                storage.save(name, source)
+        converted += 1
+        if dry_run:
+            continue
+        with transaction.atomic():
+            for model, field in BLOB_FIELDS:
+                # Bulk update, so counts are rebuilt by recount() below; the
+                # URL changes, so updated_at moves for ETags (portal.conditional)
+                model.objects.filter(**{field: name}).update(**{field: blob_name, 'updated_at': timezone.now()})
+        storage.delete(name)
+    if not dry_run:
+        recount()
+    return converted, freed
@@ -0,0 +1,179 @@
+"""
+Cache helpers: generation counters and the public internship response cache.
+
+Invalidation never scans keys. Each cache key embeds one or more counters,
+and a change bumps the counter so later requests miss and the stale
+entries simply age out. The counters need a shared cache backend
+(settings.CACHE_URL) to reach every worker process.
+
+InternshipViewSet caches `list` and `retrieve` responses for everyone who
+sees the public view: anonymous users and students. Keys cover the
+normalized query parameters that affect the payload, the host (absolute
+URLs appear in the payload) and:
+
+* the listing generation, bumped by any Internship or Application change
+  and by company profile edits (names and logos appear in the payload), for
+  list responses;
+* a per-internship generation for retrieve responses, bumped only when
+  that internship, one of its applications or its company profile changes.
+
+Responses are cached as the anonymous user sees them. For students,
+``has_applied`` is filled in after the cache lookup with a single query.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+from .models import Application
+from .utils import parse_skills
+
+LISTING_GENERATION_KEY = 'internships:response:generation'
+
+# Query parameters of the internship list/retrieve endpoints that change the
+# response; anything else is ignored by the view and left out of the key.
+CACHED_PARAMS = (
+    'q', 'skills', 'skills_match', 'location', 'remote', 'ordering',
+    'page', 'page_size', 'pagination', 'cursor', 'count', 'fields', 'expand',
+)
+
+
+def get_counter(key):
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, 1, timeout=None)
+        value = cache.get(key, 1)
+    return value
+
+
+async def aget_counter(key):
+    value = await cache.aget(key)
+    if value is None:
+        await cache.aadd(key, 1, timeout=None)
+        value = await cache.aget(key, 1)
+    return value
+
+
+def bump_counter(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def _internship_generation_key(pk):
+    return f'internships:response:{pk}:generation'
+
+
+def invalidate_internship_responses(*internship_ids):
+    """Drop cached list responses, and retrieve responses for ``internship_ids``."""
+    bump_counter(LISTING_GENERATION_KEY)
+    for internship_id in internship_ids:
+        bump_counter(_internship_generation_key(internship_id))
+
+
+def normalize_params(query_params):
+    """
+    The response-affecting query parameters in canonical form, so equivalent
+    requests (`?skills=Django, python` and `?skills=python,django`) share
+    a cache entry.
+    """
+    params = {}
+    for name in CACHED_PARAMS:
+        value = query_params.get(name, '').strip()
+        if name == 'q':
+            value = value or query_params.get('search', '').strip()
+            value = ' '.join(value.lower().split())
+        elif name == 'skills':
+            value = ','.join(sorted(parse_skills(value)))
+        elif name == 'location':
+            # Matched with icontains
+            value = value.lower()
+        elif name == 'remote' and value:
+            value = str(value.lower() in ['true', '1', 'yes'])
+        elif name in ('fields', 'expand'):
+            value = ','.join(sorted({item for item in value.split(',') if item}))
+        if value:
+            params[name] = value
+    return params
+
+
+def _generation_key(pk):
+    return LISTING_GENERATION_KEY if pk is None else _internship_generation_key(pk)
+
+
+def response_cache_key(request, action, pk=None):
+    return _response_cache_key(request, action, pk, get_counter(_generation_key(pk)))
+
+
+async def aresponse_cache_key(request, action, pk=None):
+    return _response_cache_key(request, action, pk, await aget_counter(_generation_key(pk)))
+
+
+def _response_cache_key(request, action, pk, generation):
+    raw = json.dumps(
+        [request.scheme, request.get_host(), action, pk, generation, normalize_params(request.query_params)],
+        sort_keys=True
+    )
+    return f'internships:response:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def get_cached_response(key):
+    data = cache.get(key)
+    metrics.cache_lookup('internship_responses', data is not None)
+    return data
+
+
+async def aget_cached_response(key):
+    data = await cache.aget(key)
+    metrics.cache_lookup('internship_responses', data is not None)
+    return data
+
+
+def set_cached_response(key, data):
+    cache.set(key, data, settings.INTERNSHIP_CACHE_TIMEOUT)
+
+
+async def aset_cached_response(key, data):
+    await cache.aset(key, data, settings.INTERNSHIP_CACHE_TIMEOUT)
+
+
+def _has_applied_items(data):
+    if isinstance(data, dict) and 'results' in data:
+        items = data['results']
+    elif isinstance(data, list):
+        items = data
+    else:
+        items = [data]
+    return [item for item in items if 'has_applied' in item]
+
+
+def _applied_queryset(profile, items):
+    return Application.objects.filter(
+        student=profile, internship_id__in=[item['id'] for item in items]
+    ).values_list('internship_id', flat=True)
+
+
+def merge_has_applied(data, profile):
+    """Set `has_applied` on cached internship data for one student."""
+    items = _has_applied_items(data)
+    if not items:
+        return data
+
+    applied = set(_applied_queryset(profile, items))
+    for item in items:
+        item['has_applied'] = item['id'] in applied
+    return data
+
+
+async def amerge_has_applied(data, profile):
+    items = _has_applied_items(data)
+    if not items:
+        return data
+
+    applied = {pk async for pk in _applied_queryset(profile, items)}
+    for item in items:
+        item['has_applied'] = item['id'] in applied
+    return data
@@ -0,0 +1,105 @@
+"""
+Conditional GET support (ETag / Last-Modified).
+
+Validators are computed from the data, never from the rendered body: one
+aggregate query returns the row count and the latest ``updated_at`` of the
+rows (and related rows) a response is built from. The ETag hashes that
+version together with the full request URL and the requesting user, since
+payloads depend on query parameters and on who is asking (`has_applied`),
+and with the signing window of the media URLs embedded in them.
+When the client's `If-None-Match` / `If-Modified-Since` still matches, the
+view answers 304 without running the serializer.
+
+The count catches deletions in the ETag. Last-Modified only tracks the
+newest `updated_at`, so clients should prefer `If-None-Match`, which takes
+precedence anyway when both are sent.
+"""
+import hashlib
+import json
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .storage import current_window
+
+
+def version_aggregates(fields):
+    return {'count': Count('pk'), **{f'max_{index}': Max(field) for index, field in enumerate(fields)}}
+
+
+def version_result(result, fields):
+    return result['count'], [result[f'max_{index}'] for index in range(len(fields))]
+
+
+def queryset_version(queryset, fields):
+    """
+    (count, [max(field) for field in fields]) over ``queryset`` in a single
+    query. ``fields`` may follow forward relations, e.g. 'poster__updated_at'.
+    """
+    return version_result(queryset.order_by().aggregate(**version_aggregates(fields)), fields)
+
+
+async def aqueryset_version(queryset, fields):
+    return version_result(await queryset.order_by().aaggregate(**version_aggregates(fields)), fields)
+
+
+def get_validators(request, count, timestamps):
+    """(strong ETag, Last-Modified timestamp or None) for a queryset version."""
+    timestamps = [stamp for stamp in timestamps if stamp is not None]
+    raw = json.dumps([
+        request.build_absolute_uri(),
+        request.user.pk,
+        count,
+        [stamp.isoformat() for stamp in timestamps],
+        # Payloads embed signed media URLs that rotate with the window
+        current_window(),
+    ])
+    etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    last_modified = int(max(timestamps).timestamp()) if timestamps else None
+    return etag, last_modified
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Stored by the browser, but revalidated on every use; never shared
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def conditional_response(request, queryset, fields, respond, require_rows=False):
+    """
+    Answer 304 (or 412) from the version of ``queryset`` if the request's
+    preconditions allow it, otherwise call ``respond()`` and attach the
+    validators to a successful response. With ``require_rows``, an empty
+    queryset (e.g. a detail lookup that will 404) skips the check.
+    """
+    count, timestamps = queryset_version(queryset, fields)
+    if require_rows and not count:
+        return respond()
+
+    etag, last_modified = get_validators(request, count, timestamps)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = respond()
+        if response.status_code != 200:
+            return response
+    return set_validators(response, etag, last_modified)
+
+
+async def aconditional_response(request, queryset, fields, respond, require_rows=False):
+    """conditional_response() for async views: ``respond`` is a coroutine function."""
+    count, timestamps = await aqueryset_version(queryset, fields)
+    if require_rows and not count:
+        return await respond()
+
+    etag, last_modified = get_validators(request, count, timestamps)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = await respond()
+        if response.status_code != 200:
+            return response
+    return set_validators(response, etag, last_modified)
@@ -0,0 +1,82 @@
+"""
+Denormalized application counters on Internship.
+
+`applications_count` and one `<status>_count` column per
+Application.STATUS_CHOICES value are kept in step with the Application
+rows by relative F() updates (so concurrent requests never overwrite
+each other's changes). Signals count applications as they are created,
+deleted or saved with a new status (ApplicationStatusSerializer saves
+in a transaction, so row and counters commit together), and bulk_status
+counts the rows it updates. Each update also bumps Internship.updated_at
+for the ETags in portal.conditional. Internship.save() leaves the
+counters out when it updates a row, so edits never overwrite them.
+Other QuerySet.update() calls and raw SQL bypass the signals; the
+Application rows stay the source of truth, and recount() rebuilds the
+counters from them.
+"""
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Application, Internship
+
+STATUS_COUNT_FIELDS = {value: f'{value}_count' for value, _ in Application.STATUS_CHOICES}
+COUNT_FIELDS = ('applications_count', *STATUS_COUNT_FIELDS.values())
+
+
+def adjust(internship_id, deltas):
+    """Apply a {status: change} Counter to one internship's counters."""
+    updates = {
+        STATUS_COUNT_FIELDS[value]: F(STATUS_COUNT_FIELDS[value]) + delta
+        for value, delta in deltas.items() if delta
+    }
+    total = sum(deltas.values())
+    if total:
+        updates['applications_count'] = F('applications_count') + total
+    if updates:
+        Internship.objects.filter(pk=internship_id).update(updated_at=timezone.now(), **updates)
+
+
+def application_added(application):
+    adjust(application.internship_id, Counter({application.status: 1}))
+
+
+def application_removed(application):
+    adjust(application.internship_id, Counter({application.status: -1}))
+
+
+def status_changed(internship_id, previous, status, count=1):
+    """``count`` applications of one internship moved from ``previous`` to ``status``."""
+    if previous != status:
+        adjust(internship_id, Counter({previous: -count, status: count}))
+
+
+def status_counts(internship):
+    return {value: getattr(internship, field) for value, field in STATUS_COUNT_FIELDS.items()}
+
+
+def recount(internship_ids=None):
+    """
+    Rebuild the counters from the Application rows, for all internships
+    or just ``internship_ids``. Returns the number of internships corrected.
+    """
+    counts = defaultdict(dict)
+    rows = Application.objects.values_list('internship_id', 'status').annotate(n=Count('pk')).order_by()
+    internships = Internship.objects.order_by()
+    if internship_ids is not None:
+        rows = rows.filter(internship_id__in=internship_ids)
+        internships = internships.filter(pk__in=internship_ids)
+    for internship_id, value, n in rows:
+        counts[internship_id][STATUS_COUNT_FIELDS[value]] = n
+
+    corrections = {}
+    for row in internships.values('pk', *COUNT_FIELDS):
+        wanted = dict.fromkeys(STATUS_COUNT_FIELDS.values(), 0)
+        wanted.update(counts.get(row['pk'], {}))
+        wanted['applications_count'] = sum(wanted.values())
+        if any(row[field] != n for field, n in wanted.items()):
+            corrections[row['pk']] = wanted
+    for pk, wanted in corrections.items():
+        Internship.objects.filter(pk=pk).update(updated_at=timezone.now(), **wanted)
+    return len(corrections)
@@ -0,0 +1,194 @@
+"""
+Read-only list serialization straight from ``.values()`` rows.
+
+InternshipListSerializer and ApplicationListSerializer build a model
+instance per row and then run every field through DRF's serializer
+machinery. For the default list payload (no `expand`) the views fetch
+plain dicts with ``.values()`` instead and reshape them here. The output
+must stay identical to the model serializers (the tests compare rendered
+bytes), so every converter below mirrors the matching DRF field's
+``to_representation`` under this project's REST_FRAMEWORK settings.
+"""
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .counters import STATUS_COUNT_FIELDS
+from .instrumentation import timer
+from .models import Internship, Profile
+
+
+def decimal_to_string(model_field):
+    """rest_framework DecimalField output (coerce_to_string) for ``model_field``."""
+    quantum = Decimal(1).scaleb(-model_field.decimal_places)
+
+    def to_string(value):
+        if value is None:
+            return None
+        return '{:f}'.format(value.quantize(quantum))
+    return to_string
+
+
+def datetime_to_string(value):
+    """rest_framework DateTimeField output for the default ISO 8601 format."""
+    if not value:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def date_to_string(value):
+    """rest_framework DateField output for the default ISO 8601 format."""
+    return value.isoformat() if value else None
+
+
+def file_to_url(model_field, request, memoize=True):
+    """
+    rest_framework FileField/ImageField output for a stored file name.
+    URLs are memoized by default, since a page of internships often shares
+    one company's logo; pass memoize=False when names are mostly unique
+    and rows are unbounded.
+    """
+    storage = model_field.storage
+    urls = {}
+
+    def build(name):
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def to_url(name):
+        if not name:
+            return None
+        if not memoize:
+            return build(name)
+        if name not in urls:
+            urls[name] = build(name)
+        return urls[name]
+    return to_url
+
+
+class ValuesSerializer:
+    """
+    Base class for serializers over ``.values()`` rows.
+
+    Subclasses list the ``columns`` they read and implement
+    ``to_representation(row)``. ``fields`` narrows the output the same way
+    SparseFieldsetMixin does.
+    """
+    columns = ()
+
+    def __init__(self, request=None, fields=None):
+        self.request = request
+        self.fields = set(fields) | {'id'} if fields else None
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    def serialize(self, rows):
+        with timer('serialize'):
+            return self.serialize_rows(rows)
+
+    def serialize_rows(self, rows):
+        data = [self.to_representation(row) for row in rows]
+        if self.fields:
+            data = [
+                {name: value for name, value in item.items() if name in self.fields}
+                for item in data
+            ]
+        return data
+
+
+class InternshipListValuesSerializer(ValuesSerializer):
+    """Same output as InternshipListSerializer, from an annotated queryset."""
+    columns = (
+        'id', 'title', 'poster__company_name', 'poster__user__username', 'poster__logo',
+        'stipend', 'duration', 'location', 'remote', 'last_date', 'is_active',
+        'skills_required', 'created_at', 'applications_count', 'user_has_applied',
+        'poster_id', *STATUS_COUNT_FIELDS.values(),
+    )
+
+    def __init__(self, request=None, fields=None):
+        super().__init__(request, fields)
+        self.stipend = decimal_to_string(Internship._meta.get_field('stipend'))
+        self.logo = file_to_url(Profile._meta.get_field('logo'), request)
+        user = request.user if request is not None else None
+        profile = getattr(user, 'profile', None) if user is not None and user.is_authenticated else None
+        self.profile_id = profile.pk if profile is not None else None
+
+    def status_counts(self, row):
+        # Same rule as InternshipSerializer.get_status_counts
+        if self.profile_id is None or row['poster_id'] != self.profile_id:
+            return None
+        return {value: row[field] for value, field in STATUS_COUNT_FIELDS.items()}
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'company_name': row['poster__company_name'] or row['poster__user__username'],
+            'company_logo': self.logo(row['poster__logo']),
+            'stipend': self.stipend(row['stipend']),
+            'duration': row['duration'],
+            'location': row['location'],
+            'remote': row['remote'],
+            'last_date': date_to_string(row['last_date']),
+            'is_active': row['is_active'],
+            'skills_required': row['skills_required'],
+            'created_at': datetime_to_string(row['created_at']),
+            'applications_count': row['applications_count'],
+            'status_counts': self.status_counts(row),
+            'has_applied': row['user_has_applied'],
+        }
+
+
+class ApplicationListValuesSerializer(ValuesSerializer):
+    """Same output as ApplicationListSerializer."""
+    columns = (
+        'id', 'status', 'applied_at',
+        'internship__id', 'internship__title', 'internship__poster__company_name',
+        'internship__poster__user__username', 'internship__poster__logo',
+        'internship__stipend', 'internship__location', 'internship__is_active',
+        'student__id', 'student__user__username', 'student__user__first_name',
+        'student__user__last_name', 'student__college', 'student__skills',
+    )
+
+    def __init__(self, request=None, fields=None):
+        super().__init__(request, fields)
+        self.stipend = decimal_to_string(Internship._meta.get_field('stipend'))
+        self.logo = file_to_url(Profile._meta.get_field('logo'), request)
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'internship': {
+                'id': row['internship__id'],
+                'title': row['internship__title'],
+                'company_name': (
+                    row['internship__poster__company_name'] or
+                    row['internship__poster__user__username']
+                ),
+                'company_logo': self.logo(row['internship__poster__logo']),
+                'stipend': self.stipend(row['internship__stipend']),
+                'location': row['internship__location'],
+                'is_active': row['internship__is_active'],
+            },
+            'student': {
+                'id': row['student__id'],
+                'username': row['student__user__username'],
+                # User.get_full_name()
+                'full_name': ('%s %s' % (
+                    row['student__user__first_name'], row['student__user__last_name']
+                )).strip(),
+                'college': row['student__college'],
+                'skills': row['student__skills'],
+            },
+            'status': row['status'],
+            'applied_at': datetime_to_string(row['applied_at']),
+        }
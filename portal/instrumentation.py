@@ -0,0 +1,90 @@
+"""
+Per-request timings for intern_portal.middleware.RequestMetricsMiddleware.
+
+A sampled request gets a RequestMetrics in a context variable; while it
+is set, every SQL statement (through connection.execute_wrapper), the
+outermost serializer's to_representation() and the renderer add their
+time to it. Unsampled requests leave the variable unset, so the hooks
+cost one ContextVar.get() each.
+
+Serializer time includes the SQL of lazily evaluated relations, and
+render time is only what the renderer itself takes (DRF's response
+rendering), so the Server-Timing entries overlap rather than add up.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from rest_framework import serializers
+
+current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = Counter()
+        self.statements = Counter()
+        self.depth = 0
+
+    @property
+    def queries(self):
+        return sum(self.statements.values())
+
+    def duplicates(self, threshold):
+        """SQL statements run at least ``threshold`` times, most repeated first."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def execute(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.durations['db'] += time.perf_counter() - start
+            # Parameterized SQL: the same statement with other values is a repeat
+            self.statements[sql] += 1
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+@contextmanager
+def timer(name):
+    """Add the time of the block to the current request's ``name`` timing."""
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.durations[name] += time.perf_counter() - start
+
+
+def timed_representation(to_representation):
+    """Time the outermost (not nested) serializer of a request."""
+    @wraps(to_representation)
+    def wrapper(self, *args, **kwargs):
+        metrics = current.get()
+        if metrics is None or metrics.depth:
+            return to_representation(self, *args, **kwargs)
+        metrics.depth += 1
+        start = time.perf_counter()
+        try:
+            return to_representation(self, *args, **kwargs)
+        finally:
+            metrics.durations['serialize'] += time.perf_counter() - start
+            metrics.depth -= 1
+    wrapper.timed = True
+    return wrapper
+
+
+def install():
+    """Hook the request timings into DRF's serializers (once per process)."""
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.to_representation, 'timed', False):
+            cls.to_representation = timed_representation(cls.to_representation)
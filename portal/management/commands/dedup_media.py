@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from portal.blobs import dedup_existing
+
+
+class Command(BaseCommand):
+    help = 'Move CVs stored before content addressing into shared blobs (see portal.blobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report the savings without moving anything')
+
+    def handle(self, *args, **options):
+        converted, freed = dedup_existing(dry_run=options['dry_run'])
+        verb = 'Would convert' if options['dry_run'] else 'Converted'
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {verb} {converted} CV files, freeing {freed / (1024 * 1024):.1f} MB'
+        ))
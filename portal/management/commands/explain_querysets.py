@@ -0,0 +1,116 @@
+import re
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from portal.models import Profile, Internship, Application
+from portal.views import InternshipViewSet, ApplicationViewSet
+
+PAGE_SIZE = 10
+
+# Plan lines that mean a full table scan
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)\s*$', re.MULTILINE),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN on the querysets behind each API endpoint and fail if any '
+        'of them falls back to a sequential scan. Only meaningful on a large '
+        'dataset (e.g. seed_portal --scale 1000000): planners happily scan tiny tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Refresh planner statistics (ANALYZE) before explaining'
+        )
+        parser.add_argument(
+            '--allow', action='append', default=[], metavar='TABLE',
+            help='Table allowed to be scanned sequentially (repeatable)'
+        )
+        parser.add_argument(
+            '--show-plans', action='store_true', help='Print every query plan'
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'Unsupported database backend: {connection.vendor}')
+
+        student = Profile.objects.filter(role='student').select_related('user').first()
+        company = Profile.objects.filter(role='company').select_related('user').first()
+        internship = Internship.objects.filter(poster=company).first() if company else None
+        if not (student and company and internship):
+            raise CommandError('Seed some data first (seed_portal --scale N).')
+
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        failures = []
+        for name, queryset in self.query_shapes(student, company, internship):
+            plan = queryset.explain()
+            scanned = sorted(set(pattern.findall(plan)) - set(options['allow']))
+            if options['show_plans']:
+                self.stdout.write(f'\n--- {name}\n{plan}')
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'✗ {name}: sequential scan on {", ".join(scanned)}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {name}'))
+
+        if failures:
+            raise CommandError(f'{len(failures)} queryset(s) fall back to sequential scans.')
+
+    def view_queryset(self, viewset_class, action, user, params=None, **kwargs):
+        """The paginated queryset `viewset_class` builds for one request."""
+        request = Request(APIRequestFactory().get('/', params or {}))
+        request.user = user
+        view = viewset_class(action=action, request=request, format_kwarg=None, args=(), kwargs=kwargs)
+        queryset = view.filter_queryset(view.get_queryset())
+        if 'pk' in kwargs:
+            return queryset.filter(pk=kwargs['pk'])
+        if (params or {}).get('pagination') == 'cursor':
+            queryset = queryset.order_by(*view.keyset_ordering)
+        return queryset[:PAGE_SIZE]
+
+    def query_shapes(self, student, company, internship):
+        anonymous = AnonymousUser()
+        yield 'internships: public list', self.view_queryset(InternshipViewSet, 'list', anonymous)
+        yield 'internships: public list (cursor)', self.view_queryset(
+            InternshipViewSet, 'list', anonymous, {'pagination': 'cursor'}
+        )
+        yield 'internships: student list', self.view_queryset(InternshipViewSet, 'list', student.user)
+        yield 'internships: remote only', self.view_queryset(
+            InternshipViewSet, 'list', anonymous, {'remote': 'true'}
+        )
+        yield 'internships: text search', self.view_queryset(
+            InternshipViewSet, 'list', anonymous, {'q': 'python'}
+        )
+        yield 'internships: skills filter', self.view_queryset(
+            InternshipViewSet, 'list', anonymous, {'skills': 'python,django'}
+        )
+        yield 'internships: company list', self.view_queryset(InternshipViewSet, 'list', company.user)
+        yield 'internships: my_internships', self.view_queryset(
+            InternshipViewSet, 'list', company.user, {'my_internships': 'true'}
+        )
+        yield 'internships: retrieve', self.view_queryset(
+            InternshipViewSet, 'retrieve', student.user, pk=internship.pk
+        )
+        yield 'applications: student list', self.view_queryset(ApplicationViewSet, 'list', student.user)
+        yield 'applications: company list', self.view_queryset(ApplicationViewSet, 'list', company.user)
+        applications = ApplicationViewSet()
+        yield 'applications: my_applications', applications.related_queryset(
+            Application.objects.filter(student=student)
+        )[:PAGE_SIZE]
+        yield 'applications: internship_applications', applications.related_queryset(
+            Application.objects.filter(internship=internship)
+        )[:PAGE_SIZE]
+        yield 'applications: by status', Application.objects.filter(
+            status='pending'
+        ).order_by('-applied_at')[:PAGE_SIZE]
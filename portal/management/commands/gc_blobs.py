@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from portal.blobs import collect_garbage, recount
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed CV blobs no profile or application references (see portal.blobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='List what would be deleted without deleting')
+        parser.add_argument(
+            '--grace-hours', type=float, default=24,
+            help='Keep unreferenced blobs younger than this (uploads not yet attached)'
+        )
+        parser.add_argument('--recount', action='store_true', help='Rebuild reference counts from the rows first')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            corrected = recount()
+            self.stdout.write(self.style.SUCCESS(f'✓ Corrected {corrected} reference counts'))
+        removed = collect_garbage(timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+        for name in removed:
+            self.stdout.write(f'  {name}')
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'✓ {verb} {len(removed)} blobs'))
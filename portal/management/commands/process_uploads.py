@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from portal.uploads import expire_sessions, process_pending, reclaim_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Validate and process quarantined CV and logo uploads (see portal.uploads)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+        parser.add_argument(
+            '--interval', type=float, default=1.0, help='Seconds to wait between polls of an empty queue'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            reclaimed = reclaim_stale_jobs()
+            if reclaimed:
+                self.stdout.write(f'Requeued {reclaimed} stale jobs')
+            expired = expire_sessions()
+            if expired:
+                self.stdout.write(f'Discarded {expired} abandoned upload sessions')
+            processed = process_pending()
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f'✓ Processed {processed} uploads'))
+            if options['once']:
+                return
+            # Long-running: drop connections the database may have timed out
+            close_old_connections()
+            time.sleep(options['interval'])
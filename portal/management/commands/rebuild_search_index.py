@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from portal.models import Internship
+from portal.search import rebuild_cv_index, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the internship and CV full-text search indexes (e.g. after bulk loads)'
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write('Rebuilding internship search index...')
+        rebuild_index()
+        rebuild_cv_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Indexed {Internship.objects.count()} internships'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from portal.counters import recount
+
+
+class Command(BaseCommand):
+    help = "Rebuild internships' denormalized application counters from the applications (see portal.counters)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('internships', nargs='*', type=int, help='Internship ids (default: all)')
+
+    def handle(self, *args, **options):
+        corrected = recount(options['internships'] or None)
+        self.stdout.write(self.style.SUCCESS(f'✓ Corrected the counters of {corrected} internships'))
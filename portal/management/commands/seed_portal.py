@@ -1,14 +1,63 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
-from portal.models import Profile, Internship, Application
+from django.db import transaction
+from portal.models import Profile, Internship, Application, ProfileSkill, InternshipSkill
+from portal.skills import get_or_create_skills
+from portal.utils import parse_skills
+from portal import caching, recommendations, search
 from datetime import date, timedelta
 import random
+import time
+
+# --scale: rows per unit (one company with its internships and a pool of
+# students who each apply to a few of them)
+INTERNSHIPS_PER_COMPANY = 10
+STUDENTS_PER_UNIT = 50
+APPLICATIONS_PER_STUDENT = 4
+# Units written per transaction; bounds memory whatever the scale
+UNITS_PER_CHUNK = 200
+BATCH_SIZE = 5000
+
+SKILL_POOL = [
+    'Python', 'Django', 'JavaScript', 'React', 'Node.js', 'Java', 'Spring Boot', 'Go', 'Rust',
+    'SQL', 'PostgreSQL', 'MongoDB', 'Docker', 'Kubernetes', 'AWS', 'Linux', 'Git', 'HTML', 'CSS',
+    'TypeScript', 'Angular', 'Flutter', 'Kotlin', 'Swift', 'Machine Learning', 'Pandas', 'NumPy',
+    'Data Analysis', 'Tableau', 'Figma', 'UI Design', 'User Research', 'Content Writing', 'SEO',
+    'Marketing', 'Sales', 'Excel', 'Communication', 'REST API', 'GraphQL',
+]
+TITLES = [
+    'Backend Developer', 'Frontend Developer', 'Full Stack Developer', 'Data Science', 'Data Analyst',
+    'Mobile App Developer', 'DevOps', 'UI/UX Design', 'Machine Learning', 'Content Writing',
+    'Digital Marketing', 'Business Development', 'QA Automation', 'Cloud Engineering',
+]
+LOCATIONS = ['Mumbai', 'Bangalore', 'Hyderabad', 'Pune', 'Delhi', 'Chennai', 'Kolkata', 'Ahmedabad', 'Noida']
+DURATIONS = ['1 month', '2 months', '3 months', '4 months', '6 months']
+COLLEGES = ['IIT Bombay', 'IIT Delhi', 'NIT Trichy', 'BITS Pilani', 'VIT Vellore', 'DTU', 'IIIT Hyderabad']
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Ananya', 'Rohan', 'Meera', 'Kabir', 'Saanvi', 'Arjun', 'Priya']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Nair', 'Singh', 'Das', 'Mehta', 'Khan']
+# Share of applications in each status
+STATUS_WEIGHTS = {'pending': 50, 'reviewing': 20, 'shortlisted': 15, 'rejected': 10, 'accepted': 5}
 
 
 class Command(BaseCommand):
     help = 'Seed the database with sample data for Internship Portal'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int,
+            help=(
+                f'Generate N units of synthetic data instead of the demo set: per unit 1 company, '
+                f'{INTERNSHIPS_PER_COMPANY} internships, {STUDENTS_PER_UNIT} students and '
+                f'{STUDENTS_PER_UNIT * APPLICATIONS_PER_STUDENT} applications (all with password123)'
+            )
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for --scale (same seed, same data)')
+
     def handle(self, *args, **kwargs):
+        if kwargs.get('scale') is not None:
+            return self.seed_scale(kwargs['scale'], kwargs['seed'])
+
         self.stdout.write('Starting database seeding...')
         
         # Clear existing data
@@ -261,3 +310,109 @@ class Command(BaseCommand):
         self.stdout.write(f'  • Rejected: {Application.objects.filter(status="rejected").count()}')
         
         self.stdout.write('\n✨ Ready to test the application!\n')
+
+    def seed_scale(self, scale, seed):
+        """
+        Bulk-insert synthetic data: one PBKDF2 hash shared by every user,
+        bulk_create for each table, and the derived data (skill tags,
+        application counters) written directly instead of through the
+        per-row signals. Existing data is kept.
+        """
+        if scale < 1:
+            raise CommandError('--scale must be at least 1.')
+        if User.objects.filter(username__startswith='seed_').exists():
+            raise CommandError('Synthetic users already exist; run manage.py flush first.')
+
+        started = time.monotonic()
+        rng = random.Random(seed)
+        password = make_password('password123')
+        skills = parse_skills(', '.join(SKILL_POOL))
+        skill_ids = {skill.name: skill.pk for skill in get_or_create_skills(skills)}
+        self.skill_names = list(skills.values())
+
+        for first in range(0, scale, UNITS_PER_CHUNK):
+            units = min(UNITS_PER_CHUNK, scale - first)
+            with transaction.atomic():
+                self.seed_units(rng, first, units, password, skill_ids)
+            self.stdout.write(f'  {first + units}/{scale} units', ending='\r')
+
+        search.rebuild_index()
+        caching.invalidate_internship_responses()
+        recommendations.invalidate_internships()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Seeded {scale * (1 + STUDENTS_PER_UNIT)} users, {scale * INTERNSHIPS_PER_COMPANY} internships '
+            f'and {scale * STUDENTS_PER_UNIT * APPLICATIONS_PER_STUDENT} applications '
+            f'in {time.monotonic() - started:.1f}s'
+        ))
+
+    def pick_skills(self, rng, low, high):
+        return ', '.join(rng.sample(self.skill_names, rng.randint(low, high)))
+
+    def seed_units(self, rng, first, units, password, skill_ids):
+        today = date.today()
+        companies = [
+            User(username=f'seed_company_{i}', email=f'company{i}@example.com', password=password,
+                 first_name='Company', last_name=str(i))
+            for i in range(first, first + units)
+        ]
+        students = [
+            User(username=f'seed_student_{i}', email=f'student{i}@example.com', password=password,
+                 first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES))
+            for i in range(first * STUDENTS_PER_UNIT, (first + units) * STUDENTS_PER_UNIT)
+        ]
+        User.objects.bulk_create(companies + students, batch_size=BATCH_SIZE)
+
+        # bulk_create skips the post_save signal that creates profiles
+        profiles = [
+            Profile(user=user, role='company', company_name=f'Seed Corp {user.last_name}',
+                    bio='Synthetic company.', skills=self.pick_skills(rng, 3, 6))
+            for user in companies
+        ] + [
+            Profile(user=user, role='student', college=rng.choice(COLLEGES), degree='B.Tech',
+                    graduation_year=rng.randint(today.year, today.year + 3), skills=self.pick_skills(rng, 2, 8))
+            for user in students
+        ]
+        Profile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+        ProfileSkill.objects.bulk_create([
+            ProfileSkill(profile=profile, skill_id=skill_ids[name])
+            for profile in profiles for name in parse_skills(profile.skills)
+        ], batch_size=BATCH_SIZE)
+
+        internships = [
+            Internship(
+                poster=company,
+                title=f'{rng.choice(TITLES)} Intern',
+                description=f'Work with our team on {self.pick_skills(rng, 2, 4)} projects.',
+                skills_required=self.pick_skills(rng, 3, 6),
+                stipend=rng.randrange(5000, 40001, 500),
+                duration=rng.choice(DURATIONS),
+                location=rng.choice(LOCATIONS),
+                remote=rng.random() < 0.3,
+                last_date=today + timedelta(days=rng.randint(-10, 60)),
+                is_active=rng.random() < 0.9,
+            )
+            for company in profiles[:units] for _ in range(INTERNSHIPS_PER_COMPANY)
+        ]
+        # Each student applies within their own unit; counters are filled
+        # in before the internships are written
+        applications = []
+        statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        for n, student in enumerate(profiles[units:]):
+            unit = n // STUDENTS_PER_UNIT
+            choices = internships[unit * INTERNSHIPS_PER_COMPANY:(unit + 1) * INTERNSHIPS_PER_COMPANY]
+            for internship in rng.sample(choices, APPLICATIONS_PER_STUDENT):
+                application_status = rng.choices(statuses, weights)[0]
+                applications.append((internship, student, application_status))
+                internship.applications_count += 1
+                field = f'{application_status}_count'
+                setattr(internship, field, getattr(internship, field) + 1)
+        Internship.objects.bulk_create(internships, batch_size=BATCH_SIZE)
+        InternshipSkill.objects.bulk_create([
+            InternshipSkill(internship=internship, skill_id=skill_ids[name])
+            for internship in internships for name in parse_skills(internship.skills_required)
+        ], batch_size=BATCH_SIZE)
+        Application.objects.bulk_create([
+            Application(internship=internship, student=student, status=application_status,
+                        cover_letter='I would like to apply for this internship.')
+            for internship, student, application_status in applications
+        ], batch_size=BATCH_SIZE)
@@ -0,0 +1,163 @@
+"""
+Authorized media delivery.
+
+Django decides who may fetch a file; with settings.MEDIA_SERVE_MODE set
+to 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd) the
+bytes are then sent by the proxy, so a worker is released as soon as the
+headers are written. The default 'django' mode streams the file itself
+(FileResponse, which lets the WSGI server use sendfile()) and answers
+single-range requests, so downloads can resume without a proxy.
+"""
+import mimetypes
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import Application, Profile
+from .storage import check_media_signature, is_public
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+RANGE_CHUNK_SIZE = 64 * 1024
+# Seconds browsers and proxies may keep public files (logos)
+PUBLIC_MEDIA_MAX_AGE = 24 * 60 * 60
+# Private CV files: content-addressed blobs, and names from before them
+CV_PREFIXES = ('blobs/', 'cvs/', 'application_cvs/')
+
+
+def clean_media_name(path):
+    """The storage name for a requested path, or None if it leaves MEDIA_ROOT."""
+    name = posixpath.normpath(path).lstrip('/')
+    if not name or name == '.' or name == '..' or name.startswith('../'):
+        return None
+    return name
+
+
+def can_access(request, name):
+    """
+    Whether ``request`` may read the media file ``name``: logos are
+    public; anything else needs a signed URL (portal.storage) or a user
+    allowed to see it.
+    """
+    if is_public(name):
+        return True
+    if check_media_signature(name, request.GET.get('w'), request.GET.get('s')):
+        return True
+
+    user = request.user
+    if not user.is_authenticated:
+        return False
+    if user.is_staff:
+        return True
+    profile = getattr(user, 'profile', None)
+    if profile is None:
+        return False
+    if name.startswith(CV_PREFIXES):
+        # The student's own CV, an application's CV for its student, or
+        # either for the company the application went to
+        return (
+            Profile.objects.filter(pk=profile.pk, cv=name).exists() or
+            Application.objects.filter(
+                Q(student__cv=name, internship__poster_id=profile.pk) |
+                Q(cv_copy=name) & (Q(student_id=profile.pk) | Q(internship__poster_id=profile.pk))
+            ).exists()
+        )
+    return False
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to ignore
+    the header (absent, malformed or multi-range), or False if the range
+    cannot be satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def read_range(file, start, length):
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def file_response(request, name, storage=default_storage):
+    """Stream ``name`` from ``storage``, honouring If-Modified-Since and Range."""
+    last_modified = int(storage.get_modified_time(name).timestamp())
+    response = get_conditional_response(request, last_modified=last_modified)
+    if response is not None:
+        return response
+
+    size = storage.size(name)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if request.method == 'GET' and (if_range is None or if_range == http_date(last_modified)):
+        byte_range = parse_range(request.headers.get('Range'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is not None:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            read_range(storage.open(name, 'rb'), start, end - start + 1),
+            status=206, content_type=content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def offload_response(name, storage=default_storage):
+    """Empty response telling the front proxy to send the file itself."""
+    response = HttpResponse(content_type=mimetypes.guess_type(name)[0] or 'application/octet-stream')
+    if settings.MEDIA_SERVE_MODE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(name)
+    else:
+        response['X-Sendfile'] = storage.path(name)
+    return response
+
+
+def media_response(request, name, storage=default_storage):
+    if settings.MEDIA_SERVE_MODE == 'django':
+        response = file_response(request, name, storage)
+    else:
+        response = offload_response(name, storage)
+    if is_public(name):
+        patch_cache_control(response, public=True, max_age=PUBLIC_MEDIA_MAX_AGE)
+    else:
+        patch_cache_control(response, private=True, max_age=settings.MEDIA_URL_MAX_AGE)
+    return response
@@ -0,0 +1,118 @@
+"""
+Prometheus metrics, served at /metrics (intern_portal.views.metrics).
+
+Under gunicorn every worker is a separate process with its own copy of
+these objects. With PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py
+prepares it) prometheus_client keeps the values in per-process mmap
+files there instead, and a scrape, whichever worker answers it, sums
+the files of all workers, dead ones included for counters and
+histograms. Without it (runserver, tests) the values are per process.
+
+RequestMetricsMiddleware reports every request: its latency and status
+by view (`InternshipViewSet.list`, `serve_media`, ...) and, for the
+requests it samples (REQUEST_METRICS_SAMPLE_RATE), the query count.
+Cache lookups are counted by cache; the hit ratio is
+rate(hits) / rate(lookups) in PromQL.
+"""
+import os
+import sys
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+try:
+    import resource
+except ImportError:  # Windows; the peak memory gauge is not reported there
+    resource = None
+
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    # Other commands (migrate, process_uploads) share the environment and
+    # may run before gunicorn has created it
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+REQUEST_LATENCY = Histogram(
+    'portal_request_duration_seconds', 'Request latency by view and action', ['view', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter('portal_requests', 'Responses by view and status code', ['view', 'method', 'status'])
+REQUEST_QUERIES = Histogram(
+    'portal_request_queries', 'SQL queries per sampled request', ['view'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+CACHE_LOOKUPS = Counter('portal_cache_lookups', 'Cache lookups', ['cache'])
+CACHE_HITS = Counter('portal_cache_hits', 'Cache lookups that found an entry', ['cache'])
+
+# One series per live worker process (liveall), or summed over them (livesum)
+WORKERS = Gauge('portal_workers', 'Live worker processes', multiprocess_mode='livesum')
+WORKER_REQUESTS_IN_PROGRESS = Gauge(
+    'portal_worker_requests_in_progress', 'Requests being handled', multiprocess_mode='livesum'
+)
+WORKER_START_TIME = Gauge(
+    'portal_worker_start_time_seconds', 'Worker start time (Unix time)', multiprocess_mode='liveall'
+)
+WORKER_MAX_RSS = Gauge(
+    'portal_worker_max_rss_bytes', 'Peak resident memory of the worker', multiprocess_mode='liveall'
+)
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+# ru_maxrss is in kilobytes on Linux, bytes on macOS
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+# Set by the first request of each process: a gunicorn master that
+# preloads the app imports this module before forking the workers
+_worker_pid = None
+
+
+def register_worker():
+    global _worker_pid
+    _worker_pid = os.getpid()
+    WORKERS.set(1)
+    WORKER_START_TIME.set(time.time())
+
+
+def view_label(request):
+    """`ViewSet.action` for DRF views, the function name otherwise."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    view = match.func
+    cls = getattr(view, 'cls', None)
+    if cls is None:
+        return getattr(view, '__name__', type(view).__name__)
+    actions = getattr(view, 'actions', None)
+    if actions:
+        return f'{cls.__name__}.{actions.get(request.method.lower(), request.method.lower())}'
+    return cls.__name__
+
+
+def observe_request(request, response, duration, queries=None):
+    if _worker_pid != os.getpid():
+        register_worker()
+    view = view_label(request)
+    # Clients can send any method name; keep the label set bounded
+    method = request.method if request.method in METHODS else 'other'
+    REQUEST_LATENCY.labels(view, method).observe(duration)
+    REQUESTS.labels(view, method, response.status_code).inc()
+    if queries is not None:
+        REQUEST_QUERIES.labels(view).observe(queries)
+    if resource is not None:
+        WORKER_MAX_RSS.set(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT)
+
+
+def cache_lookup(name, hit):
+    CACHE_LOOKUPS.labels(name).inc()
+    if hit:
+        CACHE_HITS.labels(name).inc()
+
+
+def exposition():
+    """(body, content type) of the current metrics, across workers when multiprocess."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
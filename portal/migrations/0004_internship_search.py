@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:03
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+FTS_TABLE = 'portal_internship_fts'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX portal_internship_search_gin '
+            'ON portal_internship USING gin (search_vector)'
+        )
+        schema_editor.execute(
+            "UPDATE portal_internship SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(skills_required, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(location, '')), 'C') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            f'title, description, skills_required, location, '
+            f"tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, skills_required, location) '
+            f'SELECT id, title, description, skills_required, location FROM portal_internship'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS portal_internship_search_gin')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0003_profile_college_profile_degree_profile_github_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
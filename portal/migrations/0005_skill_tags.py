@@ -0,0 +1,67 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0004_internship_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Canonical (lower-case) skill name', max_length=100, unique=True)),
+                ('display_name', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfileSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='portal.profile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_links', to='portal.skill')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InternshipSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('internship', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='portal.internship')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='internship_links', to='portal.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='internships', through='portal.InternshipSkill', to='portal.skill'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='profiles', through='portal.ProfileSkill', to='portal.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='profileskill',
+            index=models.Index(fields=['skill', 'profile'], name='portal_prof_skill_i_df60d1_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='profileskill',
+            unique_together={('profile', 'skill')},
+        ),
+        migrations.AddIndex(
+            model_name='internshipskill',
+            index=models.Index(fields=['skill', 'internship'], name='portal_inte_skill_i_105c81_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='internshipskill',
+            unique_together={('internship', 'skill')},
+        ),
+    ]
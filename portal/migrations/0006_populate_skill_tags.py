@@ -0,0 +1,70 @@
+import re
+
+from django.db import migrations
+
+
+def parse_skills(text):
+    # Frozen copy of portal.utils.parse_skills
+    skills = {}
+    for raw in (text or '').split(','):
+        display = re.sub(r'\s+', ' ', raw).strip()[:100]
+        name = display.lower()[:100]
+        if name and name not in skills:
+            skills[name] = display
+    return skills
+
+
+def populate_skill_tags(apps, schema_editor):
+    Skill = apps.get_model('portal', 'Skill')
+    Profile = apps.get_model('portal', 'Profile')
+    Internship = apps.get_model('portal', 'Internship')
+    ProfileSkill = apps.get_model('portal', 'ProfileSkill')
+    InternshipSkill = apps.get_model('portal', 'InternshipSkill')
+
+    profiles = {
+        pk: parse_skills(text)
+        for pk, text in Profile.objects.exclude(skills__isnull=True).values_list('pk', 'skills')
+    }
+    internships = {
+        pk: parse_skills(text)
+        for pk, text in Internship.objects.values_list('pk', 'skills_required')
+    }
+
+    names = {}
+    for parsed in list(profiles.values()) + list(internships.values()):
+        for name, display in parsed.items():
+            names.setdefault(name, display)
+    Skill.objects.bulk_create(
+        [Skill(name=name, display_name=display) for name, display in names.items()],
+        ignore_conflicts=True,
+        batch_size=1000
+    )
+    skill_ids = dict(Skill.objects.values_list('name', 'pk'))
+
+    ProfileSkill.objects.bulk_create(
+        [
+            ProfileSkill(profile_id=pk, skill_id=skill_ids[name])
+            for pk, parsed in profiles.items() for name in parsed
+        ],
+        ignore_conflicts=True,
+        batch_size=1000
+    )
+    InternshipSkill.objects.bulk_create(
+        [
+            InternshipSkill(internship_id=pk, skill_id=skill_ids[name])
+            for pk, parsed in internships.items() for name in parsed
+        ],
+        ignore_conflicts=True,
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0005_skill_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_skill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0006_populate_skill_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applied_at', 'id'], name='application_applied_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['created_at', 'id'], name='internship_created_id_idx'),
+        ),
+    ]
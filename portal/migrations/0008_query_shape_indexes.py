@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0007_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['student', '-applied_at'], name='application_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['internship', '-applied_at'], name='application_internship_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', '-applied_at'], name='application_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='internship_active_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['remote', '-created_at'], name='internship_active_remote_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['poster', 'is_active', '-created_at'], name='internship_poster_active_idx'),
+        ),
+    ]
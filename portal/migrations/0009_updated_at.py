@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Best available approximation for rows that predate the column
+    apps.get_model('portal', 'Internship').objects.update(updated_at=models.F('created_at'))
+    apps.get_model('portal', 'Application').objects.update(updated_at=models.F('applied_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0008_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='cv_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Text extracted from the CV'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='logo_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='logos/thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='logo_webp',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='logos/webp/'),
+        ),
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('cv', 'CV'), ('logo', 'Logo'), ('application_cv', 'Application CV')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed'), ('superseded', 'Superseded')], default='pending', max_length=20)),
+                ('quarantine_name', models.CharField(max_length=255)),
+                ('original_name', models.CharField(max_length=255)),
+                ('error', models.TextField(blank=True, default='')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upload_jobs', to='portal.application')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_jobs', to='portal.profile')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='uploadjob_status_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:37
+
+import portal.storage
+import portal.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0010_upload_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='cv_copy',
+            field=models.FileField(blank=True, null=True, storage=portal.storage.cv_storage, upload_to='application_cvs/', validators=[portal.utils.validate_cv_file]),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='cv',
+            field=models.FileField(blank=True, null=True, storage=portal.storage.cv_storage, upload_to='cvs/', validators=[portal.utils.validate_cv_file]),
+        ),
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ref_count'], name='blob_ref_count_idx')],
+            },
+        ),
+    ]
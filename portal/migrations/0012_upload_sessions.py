@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:42
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0011_content_addressed_cvs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('cv', 'CV'), ('logo', 'Logo'), ('application_cv', 'Application CV')], max_length=20)),
+                ('original_name', models.CharField(max_length=255)),
+                ('partial_name', models.CharField(max_length=255)),
+                ('length', models.PositiveBigIntegerField()),
+                ('offset', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='portal.application')),
+                ('job', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='session', to='portal.uploadjob')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='portal.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='uploadsession_updated_idx')],
+            },
+        ),
+    ]
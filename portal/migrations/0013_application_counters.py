@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:46
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    Internship = apps.get_model('portal', 'Internship')
+    Application = apps.get_model('portal', 'Application')
+
+    counts = defaultdict(dict)
+    rows = Application.objects.values_list('internship_id', 'status').annotate(n=models.Count('pk')).order_by()
+    for internship_id, status, n in rows:
+        counts[internship_id][f'{status}_count'] = n
+    for internship_id, fields in counts.items():
+        Internship.objects.filter(pk=internship_id).update(applications_count=sum(fields.values()), **fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0012_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='accepted_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='applications_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='pending_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='rejected_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='reviewing_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='shortlisted_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 04:57
+
+import django.db.models.deletion
+import portal.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0013_application_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InternshipSearchEntry',
+            fields=[
+                ('internship', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='portal.internship')),
+                ('document', portal.models.FTS5DocumentField(db_column='portal_internship_fts')),
+            ],
+            options={
+                'db_table': 'portal_internship_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.9 on 2026-10-18 05:20
+
+import django.db.models.deletion
+import portal.models
+from django.db import migrations, models
+
+
+CV_FTS_TABLE = 'portal_profile_cv_fts'
+
+
+def create_cv_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        # The expression portal.search.cv_search_vector() compiles to
+        schema_editor.execute(
+            'CREATE INDEX portal_profile_cv_search_gin ON portal_profile '
+            "USING gin (to_tsvector('english'::regconfig, COALESCE(cv_text, '')))"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {CV_FTS_TABLE} USING fts5(cv_text, tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {CV_FTS_TABLE} (rowid, cv_text) SELECT id, cv_text FROM portal_profile WHERE cv_text != ''"
+        )
+
+
+def drop_cv_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS portal_profile_cv_search_gin')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {CV_FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0014_internship_search_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileCVSearchEntry',
+            fields=[
+                ('profile', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='cv_search_entry', serialize=False, to='portal.profile')),
+                ('document', portal.models.FTS5DocumentField(db_column='portal_profile_cv_fts')),
+            ],
+            options={
+                'db_table': 'portal_profile_cv_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_cv_index, drop_cv_index),
+    ]
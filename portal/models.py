@@ -1,8 +1,23 @@
+import uuid
+
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User
+from .storage import cv_storage
 from .utils import validate_cv_file, validate_image_file
 
 
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True, help_text="Canonical (lower-case) skill name")
+    display_name = models.CharField(max_length=100)
+    
+    def __str__(self):
+        return self.display_name
+    
+    class Meta:
+        ordering = ['name']
+
+
 class Profile(models.Model):
     ROLE_CHOICES = [
         ('student', 'Student'),
@@ -13,7 +28,7 @@ class Profile(models.Model):
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
     bio = models.TextField(blank=True, null=True)
     skills = models.TextField(blank=True, null=True, help_text="Comma-separated skills")
-    cv = models.FileField(upload_to='cvs/', blank=True, null=True, validators=[validate_cv_file])
+    cv = models.FileField(upload_to='cvs/', storage=cv_storage, blank=True, null=True, validators=[validate_cv_file])
     company_name = models.CharField(max_length=255, blank=True, null=True)
     logo = models.ImageField(upload_to='logos/', blank=True, null=True, validators=[validate_image_file])
     
@@ -25,6 +40,16 @@ class Profile(models.Model):
     github = models.URLField(blank=True, null=True)
     linkedin = models.URLField(blank=True, null=True)
     portfolio = models.URLField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    # Derived from uploads by portal.uploads (process_uploads command);
+    # searchable through portal.search.search_applicants
+    cv_text = models.TextField(blank=True, default='', editable=False, help_text="Text extracted from the CV")
+    logo_webp = models.ImageField(upload_to='logos/webp/', blank=True, null=True, editable=False)
+    logo_thumbnail = models.ImageField(upload_to='logos/thumbnails/', blank=True, null=True, editable=False)
+    
+    # Normalized copy of `skills`, maintained by portal.skills
+    skill_tags = models.ManyToManyField(Skill, through='ProfileSkill', related_name='profiles', blank=True)
     
     def __str__(self):
         return f"{self.user.username} - {self.get_role_display()}"
@@ -50,12 +75,132 @@ class Internship(models.Model):
     last_date = models.DateField(help_text="Last date to apply")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also touched when the application counters below change
+    updated_at = models.DateTimeField(auto_now=True)
+    # Application counters, total and per status, maintained by portal.counters
+    applications_count = models.IntegerField(default=0, editable=False)
+    pending_count = models.IntegerField(default=0, editable=False)
+    reviewing_count = models.IntegerField(default=0, editable=False)
+    shortlisted_count = models.IntegerField(default=0, editable=False)
+    rejected_count = models.IntegerField(default=0, editable=False)
+    accepted_count = models.IntegerField(default=0, editable=False)
+    # Maintained by portal.search; only populated on PostgreSQL (GIN indexed
+    # in migration 0004). SQLite uses the portal_internship_fts table instead.
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    # Normalized copy of `skills_required`, maintained by portal.skills
+    skill_tags = models.ManyToManyField(Skill, through='InternshipSkill', related_name='internships', blank=True)
+    
+    COUNTER_FIELDS = (
+        'applications_count', 'pending_count', 'reviewing_count', 'shortlisted_count', 'rejected_count',
+        'accepted_count',
+    )
     
     def __str__(self):
         return f"{self.title} - {self.poster.company_name or self.poster.user.username}"
     
+    def save(self, *args, **kwargs):
+        # Only portal.counters writes the counters of an existing internship
+        # (with F() updates): writing back the values this instance read
+        # would undo applications counted since
+        if not self._state.adding and not kwargs.get('force_insert'):
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.attname for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred
+                ]
+            kwargs['update_fields'] = [name for name in update_fields if name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination order (see portal.pagination)
+            models.Index(fields=['created_at', 'id'], name='internship_created_id_idx'),
+            # Public listing: WHERE is_active ORDER BY -created_at
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_active=True),
+                name='internship_active_recent_idx'
+            ),
+            # Remote-only listing: WHERE is_active AND remote ORDER BY -created_at
+            models.Index(
+                fields=['remote', '-created_at'], condition=models.Q(is_active=True),
+                name='internship_active_remote_idx'
+            ),
+            # Company views: WHERE poster = ? [AND is_active] ORDER BY -created_at
+            models.Index(fields=['poster', 'is_active', '-created_at'], name='internship_poster_active_idx'),
+        ]
+
+
+class FTS5DocumentField(models.TextField):
+    """
+    The hidden column an FTS5 table has under its own name: `__match`
+    filters on a full-text query, and ranking functions such as bm25()
+    take it as their first argument.
+    """
+
+
+@FTS5DocumentField.register_lookup
+class FTS5Match(models.Lookup):
+    lookup_name = 'match'
+    
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class InternshipSearchEntry(models.Model):
+    """
+    A row of the SQLite full-text index of internships (see portal.search),
+    so searches can join it. Created by migration 0004 and written by
+    portal.search; not managed by Django, and absent on other databases.
+    """
+    internship = models.OneToOneField(
+        Internship, primary_key=True, db_column='rowid', db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name='search_entry'
+    )
+    document = FTS5DocumentField(db_column='portal_internship_fts')
+    
+    class Meta:
+        managed = False
+        db_table = 'portal_internship_fts'
+
+
+class ProfileCVSearchEntry(models.Model):
+    """
+    A row of the SQLite full-text index of CV text (see portal.search),
+    like InternshipSearchEntry. Created by migration 0015.
+    """
+    profile = models.OneToOneField(
+        Profile, primary_key=True, db_column='rowid', db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name='cv_search_entry'
+    )
+    document = FTS5DocumentField(db_column='portal_profile_cv_fts')
+    
+    class Meta:
+        managed = False
+        db_table = 'portal_profile_cv_fts'
+
+
+class ProfileSkill(models.Model):
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='profile_links')
+    
+    class Meta:
+        unique_together = ['profile', 'skill']
+        indexes = [models.Index(fields=['skill', 'profile'])]
+
+
+class InternshipSkill(models.Model):
+    internship = models.ForeignKey(Internship, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='internship_links')
+    
+    class Meta:
+        unique_together = ['internship', 'skill']
+        indexes = [models.Index(fields=['skill', 'internship'])]
 
 
 class Application(models.Model):
@@ -75,9 +220,13 @@ class Application(models.Model):
         limit_choices_to={'role': 'student'}
     )
     cover_letter = models.TextField()
-    cv_copy = models.FileField(upload_to='application_cvs/', blank=True, null=True, validators=[validate_cv_file])
+    # Usually the same blob as the student's Profile.cv (see portal.blobs)
+    cv_copy = models.FileField(
+        upload_to='application_cvs/', storage=cv_storage, blank=True, null=True, validators=[validate_cv_file]
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     applied_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.student.user.username} - {self.internship.title} ({self.status})"
@@ -85,3 +234,109 @@ class Application(models.Model):
     class Meta:
         ordering = ['-applied_at']
         unique_together = ['internship', 'student']
+        indexes = [
+            # Keyset pagination order (see portal.pagination)
+            models.Index(fields=['applied_at', 'id'], name='application_applied_id_idx'),
+            # Student views: WHERE student = ? ORDER BY -applied_at
+            models.Index(fields=['student', '-applied_at'], name='application_student_idx'),
+            # Company views: WHERE internship = ? / internship__poster = ? ORDER BY -applied_at
+            models.Index(fields=['internship', '-applied_at'], name='application_internship_idx'),
+            # Status filters: WHERE status = ? ORDER BY -applied_at
+            models.Index(fields=['status', '-applied_at'], name='application_status_idx'),
+        ]
+
+
+class Blob(models.Model):
+    """
+    A file in the content-addressed CV storage (portal.storage) and the
+    number of Profile.cv / Application.cv_copy values naming it.
+    Maintained by portal.blobs; unreferenced blobs are removed by gc_blobs.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+    
+    class Meta:
+        indexes = [
+            # gc_blobs: WHERE ref_count <= 0
+            models.Index(fields=['ref_count'], name='blob_ref_count_idx'),
+        ]
+
+
+class UploadJob(models.Model):
+    """
+    An uploaded file waiting in quarantine for the process_uploads worker
+    (see portal.uploads), which validates it and moves it into place.
+    """
+    KIND_CHOICES = [
+        ('cv', 'CV'),
+        ('logo', 'Logo'),
+        ('application_cv', 'Application CV'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('superseded', 'Superseded'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='upload_jobs')
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name='upload_jobs', blank=True, null=True
+    )
+    quarantine_name = models.CharField(max_length=255)
+    original_name = models.CharField(max_length=255)
+    error = models.TextField(blank=True, default='')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} upload {self.pk} ({self.status})"
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # Worker: WHERE status = 'pending' ORDER BY created_at
+            models.Index(fields=['status', 'created_at'], name='uploadjob_status_created_idx'),
+        ]
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload in progress: the client sends the file in chunks
+    (see portal.uploads) and, once ``offset`` reaches ``length``, it is
+    handed to the process_uploads worker as ``job``.
+    """
+    # Random, so a session URL cannot be guessed
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=20, choices=UploadJob.KIND_CHOICES)
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='upload_sessions')
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name='upload_sessions', blank=True, null=True
+    )
+    original_name = models.CharField(max_length=255)
+    # The file being assembled, in settings.UPLOAD_SESSION_DIR
+    partial_name = models.CharField(max_length=255)
+    length = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    job = models.OneToOneField(UploadJob, on_delete=models.SET_NULL, related_name='session', blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} upload session {self.pk} ({self.offset}/{self.length})"
+    
+    class Meta:
+        indexes = [
+            # process_uploads: expire WHERE updated_at < ... (unfinished sessions)
+            models.Index(fields=['updated_at'], name='uploadsession_updated_idx'),
+        ]
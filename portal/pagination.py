@@ -0,0 +1,258 @@
+"""
+Pagination classes for the portal API.
+
+Page-number pagination stays the default. Clients can opt into keyset
+(cursor) pagination with `?pagination=cursor`, then follow the `next` /
+`previous` links, which carry a `cursor` parameter. Keyset pages are
+fetched with an index range scan on the view's `keyset_ordering` instead
+of COUNT(*) + OFFSET, so deep pages cost the same as the first one.
+Requests for another order (`?ordering=`, or relevance for a text
+search) are refused with a 400 rather than paged in the keyset order.
+
+`apaginate_queryset()` is the same pagination for the async views in
+portal.async_views, with the queries run through the async ORM.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Cheap row count for ``queryset``.
+    On PostgreSQL this is the planner's estimate (which comes from
+    pg_class.reltuples and column statistics); elsewhere it is exact.
+    """
+    if connection.vendor == 'postgresql':
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    return queryset.count()
+
+
+class StandardResultsPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() (and Paginator.page()) with async queries."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        rows = [row async for row in queryset[bottom:top]]
+        self.page = Page(rows, number, paginator)
+        return rows
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a unique ordering such as ('-created_at', '-id').
+
+    The cursor is the ordering values of the row at the page edge; the
+    next page is `WHERE (created_at, id) < (cursor)` with a LIMIT. A total
+    is only computed when asked for with `count=exact` or `count=estimate`.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+    unsupported_ordering_message = (
+        'Cursor pagination only follows the default order; use page numbers '
+        'to order by another field or by search relevance.'
+    )
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, view):
+        ordering = getattr(view, 'keyset_ordering', None)
+        assert ordering, (
+            f'{view.__class__.__name__} must define `keyset_ordering` to use keyset pagination.'
+        )
+        return ordering
+
+    def check_ordering(self, queryset, request, view):
+        """
+        Refuse requests the view's OrderingFilter would order other than
+        by a prefix of the keyset ordering.
+        """
+        for backend in getattr(view, 'filter_backends', ()):
+            if issubclass(backend, OrderingFilter):
+                requested = list(backend().get_ordering(request, queryset, view) or ())
+                if requested != list(self.ordering[:len(requested)]):
+                    raise ValidationError({backend.ordering_param: [self.unsupported_ordering_message]})
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            values = []
+            for field, value in zip(self.fields, payload['v'], strict=True):
+                value = field.to_python(value)
+                # Includes the database's integer range, so the query can't overflow
+                field.run_validators(value)
+                values.append(value)
+            return values, bool(payload['r'])
+        except (TypeError, ValueError, KeyError, OverflowError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def keyset_filter(self, values, reverse):
+        """
+        Rows strictly after ``values`` in the ordering (before, if reverse).
+        The leading `<=`/`>=` term bounds the index range scan.
+        """
+        condition = Q()
+        for index in reversed(range(len(self.ordering))):
+            name = self.ordering[index].lstrip('-')
+            descending = self.ordering[index].startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            if index < len(self.ordering) - 1:
+                step |= Q(**{name: values[index]}) & condition
+            condition = step
+        first = self.ordering[0].lstrip('-')
+        descending = self.ordering[0].startswith('-') != reverse
+        bound = Q(**{f'{first}__{"lte" if descending else "gte"}': values[0]})
+        return bound & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, unpaged = self.prepare(queryset, request, view)
+        rows = self.finish(list(queryset[:self.page_size + 1]))
+
+        count_mode = request.query_params.get('count')
+        self.count = None
+        if count_mode == 'exact':
+            self.count = unpaged.count()
+        elif count_mode == 'estimate':
+            self.count = estimate_count(unpaged)
+        return rows
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset, unpaged = self.prepare(queryset, request, view)
+        rows = self.finish([row async for row in queryset[:self.page_size + 1]])
+
+        count_mode = request.query_params.get('count')
+        self.count = None
+        if count_mode == 'exact':
+            self.count = await unpaged.acount()
+        elif count_mode == 'estimate':
+            self.count = await sync_to_async(estimate_count)(unpaged)
+        return rows
+
+    def prepare(self, queryset, request, view):
+        """(page queryset, queryset for the optional count) for this request."""
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        self.ordering = self.get_ordering(view)
+        self.check_ordering(queryset, request, view)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering
+        ]
+        self.page_size = self.get_page_size(request)
+        self.cursor_values, self.reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+        queryset = queryset.order_by(*ordering)
+        # The optional count covers the whole result set, not just what follows the cursor
+        unpaged = queryset
+        if self.cursor_values is not None:
+            queryset = queryset.filter(self.keyset_filter(self.cursor_values, self.reverse))
+        return queryset, unpaged
+
+    def finish(self, rows):
+        """The page from up to page_size + 1 fetched ``rows``; sets the links."""
+        values, reverse = self.cursor_values, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Moving backwards, there is always a page after this one; moving
+        # forwards from a cursor, there is always one before it.
+        has_next = has_more if not reverse else values is not None
+        has_previous = has_more if reverse else values is not None
+        self.next_link = self.encode_cursor(self.row_values(rows[-1]), False) if rows and has_next else None
+        self.previous_link = self.encode_cursor(self.row_values(rows[0]), True) if rows and has_previous else None
+        return rows
+
+    def row_values(self, row):
+        values = []
+        for field in self.fields:
+            # Rows are model instances, or dicts from .values()
+            value = row[field.attname] if isinstance(row, dict) else field.value_from_object(row)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return values
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.next_link
+        response['previous'] = self.previous_link
+        response['results'] = data
+        return Response(response)
+
+
+class HybridPagination(StandardResultsPagination):
+    """
+    Page-number pagination by default; keyset pagination when the request
+    carries `pagination=cursor` or a `cursor`.
+    """
+    def use_keyset(self, request):
+        params = request.query_params
+        return params.get('pagination') == 'cursor' or 'cursor' in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = KeysetPagination() if self.use_keyset(request) else None
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.keyset = KeysetPagination() if self.use_keyset(request) else None
+        if self.keyset is not None:
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,157 @@
+"""
+Skill-match recommendations for students.
+
+Internships and students are treated as sparse binary skill vectors (the
+InternshipSkill/ProfileSkill rows) and scored with Jaccard similarity:
+
+    score = |S ∩ I| / (|S| + |I| - |S ∩ I|)
+
+With numpy available every active internship is scored at once against an
+in-process skill matrix (postings per skill plus vector sizes), which is
+rebuilt lazily whenever the internship generation changes. Without numpy
+the same scores come from one grouped query over the skill index.
+
+Results are cached per student. Cache keys embed a per-student version and
+a global internship generation, so invalidation is a counter bump rather
+than a key scan. Use a shared cache backend so the bumps reach every worker.
+"""
+import threading
+
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+from .caching import bump_counter, get_counter
+from .models import InternshipSkill, ProfileSkill
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+CACHE_TIMEOUT = 60 * 15
+INTERNSHIPS_GENERATION_KEY = 'recommendations:internships:generation'
+
+
+def _profile_version_key(profile_id):
+    return f'recommendations:profile:{profile_id}:version'
+
+
+def invalidate_profile(profile_id):
+    """Drop cached recommendations for one student."""
+    bump_counter(_profile_version_key(profile_id))
+
+
+def invalidate_internships():
+    """Drop cached recommendations for every student."""
+    bump_counter(INTERNSHIPS_GENERATION_KEY)
+
+
+class SkillMatrix:
+    """
+    Column-compressed internship x skill matrix of the active internships.
+    """
+    def __init__(self, pairs):
+        pairs = np.fromiter(pairs, dtype=np.dtype((np.int64, 2)))
+        if not len(pairs):
+            pairs = np.empty((0, 2), dtype=np.int64)
+        self.internship_ids, rows = np.unique(pairs[:, 0], return_inverse=True)
+        self.sizes = np.bincount(rows, minlength=len(self.internship_ids))
+
+        order = np.argsort(pairs[:, 1], kind='stable')
+        self.postings = rows[order]
+        skills, starts, counts = np.unique(pairs[order, 1], return_index=True, return_counts=True)
+        self.offsets = {
+            int(skill): (int(start), int(start + count))
+            for skill, start, count in zip(skills, starts, counts)
+        }
+
+    @classmethod
+    def load(cls):
+        pairs = InternshipSkill.objects.filter(
+            internship__is_active=True
+        ).order_by().values_list('internship_id', 'skill_id').iterator(chunk_size=10000)
+        return cls(pairs)
+
+    def score(self, skill_ids, limit):
+        postings = [
+            self.postings[start:end]
+            for start, end in (self.offsets[skill] for skill in skill_ids if skill in self.offsets)
+        ]
+        if not postings:
+            return []
+
+        matched = np.bincount(np.concatenate(postings), minlength=len(self.internship_ids))
+        rows = np.flatnonzero(matched)
+        scores = matched[rows] / (self.sizes[rows] + len(skill_ids) - matched[rows])
+        if len(rows) > limit:
+            keep = np.argpartition(-scores, limit - 1)[:limit]
+            rows, scores = rows[keep], scores[keep]
+        ids = self.internship_ids[rows]
+        ranked = np.lexsort((-ids, -scores))
+        return [(int(ids[i]), round(float(scores[i]), 4)) for i in ranked]
+
+
+_matrix = None
+_matrix_generation = None
+_matrix_lock = threading.Lock()
+
+
+def get_skill_matrix():
+    """The process-wide SkillMatrix for the current internship generation."""
+    global _matrix, _matrix_generation
+    generation = get_counter(INTERNSHIPS_GENERATION_KEY)
+    if _matrix_generation != generation:
+        with _matrix_lock:
+            if _matrix_generation != generation:
+                _matrix = SkillMatrix.load()
+                _matrix_generation = generation
+    return _matrix
+
+
+def score_internships_sql(skill_ids, limit):
+    """Database-side equivalent of SkillMatrix.score()."""
+    internship_sizes = InternshipSkill.objects.filter(
+        internship=OuterRef('internship')
+    ).order_by().values('internship').annotate(size=Count('pk')).values('size')
+
+    rows = InternshipSkill.objects.filter(
+        skill_id__in=skill_ids,
+        internship__is_active=True
+    ).order_by().values('internship').annotate(
+        matched=Count('pk'),
+        size=Subquery(internship_sizes)
+    ).annotate(
+        score=Cast('matched', FloatField()) / (F('size') + len(skill_ids) - F('matched'))
+    ).order_by('-score', '-internship').values_list('internship', 'score')[:limit]
+
+    return [(internship_id, round(score, 4)) for internship_id, score in rows]
+
+
+def score_internships(profile_id, limit):
+    """
+    Return up to ``limit`` (internship_id, score) pairs for active
+    internships sharing at least one skill with the student, best first.
+    """
+    skill_ids = list(
+        ProfileSkill.objects.filter(profile_id=profile_id).values_list('skill_id', flat=True)
+    )
+    if not skill_ids:
+        return []
+    if np is not None:
+        return get_skill_matrix().score(skill_ids, limit)
+    return score_internships_sql(skill_ids, limit)
+
+
+def recommend(profile_id, limit=10):
+    """Cached wrapper around score_internships()."""
+    key = 'recommendations:{}:{}:v{}:g{}'.format(
+        profile_id,
+        limit,
+        get_counter(_profile_version_key(profile_id)),
+        get_counter(INTERNSHIPS_GENERATION_KEY)
+    )
+    scores = cache.get(key)
+    if scores is None:
+        scores = score_internships(profile_id, limit)
+        cache.set(key, scores, CACHE_TIMEOUT)
+    return scores
@@ -0,0 +1,68 @@
+"""
+orjson-backed JSON renderer and parser.
+
+Both are drop-in replacements for DRF's JSONRenderer / JSONParser and
+produce the same bytes: anything orjson does not handle the same way as
+DRF's encoder (dates, decimals, lazy strings, ...) is routed through
+rest_framework.utils.encoders.JSONEncoder.default.
+"""
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+from .instrumentation import timer
+
+ORJSON_OPTIONS = (
+    # DRF emits datetimes as e.g. 2026-01-01T00:00:00Z, orjson as +00:00
+    orjson.OPT_PASSTHROUGH_DATETIME |
+    orjson.OPT_NON_STR_KEYS
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer using orjson for compact output. Pretty-printed (indent=N)
+    and ASCII-only output, and values orjson refuses (e.g. integers over 64
+    bits), fall back to the stock renderer.
+    """
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timer('render'):
+            return self.render_json(data, accepted_media_type, renderer_context)
+
+    def render_json(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same U+2028/U+2029 escaping as JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser using orjson. NaN and Infinity are always rejected."""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            body = stream.read()
+            if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,198 @@
+"""
+Full-text search for internships, and for applicants by their CV text.
+
+PostgreSQL keeps a stored tsvector in ``Internship.search_vector`` backed by a
+GIN index; SQLite keeps an FTS5 virtual table keyed on the internship id, which
+queries join through the unmanaged InternshipSearchEntry model. Both are
+created by migration 0004 and kept in sync from the Internship
+post_save/post_delete signals. Other backends fall back to the LIKE scans.
+
+CV text (Profile.cv_text) only changes when process_uploads extracts it,
+which calls index_cv(). On PostgreSQL a GIN index on cv_search_vector()
+covers the column itself; SQLite has a second FTS5 table, joined through
+ProfileCVSearchEntry. Both are created by migration 0015.
+"""
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, Value
+from rest_framework import filters
+
+FTS_TABLE = 'portal_internship_fts'
+CV_FTS_TABLE = 'portal_profile_cv_fts'
+SEARCH_CONFIG = 'english'
+
+# Column weights used by bm25() on SQLite, in FTS_TABLE column order
+FTS_WEIGHTS = (10.0, 1.0, 5.0, 2.0)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def internship_search_vector():
+    """Weighted tsvector expression for an internship row (PostgreSQL)."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('skills_required', weight='B', config=SEARCH_CONFIG) +
+        SearchVector('location', weight='C', config=SEARCH_CONFIG) +
+        SearchVector('description', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def cv_search_vector(field='cv_text'):
+    """
+    tsvector of CV text (PostgreSQL). Migration 0015 indexes this exact
+    expression on portal_profile, so keep the two in step.
+    """
+    return SearchVector(field, config=SEARCH_CONFIG)
+
+
+def like_search(queryset, q):
+    """The original substring search, kept for unsupported backends."""
+    return queryset.filter(
+        Q(title__icontains=q) |
+        Q(description__icontains=q) |
+        Q(skills_required__icontains=q)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def fts5_match_expression(q):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    Every word becomes a quoted prefix term, so user input can never
+    inject FTS5 operators and "dev" still matches "developer".
+    """
+    tokens = TOKEN_RE.findall(q)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_internships(queryset, q):
+    """
+    Filter ``queryset`` to internships matching ``q`` and annotate each row
+    with ``search_rank`` (higher is better).
+    """
+    vendor = connection.vendor
+
+    if vendor == 'postgresql':
+        query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+
+    if vendor == 'sqlite':
+        match = fts5_match_expression(q)
+        if not match:
+            return like_search(queryset, q)
+        # Join the FTS table on rowid (InternshipSearchEntry) so MATCH and
+        # bm25() run once per query rather than once per candidate row.
+        bm25 = Func(
+            F('search_entry__document'), *(Value(weight) for weight in FTS_WEIGHTS),
+            function='bm25', output_field=FloatField()
+        )
+        return queryset.filter(search_entry__document__match=match).annotate(search_rank=-bm25)
+
+    return like_search(queryset, q)
+
+
+def search_applicants(queryset, q):
+    """Filter an Application ``queryset`` to students whose CV text matches ``q``."""
+    vendor = connection.vendor
+
+    if vendor == 'postgresql':
+        query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.annotate(cv_vector=cv_search_vector('student__cv_text')).filter(cv_vector=query)
+
+    if vendor == 'sqlite':
+        match = fts5_match_expression(q)
+        if match:
+            return queryset.filter(student__cv_search_entry__document__match=match)
+
+    return queryset.filter(student__cv_text__icontains=q)
+
+
+def index_internship(internship):
+    """Write (or rewrite) the search index entry for one internship."""
+    from .models import Internship
+
+    if connection.vendor == 'postgresql':
+        Internship.objects.filter(pk=internship.pk).update(
+            search_vector=internship_search_vector()
+        )
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [internship.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, skills_required, location) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                [
+                    internship.pk, internship.title, internship.description,
+                    internship.skills_required, internship.location
+                ]
+            )
+
+
+def unindex_internship(pk):
+    """Drop the search index entry for a deleted internship."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+    # PostgreSQL keeps the vector on the row itself, so nothing to do
+
+
+def rebuild_index():
+    """Rebuild the whole search index, e.g. after bulk_create()."""
+    from .models import Internship
+
+    if connection.vendor == 'postgresql':
+        Internship.objects.update(search_vector=internship_search_vector())
+    elif connection.vendor == 'sqlite':
+        table = Internship._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, skills_required, location) '
+                f'SELECT id, title, description, skills_required, location FROM {table}'
+            )
+
+
+def index_cv(profile):
+    """Write (or drop) the CV index entry for a profile whose cv_text changed."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {CV_FTS_TABLE} WHERE rowid = %s', [profile.pk])
+            if profile.cv_text:
+                cursor.execute(
+                    f'INSERT INTO {CV_FTS_TABLE} (rowid, cv_text) VALUES (%s, %s)', [profile.pk, profile.cv_text]
+                )
+    # PostgreSQL indexes the column itself
+
+
+def unindex_cv(pk):
+    """Drop the CV index entry for a deleted profile."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {CV_FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def rebuild_cv_index():
+    """Rebuild the SQLite CV index from Profile.cv_text."""
+    from .models import Profile
+
+    if connection.vendor == 'sqlite':
+        table = Profile._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {CV_FTS_TABLE}')
+            cursor.execute(
+                f"INSERT INTO {CV_FTS_TABLE} (rowid, cv_text) SELECT id, cv_text FROM {table} WHERE cv_text != ''"
+            )
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that keeps relevance order for text searches unless the
+    client explicitly asks for another ordering.
+    """
+    def get_default_ordering(self, view):
+        params = view.request.query_params
+        if params.get('q') or params.get('search'):
+            return ['-search_rank', '-created_at']
+        return super().get_default_ordering(view)
@@ -1,6 +1,39 @@
+from types import SimpleNamespace
+
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.models import User
-from .models import Profile, Internship, Application
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from . import counters
+from .authentication import IS_STAFF_CLAIM, PROFILE_ID_CLAIM, ROLE_CLAIM
+from .models import Profile, Internship, Application, UploadJob, UploadSession
+from .utils import validate_cv_file, validate_image_file
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for sparse fieldsets.
+    `fields` keeps only the named fields (plus `id`); `expand` swaps in (or
+    adds) the richer representations listed in `expandable_fields`.
+    """
+    expandable_fields = {}
+    
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.expand = expand or ()
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.expand:
+            if name in self.expandable_fields:
+                fields[name] = self.expandable_fields[name]()
+        if self.sparse_fields:
+            for name in list(fields):
+                if name != 'id' and name not in self.sparse_fields:
+                    fields.pop(name)
+        return fields
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -17,6 +50,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         model = Profile
         fields = [
             'id', 'user', 'role', 'bio', 'skills', 'cv', 'company_name', 'logo',
+            'logo_webp', 'logo_thumbnail',
             'phone', 'college', 'degree', 'graduation_year', 'github', 'linkedin', 'portfolio'
         ]
         read_only_fields = ['id', 'user', 'role']
@@ -24,22 +58,30 @@ class ProfileSerializer(serializers.ModelSerializer):
 
 class InternshipSerializer(serializers.ModelSerializer):
     poster = ProfileSerializer(read_only=True)
-    applications_count = serializers.SerializerMethodField()
     has_applied = serializers.SerializerMethodField()
+    status_counts = serializers.SerializerMethodField()
     
     class Meta:
         model = Internship
         fields = [
             'id', 'poster', 'title', 'description', 'skills_required', 
             'stipend', 'duration', 'location', 'remote', 'last_date', 
-            'is_active', 'created_at', 'applications_count', 'has_applied'
+            'is_active', 'created_at', 'applications_count', 'status_counts', 'has_applied'
         ]
-        read_only_fields = ['id', 'poster', 'created_at']
+        read_only_fields = ['id', 'poster', 'created_at', 'applications_count']
     
-    def get_applications_count(self, obj):
-        return obj.applications.count()
+    def get_status_counts(self, obj):
+        # Per-status counts are for the posting company only
+        request = self.context.get('request')
+        profile = getattr(request.user, 'profile', None) if request and request.user.is_authenticated else None
+        if profile is None or profile.pk != obj.poster_id:
+            return None
+        return counters.status_counts(obj)
     
     def get_has_applied(self, obj):
+        has_applied = getattr(obj, 'user_has_applied', None)
+        if has_applied is not None:
+            return has_applied
         request = self.context.get('request')
         if request and request.user.is_authenticated and hasattr(request.user, 'profile'):
             return Application.objects.filter(
@@ -49,6 +91,53 @@ class InternshipSerializer(serializers.ModelSerializer):
         return False
 
 
+class InternshipListSerializer(SparseFieldsetMixin, InternshipSerializer):
+    """
+    Compact internship representation for list views: the poster is
+    flattened to its company name and logo instead of a full profile.
+    """
+    company_name = serializers.SerializerMethodField()
+    company_logo = serializers.ImageField(source='poster.logo', read_only=True)
+    
+    expandable_fields = {
+        'poster': lambda: ProfileSerializer(read_only=True),
+        'description': lambda: serializers.CharField(read_only=True),
+    }
+    
+    class Meta:
+        model = Internship
+        fields = [
+            'id', 'title', 'company_name', 'company_logo', 'stipend', 'duration',
+            'location', 'remote', 'last_date', 'is_active', 'skills_required',
+            'created_at', 'applications_count', 'status_counts', 'has_applied'
+        ]
+        read_only_fields = fields
+    
+    def get_company_name(self, obj):
+        return obj.poster.company_name or obj.poster.user.username
+
+
+class InternshipSummarySerializer(InternshipListSerializer):
+    """The few internship fields an application list needs."""
+    class Meta:
+        model = Internship
+        fields = ['id', 'title', 'company_name', 'company_logo', 'stipend', 'location', 'is_active']
+        read_only_fields = fields
+
+
+class StudentSummarySerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+    full_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Profile
+        fields = ['id', 'username', 'full_name', 'college', 'skills']
+        read_only_fields = fields
+    
+    def get_full_name(self, obj):
+        return obj.user.get_full_name()
+
+
 class ApplicationSerializer(serializers.ModelSerializer):
     student = ProfileSerializer(read_only=True)
     internship = InternshipSerializer(read_only=True)
@@ -76,3 +165,117 @@ class ApplicationStatusSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ['status']
+    
+    def update(self, instance, validated_data):
+        # Atomic, so the previous status is read under a row lock and the
+        # internship's counters (portal.counters) move with the row
+        with transaction.atomic():
+            return super().update(instance, validated_data)
+
+
+class UploadJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadJob
+        fields = ['id', 'kind', 'status', 'error', 'original_name', 'application', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    A resumable upload: created with `kind`, `filename` and `length` (and
+    the student's own `application` for an application CV), then filled
+    in chunks; `upload` is its processing job once all bytes arrived.
+    """
+    filename = serializers.CharField(source='original_name', max_length=255)
+    application = serializers.PrimaryKeyRelatedField(
+        queryset=Application.objects.all(), required=False, allow_null=True
+    )
+    upload = UploadJobSerializer(source='job', read_only=True)
+    
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'kind', 'filename', 'length', 'offset', 'application', 'upload', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'offset', 'upload', 'created_at', 'updated_at']
+        extra_kwargs = {'length': {'min_value': 1}}
+    
+    def validate(self, attrs):
+        application = attrs.get('application')
+        if (attrs['kind'] == 'application_cv') != (application is not None):
+            raise serializers.ValidationError(
+                {'application': 'An application is required for application CVs, and only for them.'}
+            )
+        profile = getattr(self.context['request'].user, 'profile', None)
+        if application is not None and (profile is None or application.student_id != profile.pk):
+            raise serializers.ValidationError({'application': 'You can only upload CVs to your own applications.'})
+        
+        # The same checks as a direct upload, on the declared name and size
+        validator = validate_image_file if attrs['kind'] == 'logo' else validate_cv_file
+        try:
+            validator(SimpleNamespace(name=attrs['original_name'], size=attrs['length']))
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'filename': e.messages})
+        return attrs
+
+
+class ApplicationFilterSerializer(serializers.Serializer):
+    internship = serializers.IntegerField(min_value=1, required=False)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES, required=False)
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    """
+    Input for ApplicationViewSet.bulk_status: a target status and either
+    explicit application `ids` or a `filter` selecting them.
+    """
+    MAX_IDS = 1000
+    
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False,
+        allow_empty=False, max_length=MAX_IDS
+    )
+    filter = ApplicationFilterSerializer(required=False)
+    
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'ids' or 'filter'.")
+        if 'filter' in attrs and not attrs['filter']:
+            raise serializers.ValidationError({'filter': ["Select by 'internship' and/or 'status'."]})
+        return attrs
+
+
+class ApplicationListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact application representation for list views, with summaries of
+    the internship and student in place of the full nested objects.
+    """
+    internship = InternshipSummarySerializer(read_only=True)
+    student = StudentSummarySerializer(read_only=True)
+    
+    expandable_fields = {
+        'internship': lambda: InternshipSerializer(read_only=True),
+        'student': lambda: ProfileSerializer(read_only=True),
+        'cover_letter': lambda: serializers.CharField(read_only=True),
+        'cv_copy': lambda: serializers.FileField(read_only=True),
+    }
+    
+    class Meta:
+        model = Application
+        fields = ['id', 'internship', 'student', 'status', 'applied_at']
+        read_only_fields = fields
+
+
+class PortalTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Adds the role, profile id and staff claims that
+    portal.authentication.ClaimsJWTAuthentication reads. Access tokens
+    minted from the refresh token carry them too.
+    """
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        profile = getattr(user, 'profile', None)
+        token[ROLE_CLAIM] = profile.role if profile else None
+        token[PROFILE_ID_CLAIM] = profile.pk if profile else None
+        token[IS_STAFF_CLAIM] = user.is_staff
+        return token
@@ -1,7 +1,13 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.db import transaction
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Profile
+from .models import Profile, Internship, Application
+from .serializers import ProfileSerializer, UserSerializer
+from . import authentication, blobs, caching, counters
+from . import search
+from .skills import sync_profile_skills, sync_internship_skills
+from . import recommendations
 
 
 @receiver(post_save, sender=User)
@@ -21,3 +27,201 @@ def save_user_profile(sender, instance, **kwargs):
     """
     if hasattr(instance, 'profile'):
         instance.profile.save()
+
+
+@receiver(post_save, sender=Internship)
+def index_internship(sender, instance, raw=False, **kwargs):
+    """
+    Keep the full-text search index in sync with the internship row.
+    """
+    if not raw:
+        search.index_internship(instance)
+
+
+@receiver(post_delete, sender=Internship)
+def unindex_internship(sender, instance, **kwargs):
+    """
+    Remove a deleted internship from the full-text search index.
+    """
+    search.unindex_internship(instance.pk)
+
+
+@receiver(post_delete, sender=Profile)
+def unindex_cv(sender, instance, **kwargs):
+    """
+    Remove a deleted profile's CV text from the applicant search index.
+    """
+    search.unindex_cv(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def sync_profile_skill_tags(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Keep the normalized skill tags in sync with Profile.skills.
+    """
+    if raw or (update_fields is not None and 'skills' not in update_fields):
+        return
+    if sync_profile_skills(instance):
+        recommendations.invalidate_profile(instance.pk)
+
+
+@receiver(post_save, sender=Internship)
+def sync_internship_skill_tags(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Keep the normalized skill tags in sync with Internship.skills_required.
+    """
+    if raw or (update_fields is not None and 'skills_required' not in update_fields):
+        return
+    sync_internship_skills(instance)
+
+
+@receiver(post_save, sender=Internship)
+@receiver(post_delete, sender=Internship)
+def invalidate_recommendations(sender, instance, **kwargs):
+    """
+    New, edited or removed internships change every student's ranking.
+    """
+    recommendations.invalidate_internships()
+
+
+@receiver(post_save, sender=Internship)
+@receiver(post_delete, sender=Internship)
+def invalidate_internship_responses(sender, instance, **kwargs):
+    """
+    Drop cached internship list responses and this internship's detail.
+    """
+    caching.invalidate_internship_responses(instance.pk)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    counters.application_removed(instance)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application_counts(sender, instance, created=True, **kwargs):
+    """
+    Adding or removing an application changes the internship's
+    applications_count (``created`` is only passed on save). Status
+    changes don't show in the cached responses.
+    """
+    if created:
+        caching.invalidate_internship_responses(instance.internship_id)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_company_responses(sender, instance, created, raw=False, **kwargs):
+    """
+    Company profiles are embedded in internship responses: drop those
+    when one of the columns they show changes.
+    """
+    if raw or created or instance.role != 'company' or not changed_fields(instance):
+        return
+    caching.invalidate_internship_responses(*instance.internships.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User)
+def invalidate_company_user_responses(sender, instance, created, raw=False, **kwargs):
+    """
+    As above, for the poster's user (name and email). Logins only write
+    last_login, which isn't shown.
+    """
+    if raw or created or not changed_fields(instance):
+        return
+    profile = getattr(instance, 'profile', None)
+    if profile is not None and profile.role == 'company':
+        caching.invalidate_internship_responses(*profile.internships.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Profile)
+def forget_cached_account(sender, instance, **kwargs):
+    """
+    Drop this process's cached copy of the account (see
+    portal.authentication.load_account_values).
+    """
+    authentication.forget_account(instance.pk if sender is User else instance.user_id)
+
+
+# Columns whose saved value the post_save receivers compare against: for
+# profiles and users, those shown as an internship's poster (this includes
+# Profile.cv, which count_blob_references needs)
+TRACKED_FIELDS = {
+    Profile: tuple(name for name in ProfileSerializer.Meta.fields if name not in ('id', 'user', 'role')),
+    User: tuple(name for name in UserSerializer.Meta.fields if name != 'id'),
+    Application: ('cv_copy', 'status'),
+}
+
+
+@receiver(pre_save, sender=Profile)
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Application)
+def remember_previous_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Fetch the saved values of TRACKED_FIELDS being written, in one query
+    (locking the row inside a transaction), into ``instance._previous``;
+    all None for a new row, and None itself when none are written.
+    """
+    instance._previous = None
+    fields = [field for field in TRACKED_FIELDS[sender] if update_fields is None or field in update_fields]
+    if raw or not fields:
+        return
+    row = None
+    if instance.pk is not None:
+        queryset = sender.objects.filter(pk=instance.pk)
+        if transaction.get_connection().in_atomic_block:
+            queryset = queryset.select_for_update()
+        row = queryset.values(*fields).first()
+    instance._previous = row or dict.fromkeys(fields)
+
+
+def changed_fields(instance):
+    """The TRACKED_FIELDS this save wrote a different value to."""
+    changed = set()
+    for name, old in (getattr(instance, '_previous', None) or {}).items():
+        field = instance._meta.get_field(name)
+        new = field.get_prep_value(field.value_from_object(instance))
+        # Empty file fields are stored as '' or NULL alike
+        if (old if old != '' else None) != (new if new != '' else None):
+            changed.add(name)
+    return changed
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Application)
+def count_blob_references(sender, instance, **kwargs):
+    """
+    Move the reference from the content-addressed CV the row stopped
+    pointing at to the one it points at now (see portal.blobs).
+    """
+    field = dict(blobs.BLOB_FIELDS)[sender]
+    previous = getattr(instance, '_previous', None) or {}
+    if field not in previous:
+        return
+    old, new = previous[field] or None, getattr(instance, field).name or None
+    if old != new:
+        blobs.incref(new)
+        blobs.decref(old)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the internship's application counters in step (see
+    portal.counters; this also bumps its updated_at, so ETags change).
+    """
+    if raw:
+        return
+    if created:
+        counters.application_added(instance)
+        return
+    previous = getattr(instance, '_previous', None) or {}
+    if 'status' in previous:
+        counters.status_changed(instance.internship_id, previous['status'], instance.status)
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=Application)
+def release_blob(sender, instance, **kwargs):
+    blobs.decref(getattr(instance, 'cv' if sender is Profile else 'cv_copy').name)
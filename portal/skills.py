@@ -0,0 +1,76 @@
+"""
+Normalized skill tags.
+
+`Profile.skills` and `Internship.skills_required` stay the comma-separated
+source of truth that the API reads and writes; the Skill rows and the
+ProfileSkill/InternshipSkill through-tables are derived from them on save
+so skill filters can use indexed lookups instead of substring scans.
+"""
+from django.db.models import Count
+from .models import Skill, ProfileSkill, InternshipSkill
+from .utils import parse_skills
+
+
+def get_or_create_skills(skills):
+    """
+    Return Skill rows for a {canonical name: display name} dict,
+    creating the missing ones in bulk.
+    """
+    if not skills:
+        return []
+    Skill.objects.bulk_create(
+        [Skill(name=name, display_name=display) for name, display in skills.items()],
+        ignore_conflicts=True
+    )
+    return list(Skill.objects.filter(name__in=skills))
+
+
+def sync_skill_tags(instance, text, through, owner_field):
+    """
+    Make the through-table rows for ``instance`` match the skills in ``text``.
+    Does nothing beyond one SELECT when they already match.
+    Returns True if the tags changed.
+    """
+    wanted = parse_skills(text)
+    current = dict(
+        through.objects.filter(**{owner_field: instance}).values_list('skill__name', 'skill_id')
+    )
+    if set(current) == set(wanted):
+        return False
+
+    stale = [skill_id for name, skill_id in current.items() if name not in wanted]
+    if stale:
+        through.objects.filter(**{owner_field: instance, 'skill_id__in': stale}).delete()
+
+    missing = {name: display for name, display in wanted.items() if name not in current}
+    through.objects.bulk_create(
+        [through(**{owner_field: instance, 'skill': skill}) for skill in get_or_create_skills(missing)],
+        ignore_conflicts=True
+    )
+    return True
+
+
+def sync_profile_skills(profile):
+    return sync_skill_tags(profile, profile.skills, ProfileSkill, 'profile')
+
+
+def sync_internship_skills(internship):
+    return sync_skill_tags(internship, internship.skills_required, InternshipSkill, 'internship')
+
+
+def filter_by_skills(queryset, text, match='any'):
+    """
+    Filter internships by a comma-separated list of skills.
+    ``match='any'`` keeps internships requiring at least one of them,
+    ``match='all'`` only those requiring every one of them.
+    """
+    names = list(parse_skills(text))
+    if not names:
+        return queryset
+
+    links = InternshipSkill.objects.filter(skill__name__in=names)
+    if match == 'all':
+        links = links.values('internship').annotate(
+            matched=Count('skill', distinct=True)
+        ).filter(matched=len(names))
+    return queryset.filter(pk__in=links.values('internship'))
@@ -0,0 +1,98 @@
+"""
+Media storage whose URLs for private files carry a signature.
+
+CVs are fetched by the browser through plain links and <a download>,
+which cannot send the JWT, so the URL itself is the credential: it is
+only ever rendered to someone allowed to see the file (the API decides
+that when it serializes the file field), and portal.media checks the
+signature before serving it.
+
+Signatures cover the file name and the current time window of
+settings.MEDIA_URL_MAX_AGE seconds and stay valid for one more window,
+so a link lives between one and two windows. Within a window the URL is
+stable, which keeps the browser cache and conditional GET (whose ETags
+include the window, see portal.conditional) working.
+"""
+import hashlib
+import os
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.signing import Signer
+from django.utils.crypto import constant_time_compare
+
+# Served to anyone: company logos appear on the public internship list
+PUBLIC_MEDIA_PREFIXES = ('logos/',)
+
+_signer = Signer(salt='portal.media')
+
+
+def is_public(name):
+    return name.startswith(PUBLIC_MEDIA_PREFIXES)
+
+
+def current_window():
+    return int(time.time() // settings.MEDIA_URL_MAX_AGE)
+
+
+def media_signature(name, window):
+    return _signer.signature(f'{name}:{window}')
+
+
+def check_media_signature(name, window, signature):
+    """Whether ``signature`` was issued for ``name`` in this or the previous window."""
+    try:
+        window = int(window)
+    except (TypeError, ValueError):
+        return False
+    if window not in (current_window(), current_window() - 1):
+        return False
+    return constant_time_compare(signature or '', media_signature(name, window))
+
+
+class SignedMediaStorage(FileSystemStorage):
+    """FileSystemStorage whose url() signs everything outside PUBLIC_MEDIA_PREFIXES."""
+    def url(self, name):
+        url = super().url(name)
+        if name is None or is_public(name):
+            return url
+        window = current_window()
+        return f'{url}?{urlencode({"w": window, "s": media_signature(name, window)})}'
+
+
+class ContentAddressedStorage(SignedMediaStorage):
+    """
+    Stores each distinct file once, under blobs/<aa>/<bb>/<sha256><ext>,
+    whatever name it was saved with; saving bytes that are already stored
+    writes nothing and returns the existing name. Which rows use a blob is
+    tracked by portal.blobs.
+    """
+    prefix = 'blobs/'
+
+    def blob_name(self, name, content):
+        """The name ``content`` is stored under; ``name`` only contributes its extension."""
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        extension = os.path.splitext(name or '')[1].lower()
+        return f'{self.prefix}{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        blob_name = self.blob_name(name, content)
+        if not self.exists(blob_name):
+            saved = super().save(blob_name, content, max_length)
+            if saved != blob_name:
+                # An identical upload was stored first; keep that one
+                self.delete(saved)
+        return blob_name
+
+
+def cv_storage():
+    """Storage for CV fields (callable, so migrations record a reference)."""
+    return storages['cvs']
@@ -1,10 +1,59 @@
 import pytest
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from portal.models import Profile, Internship, Application
+from portal.models import Profile, Internship, Application, Skill
 from datetime import date, timedelta
+from decimal import Decimal
+
+
+# ==================== HELPERS ====================
+
+def create_company(username='company', **fields):
+    """A company account's Profile, with ``fields`` set on it"""
+    profile = User.objects.create_user(username=username, password='pass').profile
+    profile.role = 'company'
+    for name, value in fields.items():
+        setattr(profile, name, value)
+    profile.save()
+    return profile
+
+
+def create_internship(poster, title='Test Internship', skills_required='Python', **fields):
+    """An internship open for 30 more days; ``fields`` override the other defaults"""
+    fields = {
+        'description': 'Test', 'stipend': 10000, 'duration': '3 months', 'location': 'Pune',
+        'last_date': date.today() + timedelta(days=30), **fields,
+    }
+    return Internship.objects.create(poster=poster, title=title, skills_required=skills_required, **fields)
+
+
+def use_temporary_media_root(test):
+    """Point MEDIA_ROOT at a scratch directory until ``test`` finishes"""
+    import shutil
+    import tempfile
+    from django.test import override_settings
+
+    media_root = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, media_root)
+    media_settings = override_settings(MEDIA_ROOT=media_root)
+    media_settings.enable()
+    test.addCleanup(media_settings.disable)
+
+
+class CompanyTestMixin:
+    """Starts from an empty cache and ``self.company_profile``, which create_internship() posts for"""
+    company_fields = {}
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.company_profile = create_company(**self.company_fields)
+
+    def create_internship(self, title='Test Internship', skills_required='Python', **fields):
+        return create_internship(self.company_profile, title, skills_required, **fields)
 
 
 # ==================== MODEL TESTS ====================
@@ -209,10 +258,108 @@ class AuthenticationAPITest(APITestCase):
         self.assertIn('refresh', response.data)
 
 
+class ClaimsAuthenticationTest(APITestCase):
+    """Test the claims-based JWT authentication"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='company', password='pass', email='c@example.com')
+        self.profile = self.user.profile
+        self.profile.role = 'company'
+        self.profile.save()
+        
+        tokens = self.client.post('/api/token/', {'username': 'company', 'password': 'pass'}).data
+        self.access, self.refresh = tokens['access'], tokens['refresh']
+    
+    def test_tokens_carry_role_and_profile(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        
+        for access in (self.access, self.client.post('/api/token/refresh/', {'refresh': self.refresh}).data['access']):
+            token = AccessToken(access)
+            self.assertEqual(token['role'], 'company')
+            self.assertEqual(token['profile_id'], self.profile.pk)
+            self.assertIs(token['is_staff'], False)
+    
+    def test_permission_checks_do_not_query(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/internships/recommended/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_views_load_the_full_account(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        response = self.client.get('/api/profile/')
+        self.assertEqual(response.data['user']['email'], 'c@example.com')
+        
+        response = self.client.patch('/api/profile/', {'skills': 'Hiring, Django'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.role, 'company')
+        # Profile signals still run for the claims-built instance
+        self.assertEqual(set(self.profile.skill_tags.values_list('name', flat=True)), {'hiring', 'django'})
+    
+    def test_common_endpoints_do_not_load_deferred_fields(self):
+        """Reading a field the claims don't carry would cost a query per access"""
+        from unittest import mock
+        from django.core.files.base import ContentFile
+
+        use_temporary_media_root(self)
+        internship = create_internship(self.profile, 'Backend Intern')
+        student = User.objects.create_user(username='student', password='pass')
+        student.profile.cv.save('cv.pdf', ContentFile(b'%PDF-1.4'))
+        cv_path = f'/media/{student.profile.cv.name}'
+        student_access = self.client.post('/api/token/', {'username': 'student', 'password': 'pass'}).data['access']
+        new_internship = {
+            'title': 'Frontend Intern', 'description': 'UI', 'skills_required': 'React', 'stipend': 8000,
+            'duration': '2 months', 'location': 'Remote', 'last_date': str(date.today() + timedelta(days=30)),
+        }
+
+        def refuse(instance, fields=None, **kwargs):
+            raise AssertionError(f'{type(instance).__name__} loaded {fields} from the database')
+
+        with mock.patch.object(User, 'refresh_from_db', refuse), mock.patch.object(Profile, 'refresh_from_db', refuse):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {student_access}')
+            for path in ('/api/internships/', f'/api/internships/{internship.pk}/', '/api/internships/recommended/',
+                         '/api/profile/', cv_path):
+                self.assertEqual(self.client.get(path).status_code, status.HTTP_200_OK, path)
+            response = self.client.post('/api/applications/', {'internship_id': internship.pk, 'cover_letter': 'Hello'})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self.client.get('/api/applications/my_applications/').status_code, status.HTTP_200_OK)
+
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+            for path in ('/api/internships/', '/api/applications/',
+                         f'/api/applications/{internship.pk}/internship_applications/', cv_path):
+                self.assertEqual(self.client.get(path).status_code, status.HTTP_200_OK, path)
+            response = self.client.post('/api/internships/', new_internship)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_account_cache(self):
+        from django.test import override_settings
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        with override_settings(JWT_ACCOUNT_CACHE_TTL=60):
+            self.client.get('/api/profile/')
+            with self.assertNumQueries(1):
+                self.client.get('/api/profile/')  # only the ETag query
+            
+            self.profile.company_name = 'Renamed Corp'
+            self.profile.save()
+            self.assertEqual(self.client.get('/api/profile/').data['company_name'], 'Renamed Corp')
+    
+    def test_tokens_without_claims_still_work(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        response = self.client.get('/api/profile/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['role'], 'company')
+
+
 class InternshipAPITest(APITestCase):
     """Test Internship API endpoints"""
     
     def setUp(self):
+        cache.clear()
+        
         # Create company user
         self.company_user = User.objects.create_user(
             username='company',
@@ -301,6 +448,1081 @@ class InternshipAPITest(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_list_uses_compact_representation(self):
+        """List items carry the company name instead of a nested profile"""
+        Internship.objects.create(
+            poster=self.company_profile,
+            title='Test Internship',
+            description='Test',
+            skills_required='Python',
+            stipend=15000,
+            duration='3 months',
+            location='Mumbai',
+            last_date=date.today() + timedelta(days=30)
+        )
+        
+        item = self.client.get('/api/internships/').data['results'][0]
+        self.assertEqual(item['company_name'], 'Tech Corp')
+        self.assertNotIn('poster', item)
+        self.assertNotIn('description', item)
+        
+        item = self.client.get('/api/internships/', {'fields': 'title,stipend'}).data['results'][0]
+        self.assertEqual(set(item), {'id', 'title', 'stipend'})
+        
+        item = self.client.get('/api/internships/', {'expand': 'poster'}).data['results'][0]
+        self.assertEqual(item['poster']['company_name'], 'Tech Corp')
+    
+    def test_values_list_matches_serializer_output(self):
+        """The .values() list path renders the same bytes as InternshipListSerializer"""
+        other = create_company('nameless', logo='logos/nameless.png')
+        for poster, stipend, title in (
+            (self.company_profile, Decimal('15000'), 'Backend Intern'),
+            (other, Decimal('12345.5'), 'Data \u2028 Intern – Zürich'),
+        ):
+            Internship.objects.create(
+                poster=poster,
+                title=title,
+                description='Test',
+                skills_required='Python, SQL',
+                stipend=stipend,
+                duration='3 months',
+                location='Mumbai',
+                last_date=date.today() + timedelta(days=30)
+            )
+        Application.objects.create(
+            internship=Internship.objects.get(title='Backend Intern'),
+            student=self.student_user.profile
+        )
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.student_token}')
+        for params in ({}, {'fields': 'title,stipend,company_logo'}, {'pagination': 'cursor'}):
+            fast = self.client.get('/api/internships/', params)
+            # Any expand parameter switches back to the model serializer
+            slow = self.client.get('/api/internships/', {**params, 'expand': 'none'})
+            self.assertEqual(fast.content, slow.content)
+        self.assertIn(b'"stipend":"12345.50"', fast.content)
+        self.assertIn(b'"has_applied":true', self.client.get('/api/internships/').content)
+    
+    def test_list_query_count_is_constant(self):
+        """Listing internships should not issue per-row queries"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        for i in range(12):
+            internship = Internship.objects.create(
+                poster=self.company_profile,
+                title=f'Internship {i}',
+                description='Test',
+                skills_required='Python',
+                stipend=15000,
+                duration='3 months',
+                location='Mumbai',
+                last_date=date.today() + timedelta(days=30)
+            )
+            Application.objects.create(
+                internship=internship,
+                student=self.student_user.profile,
+                cover_letter='Interested'
+            )
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.student_token}')
+        query_counts = []
+        for page_size in [1, 5, 12]:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get('/api/internships/', {'page_size': page_size})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), page_size)
+            self.assertTrue(all(item['has_applied'] for item in response.data['results']))
+            self.assertTrue(all(item['applications_count'] == 1 for item in response.data['results']))
+            query_counts.append(len(ctx.captured_queries))
+        
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+
+class InternshipSearchAPITest(CompanyTestMixin, APITestCase):
+    """Test full-text search on the internship list"""
+    
+    def setUp(self):
+        super().setUp()
+        self.backend = self.create_internship(
+            title='Django Developer Intern',
+            description='Build REST APIs',
+            skills_required='Python, Django'
+        )
+        self.frontend = self.create_internship(
+            title='Frontend Intern',
+            description='Some Django templates, mostly React',
+            skills_required='JavaScript, React'
+        )
+    
+    def search(self, q):
+        response = self.client.get('/api/internships/', {'q': q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+    
+    def test_search_ranks_title_matches_first(self):
+        """Title matches should outrank description matches"""
+        self.assertEqual(self.search('django'), [self.backend.id, self.frontend.id])
+    
+    def test_search_matches_word_prefixes(self):
+        """Partial words should still find internships"""
+        self.assertEqual(self.search('javascr'), [self.frontend.id])
+    
+    def test_search_ignores_query_syntax(self):
+        """Operator characters in the query must not cause errors"""
+        self.assertEqual(self.search('react" (*'), [self.frontend.id])
+    
+    def test_search_index_follows_updates_and_deletes(self):
+        """Search index should be kept in sync with the internship rows"""
+        self.backend.title = 'Golang Intern'
+        self.backend.save()
+        self.assertEqual(self.search('golang'), [self.backend.id])
+        
+        self.backend.delete()
+        self.assertEqual(self.search('golang'), [])
+
+
+class SkillFilterAPITest(CompanyTestMixin, APITestCase):
+    """Test the normalized skill tags and the skills filter"""
+    
+    def setUp(self):
+        super().setUp()
+        self.java = self.create_internship('Java Intern', 'Java, Spring')
+        self.web = self.create_internship('Web Intern', 'JavaScript,  React ')
+        self.django = self.create_internship('Django Intern', 'Python, Django, React')
+    
+    def filter_ids(self, **params):
+        response = self.client.get('/api/internships/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['id'] for item in response.data['results']}
+    
+    def test_skill_tags_are_canonicalized(self):
+        """Skill strings should map onto shared canonical Skill rows"""
+        self.assertEqual(
+            sorted(self.web.skill_tags.values_list('name', flat=True)),
+            ['javascript', 'react']
+        )
+        self.assertEqual(Skill.objects.filter(name='react').count(), 1)
+    
+    def test_long_skills_fit_the_skill_columns(self):
+        """Skills over 100 characters should be cut to fit, not fail to save"""
+        internship = self.create_internship('Long Intern', 'Python, ' + 'Very Long Skill ' * 10)
+        skill = internship.skill_tags.exclude(name='python').get()
+        self.assertEqual(len(skill.name), 100)
+        self.assertEqual(len(skill.display_name), 100)
+        self.assertEqual(self.filter_ids(skills='very long skill ' * 10), {internship.id})
+    
+    def test_skill_filter_matches_whole_skills(self):
+        """'Java' should not match 'JavaScript'"""
+        self.assertEqual(self.filter_ids(skills='java'), {self.java.id})
+    
+    def test_skill_filter_any_and_all(self):
+        """Comma-separated skills match any by default, or all on request"""
+        self.assertEqual(self.filter_ids(skills='Python,react'), {self.web.id, self.django.id})
+        self.assertEqual(self.filter_ids(skills='Python,react', skills_match='all'), {self.django.id})
+    
+    def test_skill_tags_follow_updates(self):
+        """Editing the skills text should resync the tags"""
+        self.java.skills_required = 'Kotlin'
+        self.java.save()
+        self.assertEqual(list(self.java.skill_tags.values_list('name', flat=True)), ['kotlin'])
+        self.assertEqual(self.filter_ids(skills='java'), set())
+
+
+class RecommendationAPITest(CompanyTestMixin, APITestCase):
+    """Test the skill-match recommendations endpoint"""
+    
+    def setUp(self):
+        super().setUp()
+        self.student_user = User.objects.create_user(username='student', password='pass')
+        self.student_profile = self.student_user.profile
+        self.student_profile.skills = 'Python, Django, SQL'
+        self.student_profile.save()
+        
+        self.exact = self.create_internship('Django Intern', 'Python, Django, SQL')
+        self.partial = self.create_internship('Data Intern', 'Python, Pandas, NumPy, SQL')
+        self.unrelated = self.create_internship('Design Intern', 'Figma')
+        
+        self.client.force_authenticate(self.student_user)
+    
+    def recommended(self):
+        response = self.client.get('/api/internships/recommended/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['id'], item['match_score']) for item in response.data]
+    
+    def test_recommendations_are_ranked_by_skill_overlap(self):
+        """Exact skill matches come first, unrelated internships are left out"""
+        self.assertEqual(self.recommended(), [(self.exact.id, 1.0), (self.partial.id, 0.4)])
+    
+    def test_recommendations_follow_profile_and_internship_changes(self):
+        """Cached scores are invalidated by skill edits and new internships"""
+        self.recommended()
+        
+        self.student_profile.skills = 'Figma'
+        self.student_profile.save()
+        self.assertEqual(self.recommended(), [(self.unrelated.id, 1.0)])
+        
+        newer = self.create_internship('UI Intern', 'Figma, Sketch')
+        self.assertEqual(self.recommended(), [(self.unrelated.id, 1.0), (newer.id, 0.5)])
+    
+    def test_sql_scoring_matches_skill_matrix(self):
+        """The database fallback should rank exactly like the skill matrix"""
+        from portal.recommendations import score_internships, score_internships_sql
+        
+        skill_ids = list(self.student_profile.skill_tags.values_list('pk', flat=True))
+        self.assertEqual(
+            score_internships_sql(skill_ids, 10),
+            score_internships(self.student_profile.pk, 10)
+        )
+    
+    def test_recommendations_are_for_students_only(self):
+        """Companies cannot request recommendations"""
+        self.client.force_authenticate(self.company_profile.user)
+        response = self.client.get('/api/internships/recommended/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class KeysetPaginationAPITest(CompanyTestMixin, APITestCase):
+    """Test cursor (keyset) pagination on the internship list"""
+    
+    def setUp(self):
+        super().setUp()
+        for i in range(7):
+            self.create_internship(f'Internship {i}')
+        # Ties on created_at must still page deterministically via the id
+        Internship.objects.filter(title__in=['Internship 2', 'Internship 3', 'Internship 4']).update(
+            created_at=Internship.objects.get(title='Internship 2').created_at
+        )
+        self.expected = list(
+            Internship.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+    
+    def test_cursor_pages_cover_every_row_once(self):
+        """Following next links should visit each internship exactly once"""
+        seen = []
+        response = self.client.get('/api/internships/', {'pagination': 'cursor', 'page_size': 3})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen += [item['id'] for item in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, self.expected)
+    
+    def test_cursor_previous_link_returns_prior_page(self):
+        """The previous link should lead back to the same rows"""
+        first = self.client.get('/api/internships/', {'pagination': 'cursor', 'page_size': 3})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']]
+        )
+        self.assertIsNone(back.data['previous'])
+    
+    def test_cursor_count_is_optional(self):
+        """count=exact should report the full result size"""
+        response = self.client.get('/api/internships/', {'pagination': 'cursor', 'count': 'exact'})
+        self.assertEqual(response.data['count'], 7)
+    
+    def test_cursor_refuses_other_orderings(self):
+        """Cursor pages can't follow ?ordering= or search relevance, so those are a 400"""
+        for params in ({'ordering': 'stipend'}, {'ordering': 'created_at'}, {'q': 'Internship'}):
+            response = self.client.get('/api/internships/', {'pagination': 'cursor', **params})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertIn('ordering', response.data)
+        # The default order, asked for explicitly, is what the cursor follows anyway
+        for params in ({'ordering': '-created_at'}, {'q': 'Internship', 'ordering': '-created_at'}):
+            response = self.client.get('/api/internships/', {'pagination': 'cursor', **params})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, params)
+        response = self.client.get('/api/internships/', {'ordering': 'stipend', 'q': 'Internship'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_cursor_is_rejected(self):
+        """Tampered cursors should return 404 rather than erroring"""
+        response = self.client.get('/api/internships/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_cursor_with_invalid_values_is_rejected(self):
+        """Well-formed cursors holding values of the wrong type should return 404"""
+        import json
+        from base64 import urlsafe_b64encode
+        
+        for values in (['not-a-date', 1], ['2026-13-45', 1], ['2026-01-01T00:00:00', 'x'],
+                       ['2026-01-01T00:00:00', 10 ** 30]):
+            cursor = urlsafe_b64encode(json.dumps({'v': values, 'r': 0}).encode()).decode()
+            response = self.client.get('/api/internships/', {'pagination': 'cursor', 'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, values)
+    
+    def test_page_number_pagination_still_default(self):
+        """Without opting in, responses keep the page-number format"""
+        response = self.client.get('/api/internships/')
+        self.assertEqual(response.data['count'], 7)
+
+
+class InternshipResponseCacheTest(CompanyTestMixin, APITestCase):
+    """Test the public internship response cache and its invalidation"""
+    company_fields = {'company_name': 'Tech Corp'}
+    
+    def setUp(self):
+        super().setUp()
+        self.backend = self.create_internship('Backend Intern', 'Python, Django')
+        self.frontend = self.create_internship('Frontend Intern', 'React')
+        self.student = User.objects.create_user(username='student', password='pass').profile
+    
+    def test_equivalent_requests_share_an_entry(self):
+        first = self.client.get('/api/internships/', {'skills': 'Django, python'})
+        second = self.client.get('/api/internships/', {'skills': 'python,django', 'utm_source': 'mail'})
+        
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+    
+    def test_changes_invalidate_listings(self):
+        self.client.get('/api/internships/')
+        self.create_internship('Data Intern', 'SQL')
+        
+        response = self.client.get('/api/internships/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 3)
+        
+        self.company_profile.company_name = 'Renamed Corp'
+        self.company_profile.save()
+        response = self.client.get(f'/api/internships/{self.backend.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['poster']['company_name'], 'Renamed Corp')
+    
+    def test_applications_only_invalidate_their_internship(self):
+        self.client.get(f'/api/internships/{self.backend.id}/')
+        self.client.get(f'/api/internships/{self.frontend.id}/')
+        Application.objects.create(internship=self.backend, student=self.student)
+        
+        response = self.client.get(f'/api/internships/{self.backend.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['applications_count'], 1)
+        self.assertEqual(self.client.get(f'/api/internships/{self.frontend.id}/')['X-Cache'], 'HIT')
+    
+    def test_unrelated_saves_keep_entries(self):
+        """Logins, no-op profile saves and status changes don't flush the cache"""
+        application = Application.objects.create(internship=self.backend, student=self.student)
+        detail = f'/api/internships/{self.backend.id}/'
+        self.client.get('/api/internships/')
+        self.client.get(detail)
+        
+        company_user = self.company_profile.user
+        company_user.save(update_fields=['last_login'])
+        company_user.save()
+        application.status = 'shortlisted'
+        application.save()
+        self.assertEqual(self.client.get('/api/internships/')['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(detail)['X-Cache'], 'HIT')
+        
+        company_user.email = 'jobs@techcorp.example'
+        company_user.save()
+        response = self.client.get(detail)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['poster']['user']['email'], 'jobs@techcorp.example')
+    
+    def test_has_applied_is_merged_per_student(self):
+        Application.objects.create(internship=self.backend, student=self.student)
+        other = User.objects.create_user(username='other', password='pass')
+        
+        self.client.force_authenticate(self.student.user)
+        response = self.client.get('/api/internships/')
+        applied = {item['id']: item['has_applied'] for item in response.data['results']}
+        self.assertEqual(applied, {self.backend.id: True, self.frontend.id: False})
+        
+        self.client.force_authenticate(other)
+        response = self.client.get('/api/internships/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertFalse(any(item['has_applied'] for item in response.data['results']))
+    
+    def test_companies_bypass_the_cache(self):
+        self.client.force_authenticate(self.company_profile.user)
+        response = self.client.get('/api/internships/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Cache', response)
+
+
+class ConditionalGetTest(CompanyTestMixin, APITestCase):
+    """Test ETag / Last-Modified handling"""
+    
+    def setUp(self):
+        super().setUp()
+        self.internship = self.create_internship()
+        self.student = User.objects.create_user(username='student', password='pass')
+        self.application = Application.objects.create(
+            internship=self.internship, student=self.student.profile
+        )
+        self.client.force_authenticate(self.student)
+    
+    def assertNotModified(self, url, response):
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again['ETag'], response['ETag'])
+    
+    def test_my_applications_not_modified(self):
+        url = '/api/applications/my_applications/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertNotModified(url, response)
+        
+        since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(since.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        # 304s are answered from one aggregate query, without serializing
+        with self.assertNumQueries(1):
+            self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    
+    def test_changes_produce_a_new_etag(self):
+        url = '/api/applications/my_applications/'
+        etag = self.client.get(url)['ETag']
+        
+        self.application.status = 'reviewing'
+        self.application.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        # Embedded company data counts too
+        etag = response['ETag']
+        self.company_profile.company_name = 'Renamed Corp'
+        self.company_profile.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['internship']['company_name'], 'Renamed Corp')
+    
+    def test_internship_detail(self):
+        url = f'/api/internships/{self.internship.id}/'
+        response = self.client.get(url)
+        self.assertNotModified(url, response)
+        
+        # A new application changes applications_count
+        other = User.objects.create_user(username='other', password='pass')
+        Application.objects.create(internship=self.internship, student=other.profile)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['applications_count'], 2)
+        
+        # ETags are per user (has_applied differs)
+        self.client.force_authenticate(other)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+            status.HTTP_200_OK
+        )
+        
+        self.assertEqual(self.client.get('/api/internships/999/').status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_profile(self):
+        response = self.client.get('/api/profile/')
+        self.assertNotModified('/api/profile/', response)
+        
+        self.client.patch('/api/profile/', {'college': 'IIT'})
+        response = self.client.get('/api/profile/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['college'], 'IIT')
+
+
+class AsyncViewsTest(APITestCase):
+    """portal.async_views must answer exactly like the DRF viewsets"""
+
+    def setUp(self):
+        cache.clear()
+        company = create_company('async_company', company_name='Async Corp')
+        self.internships = [
+            create_internship(
+                company, f'Role {n}', 'Python, Django', stipend=1000 + n, duration='1 month',
+                last_date=date.today(), is_active=n != 2
+            )
+            for n in range(4)
+        ]
+        self.student = User.objects.create_user(username='async_student', password='pass')
+        self.student.profile.role = 'student'
+        self.student.profile.save()
+        Application.objects.create(internship=self.internships[0], student=self.student.profile)
+        self.company_token = self.token('async_company')
+        self.student_token = self.token('async_student')
+
+    def token(self, username):
+        return self.client.post('/api/token/', {'username': username, 'password': 'pass'}).data['access']
+
+    def assertSameResponse(self, sync_view, async_view, path, token=None, **kwargs):
+        from asgiref.sync import async_to_sync
+        from rest_framework.test import APIRequestFactory
+
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        responses = []
+        for view, call in ((sync_view, lambda request: view(request, **kwargs)),
+                           (async_view, lambda request: async_to_sync(view)(request, **kwargs))):
+            cache.clear()
+            response = call(APIRequestFactory().get(path, **headers))
+            response.render()
+            responses.append(response)
+        expected, actual = responses
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+        for header in ('Content-Type', 'ETag', 'X-Cache', 'Cache-Control'):
+            self.assertEqual(actual.get(header), expected.get(header), header)
+        return actual
+
+    def test_internship_list(self):
+        import json
+        from portal.async_views import internship_list_view
+        from portal.views import InternshipViewSet
+
+        view = InternshipViewSet.as_view({'get': 'list'})
+        for path, token in (
+            ('/api/internships/', None),
+            ('/api/internships/', self.student_token),
+            ('/api/internships/', self.company_token),
+            ('/api/internships/?page=2&page_size=2&fields=title', self.student_token),
+            ('/api/internships/?pagination=cursor&page_size=2&count=exact', None),
+            ('/api/internships/?q=role&skills=django', None),
+            ('/api/internships/?expand=poster', self.student_token),
+            ('/api/internships/?page=9', None),
+        ):
+            with self.subTest(path=path, token=token is not None):
+                self.assertSameResponse(view, internship_list_view, path, token)
+
+        # Cursor links lead to the same next page
+        response = self.assertSameResponse(view, internship_list_view, '/api/internships/?pagination=cursor&page_size=2')
+        self.assertSameResponse(view, internship_list_view, json.loads(response.content)['next'])
+
+    def test_internship_retrieve(self):
+        from portal.async_views import internship_detail_view
+        from portal.views import InternshipViewSet
+
+        view = InternshipViewSet.as_view({'get': 'retrieve'})
+        inactive = self.internships[2].pk
+        for pk, token, expected in (
+            (self.internships[0].pk, self.student_token, status.HTTP_200_OK),
+            (self.internships[1].pk, None, status.HTTP_200_OK),
+            (inactive, self.company_token, status.HTTP_200_OK),
+            (inactive, self.student_token, status.HTTP_404_NOT_FOUND),
+        ):
+            with self.subTest(pk=pk, token=token):
+                response = self.assertSameResponse(view, internship_detail_view, f'/api/internships/{pk}/', token, pk=pk)
+                self.assertEqual(response.status_code, expected)
+
+    def test_my_applications(self):
+        from asgiref.sync import async_to_sync
+        from rest_framework.test import APIRequestFactory
+        from portal.async_views import my_applications_view
+        from portal.views import ApplicationViewSet
+
+        view = ApplicationViewSet.as_view({'get': 'my_applications'})
+        path = '/api/applications/my_applications/'
+        response = self.assertSameResponse(view, my_applications_view, path, self.student_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertSameResponse(view, my_applications_view, path, self.company_token)
+
+        # Conditional GET: one aggregate query, no body
+        request = APIRequestFactory().get(
+            path, HTTP_AUTHORIZATION=f'Bearer {self.student_token}', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        with self.assertNumQueries(1):
+            not_modified = async_to_sync(my_applications_view)(request)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_other_methods_use_the_viewset(self):
+        from asgiref.sync import async_to_sync
+        from rest_framework.test import APIRequestFactory
+        from portal.async_views import internship_list_view
+
+        request = APIRequestFactory().post('/api/internships/', {
+            'title': 'Posted', 'description': 'Test', 'skills_required': 'Go', 'stipend': '500.00',
+            'duration': '2 months', 'location': 'Delhi', 'last_date': str(date.today()),
+        }, format='json', HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        response = async_to_sync(internship_list_view)(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Internship.objects.filter(title='Posted').exists())
+
+
+class MediaServingTest(APITestCase):
+    """Test authorized media delivery (portal.media)"""
+
+    def setUp(self):
+        from django.core.files.base import ContentFile
+
+        use_temporary_media_root(self)
+        self.company_profile = create_company()
+        self.company_profile.logo.save('logo.png', ContentFile(b'png'))
+        internship = create_internship(self.company_profile)
+        self.student = User.objects.create_user(username='student', password='pass')
+        self.student.profile.cv.save('cv.pdf', ContentFile(b'0123456789'))
+        Application.objects.create(internship=internship, student=self.student.profile)
+        self.cv_path = f'/media/{self.student.profile.cv.name}'
+
+    def test_public_and_signed_files(self):
+        logo = self.client.get(f'/media/{self.company_profile.logo.name}')
+        self.assertEqual(logo.status_code, status.HTTP_200_OK)
+        self.assertIn('public', logo['Cache-Control'])
+
+        self.assertEqual(self.client.get(self.cv_path).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(self.student)
+        signed_url = self.client.get('/api/profile/').data['cv']
+        self.client.force_authenticate(None)
+        self.assertIn('?w=', signed_url)
+        response = self.client.get(signed_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(self.client.get(signed_url + 'x').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get('/media/..%2Fmanage.py').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_access_by_user(self):
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get(self.cv_path).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(self.company_profile.user)
+        self.assertEqual(self.client.get(self.cv_path).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(create_company('other_company').user)
+        self.assertEqual(self.client.get(self.cv_path).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_range_requests(self):
+        self.client.force_authenticate(self.student)
+        response = self.client.get(self.cv_path, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        response = self.client.get(self.cv_path, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+        response = self.client.get(self.cv_path, HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+        # A stale If-Range gets the whole file
+        response = self.client.get(
+            self.cv_path, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='Thu, 01 Jan 1970 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response.close()
+
+    def test_offload_to_proxy(self):
+        from django.test import override_settings
+        self.client.force_authenticate(self.student)
+        with override_settings(MEDIA_SERVE_MODE='x-accel-redirect'):
+            response = self.client.get(self.cv_path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.student.profile.cv.name}')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response.content, b'')
+
+
+class UploadProcessingTest(APITestCase):
+    """Test quarantined uploads and the process_uploads worker"""
+
+    def setUp(self):
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.user)
+
+    def upload(self, field, name, data):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        response = self.client.patch('/api/profile/', {field: SimpleUploadedFile(name, data)}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['uploads'][0]['status'], 'pending')
+        return response.data['uploads'][0]['id']
+
+    def process(self):
+        from django.core.management import call_command
+        from io import StringIO
+        call_command('process_uploads', '--once', stdout=StringIO())
+
+    def pdf(self, content):
+        import zlib
+        stream = zlib.compress(content)
+        return (
+            b'%PDF-1.4\n1 0 obj\n<< /Length ' + str(len(stream)).encode() +
+            b' /Filter /FlateDecode >>\nstream\n' + stream + b'\nendstream\nendobj\n%%EOF\n'
+        )
+
+    def test_cv_is_checked_and_text_extracted(self):
+        from django.core.files.storage import default_storage
+        from portal.models import UploadJob
+        pdf = self.pdf(b'BT /F1 12 Tf 72 712 Td (Django developer) Tj [(RE) -20 (ST)] TJ ET')
+        job_id = self.upload('cv', 'My CV.pdf', pdf)
+        self.user.profile.refresh_from_db()
+        self.assertFalse(self.user.profile.cv)
+
+        self.process()
+        job = UploadJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, 'done')
+        self.assertFalse(default_storage.exists(job.quarantine_name))
+        profile = Profile.objects.get(pk=self.user.profile.pk)
+        self.assertTrue(profile.cv.name.startswith('blobs/') and profile.cv.name.endswith('.pdf'))
+        self.assertEqual(profile.cv_text, 'Django developer\nREST')
+        self.assertEqual(self.client.get(f'/api/uploads/{job_id}/').data['status'], 'done')
+
+    def test_applicants_are_searchable_by_cv_text(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from portal.models import ProfileCVSearchEntry
+        self.upload('cv', 'cv.pdf', self.pdf(b'BT (Kubernetes and Django developer) Tj ET'))
+        self.process()
+        company = create_company()
+        internship = create_internship(company, 'Platform Intern')
+        Application.objects.create(internship=internship, student=self.user.profile)
+        Application.objects.create(
+            internship=internship, student=User.objects.create_user(username='other', password='pass').profile
+        )
+
+        self.client.force_authenticate(company.user)
+        urls = ('/api/applications/', f'/api/applications/{internship.pk}/internship_applications/')
+        for url in urls:
+            self.assertEqual(len(self.client.get(url).data['results']), 2)
+            results = self.client.get(url, {'q': 'kubernetes'}).data['results']
+            self.assertEqual([item['student']['id'] for item in results], [self.user.profile.pk])
+            self.assertEqual(self.client.get(url, {'q': 'cobol'}).data['results'], [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.client.get(urls[0], {'q': 'developers'}).data['results']), 1)
+        self.user.delete()
+        self.assertFalse(ProfileCVSearchEntry.objects.exists())
+
+    def test_disguised_file_is_rejected(self):
+        from portal.models import UploadJob
+        job_id = self.upload('cv', 'cv.pdf', b'<script>alert(1)</script>')
+        self.process()
+        job = UploadJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('Invalid file type', job.error)
+        self.assertFalse(Profile.objects.get(pk=self.user.profile.pk).cv)
+
+    def test_logo_renditions(self):
+        import io
+        from PIL import Image
+        output = io.BytesIO()
+        Image.new('RGB', (600, 300), 'red').save(output, 'PNG')
+        self.upload('logo', 'logo.png', output.getvalue())
+        self.process()
+
+        profile = Profile.objects.get(pk=self.user.profile.pk)
+        self.assertEqual(profile.logo.name, 'logos/logo.png')
+        with Image.open(profile.logo_thumbnail) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.size), ('WEBP', (128, 64)))
+        with Image.open(profile.logo_webp) as webp:
+            self.assertEqual(webp.size, (600, 300))
+
+
+class ResumableUploadTest(APITestCase):
+    """Test chunked, resumable uploads through UploadSession"""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.test import override_settings
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.session_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.session_dir)
+        media_settings = override_settings(MEDIA_ROOT=media_root, UPLOAD_SESSION_DIR=self.session_dir)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.user = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.user)
+
+    def send(self, session_id, offset, chunk):
+        return self.client.patch(
+            f'/api/upload-sessions/{session_id}/', chunk,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_chunked_upload_resumes_and_is_processed(self):
+        from io import StringIO
+        from django.core.management import call_command
+        pdf = b'%PDF-1.4\n' + b'x' * 5000 + b'\n%%EOF\n'
+        response = self.client.post(
+            '/api/upload-sessions/', {'kind': 'cv', 'filename': 'resume.pdf', 'length': len(pdf)}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        session_id = response.data['id']
+        self.assertTrue(response['Location'].endswith(f'/api/upload-sessions/{session_id}/'))
+        self.assertEqual(response['Upload-Offset'], '0')
+
+        self.assertEqual(self.send(session_id, 0, pdf[:2000]).status_code, status.HTTP_200_OK)
+        # A retried chunk for an offset already passed tells the client where to resume
+        response = self.send(session_id, 0, pdf[:2000])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response['Upload-Offset'], '2000')
+        response = self.client.head(f'/api/upload-sessions/{session_id}/')
+        self.assertEqual(response['Upload-Offset'], '2000')
+        self.assertEqual(response['Upload-Length'], str(len(pdf)))
+
+        response = self.send(session_id, 2000, pdf[2000:])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['offset'], len(pdf))
+        self.assertEqual(response.data['upload']['status'], 'pending')
+
+        call_command('process_uploads', '--once', stdout=StringIO())
+        profile = Profile.objects.get(pk=self.user.profile.pk)
+        with profile.cv.open('rb') as cv:
+            self.assertEqual(cv.read(), pdf)
+        self.assertEqual(self.client.get(f'/api/upload-sessions/{session_id}/').data['upload']['status'], 'done')
+
+    def test_disguised_file_is_rejected_early(self):
+        import os
+        from portal.models import UploadSession
+        response = self.client.post(
+            '/api/upload-sessions/', {'kind': 'logo', 'filename': 'logo.png', 'length': 1000}, format='json'
+        )
+        partial_path = os.path.join(self.session_dir, UploadSession.objects.get().partial_name)
+        self.assertTrue(os.path.exists(partial_path))
+        response = self.send(response.data['id'], 0, b'<svg onload=alert(1)>')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Invalid image type', response.data['detail'])
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(partial_path))
+
+    def test_any_default_storage(self):
+        """Sessions are assembled on local disk, then handed to the storage API"""
+        import os
+        from django.conf import settings
+        from django.core.files.storage import default_storage
+        from django.test import override_settings
+        from portal.models import UploadJob
+        storages = {**settings.STORAGES, 'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'}}
+        pdf = b'%PDF-1.4\n' + b'x' * 100 + b'\n%%EOF\n'
+        with override_settings(STORAGES=storages):
+            response = self.client.post(
+                '/api/upload-sessions/', {'kind': 'cv', 'filename': 'resume.pdf', 'length': len(pdf)}, format='json'
+            )
+            self.assertEqual(self.send(response.data['id'], 0, pdf).status_code, status.HTTP_200_OK)
+            with default_storage.open(UploadJob.objects.get().quarantine_name, 'rb') as quarantined:
+                self.assertEqual(quarantined.read(), pdf)
+        self.assertEqual(os.listdir(self.session_dir), [])
+
+    def test_accounts_without_a_profile_are_refused(self):
+        admin = User.objects.create_superuser(username='root', password='pass')
+        Profile.objects.filter(user=admin).delete()
+        self.client.force_authenticate(User.objects.get(pk=admin.pk))
+        response = self.client.post(
+            '/api/upload-sessions/', {'kind': 'cv', 'filename': 'cv.pdf', 'length': 100}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_declared_file_is_validated(self):
+        response = self.client.post(
+            '/api/upload-sessions/', {'kind': 'cv', 'filename': 'cv.pdf', 'length': 6 * 1024 * 1024}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('filename', response.data)
+        response = self.client.post(
+            '/api/upload-sessions/', {'kind': 'cv', 'filename': 'cv.exe', 'length': 100}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BlobStorageTest(APITestCase):
+    """Test content-addressed CV storage and blob reference counting"""
+
+    def setUp(self):
+        use_temporary_media_root(self)
+        self.internship = create_internship(create_company(), 'Backend Intern')
+        self.students = [User.objects.create_user(username=f'student{i}', password='pass').profile for i in range(2)]
+
+    def attach_cv(self, profile, data):
+        from django.core.files.base import ContentFile
+        profile.cv.save('cv.pdf', ContentFile(data))
+        return profile.cv.name
+
+    def test_identical_cvs_share_a_blob(self):
+        import os
+        from portal.models import Blob
+        names = [self.attach_cv(profile, b'%PDF-1.4 same cv') for profile in self.students]
+        self.assertEqual(names[0], names[1])
+        self.assertTrue(names[0].startswith('blobs/'))
+        self.assertEqual(len(os.listdir(os.path.dirname(self.students[0].cv.path))), 1)
+        self.assertEqual(Blob.objects.get(name=names[0]).ref_count, 2)
+
+        # Applying snapshots the profile CV without copying it
+        self.client.force_authenticate(self.students[0].user)
+        response = self.client.post('/api/applications/', {'internship_id': self.internship.id, 'cover_letter': 'Hi'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Application.objects.get().cv_copy.name, names[0])
+        self.assertEqual(Blob.objects.get(name=names[0]).ref_count, 3)
+
+        # Replacing the profile CV leaves the application's copy in place
+        self.attach_cv(self.students[0], b'%PDF-1.4 new cv')
+        self.assertEqual(Blob.objects.get(name=names[0]).ref_count, 2)
+        self.assertEqual(self.client.get(Application.objects.get().cv_copy.url).status_code, 200)
+
+    def test_garbage_collection(self):
+        from portal.blobs import collect_garbage, recount
+        from portal.models import Blob
+        name = self.attach_cv(self.students[0], b'%PDF-1.4 orphan')
+        storage = self.students[0].cv.storage
+        self.students[0].delete()
+        self.assertEqual(Blob.objects.get(name=name).ref_count, 0)
+
+        # Unreferenced blobs survive the grace period
+        self.assertEqual(collect_garbage(), [])
+        self.assertTrue(storage.exists(name))
+        Blob.objects.filter(name=name).update(ref_count=5)
+        self.assertEqual(recount(), 1)
+        self.assertEqual(collect_garbage(timedelta(0)), [name])
+        self.assertFalse(storage.exists(name))
+        self.assertFalse(Blob.objects.exists())
+
+    def test_dedup_media_converts_legacy_files(self):
+        from io import StringIO
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+        from django.core.management import call_command
+        from portal.models import Blob
+        legacy = [default_storage.save(f'cvs/cv{i}.pdf', ContentFile(b'%PDF-1.4 legacy')) for i in range(2)]
+        for profile, name in zip(self.students, legacy):
+            Profile.objects.filter(pk=profile.pk).update(cv=name)
+
+        output = StringIO()
+        call_command('dedup_media', stdout=output)
+        self.assertIn('Converted 2 CV files', output.getvalue())
+        names = set(Profile.objects.filter(pk__in=[p.pk for p in self.students]).values_list('cv', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(Blob.objects.get(name=names.pop()).ref_count, 2)
+        self.assertFalse(any(default_storage.exists(name) for name in legacy))
+
+
+class ServeReactTest(TestCase):
+    """Test the in-memory, precompressed React index.html"""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.test import override_settings
+
+        self.build_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.build_dir)
+        build_settings = override_settings(REACT_BUILD_DIR=self.build_dir)
+        build_settings.enable()
+        self.addCleanup(build_settings.disable)
+        self.write_index(b'<html>' + b'<script src="/static/js/main.1a2b3c4d.js"></script>' * 20 + b'</html>')
+
+    def write_index(self, body):
+        import os
+        path = os.path.join(self.build_dir, 'index.html')
+        with open(path, 'wb') as f:
+            f.write(body)
+        # Make sure the change is visible even on coarse mtime filesystems
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def get(self, **headers):
+        from django.test import RequestFactory
+        from intern_portal.views import serve_react
+        return serve_react(RequestFactory().get('/internships/5/', **headers))
+
+    def test_compressed_and_conditional(self):
+        import gzip
+        plain = self.get()
+        self.assertEqual(plain.status_code, 200)
+        self.assertTrue(plain.content.startswith(b'<html>'))
+        self.assertIn('no-cache', plain['Cache-Control'])
+        self.assertEqual(plain['Vary'], 'Accept-Encoding')
+
+        compressed = self.get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=plain['ETag']).status_code, 304)
+
+    def test_brotli(self):
+        import brotli
+        plain = self.get()
+        compressed = self.get(HTTP_ACCEPT_ENCODING='br;q=1, gzip;q=0.5')
+        self.assertEqual(compressed['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(compressed.content), plain.content)
+        self.assertNotIn(compressed['ETag'], (plain['ETag'], self.get(HTTP_ACCEPT_ENCODING='gzip')['ETag']))
+        self.assertEqual(self.get(HTTP_ACCEPT_ENCODING='br', HTTP_IF_NONE_MATCH=compressed['ETag']).status_code, 304)
+
+    def test_refused_encodings(self):
+        from intern_portal.views import accepted_encoding
+        from django.test import RequestFactory
+
+        variants = {'identity': None, 'gzip': None, 'br': None}
+        for header, expected in (
+            ('gzip;q=0', 'identity'), ('GZIP; Q=0, deflate', 'identity'), ('br;q=0, gzip', 'gzip'),
+            ('br;q=0.5, gzip;q=0.8', 'gzip'), ('gzip, br', 'br'), ('*', 'br'), ('*;q=0.3, br;q=0', 'gzip'),
+            ('*;q=0', 'identity'), ('gzip;q=bogus', 'identity'), ('', 'identity'),
+        ):
+            request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)
+            self.assertEqual(accepted_encoding(request, variants), expected, header)
+        self.assertNotIn('Content-Encoding', self.get(HTTP_ACCEPT_ENCODING='gzip;q=0'))
+
+    def test_reloads_on_change(self):
+        first = self.get()
+        self.write_index(b'<html>new build</html>')
+        second = self.get()
+        self.assertEqual(second.content, b'<html>new build</html>')
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+
+class ExplainQuerysetsCommandTest(TestCase):
+    """Test the explain_querysets management command"""
+    
+    def test_hot_querysets_use_indexes(self):
+        """Every endpoint queryset should be planned without a table scan"""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        student_user = User.objects.create_user(username='student', password='pass')
+        internship = create_internship(create_company())
+        Application.objects.create(
+            internship=internship,
+            student=student_user.profile,
+            cover_letter='Interested'
+        )
+        
+        out = StringIO()
+        call_command('explain_querysets', stdout=out)
+        self.assertNotIn('✗', out.getvalue())
+
+
+class ServerConfigTest(TestCase):
+    """Test gunicorn.conf.py, the production server settings"""
+
+    def load(self, **env):
+        import os
+        import runpy
+        from unittest import mock
+        from django.conf import settings
+
+        with mock.patch.dict(os.environ, env):
+            config = runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+            config['environ'] = dict(os.environ)
+        return config
+
+    def test_worker_sizing(self):
+        config = self.load()
+        default_workers = config['default_workers']
+        self.assertEqual(default_workers('sync', 4, None, 200), 9)
+        self.assertEqual(default_workers('gthread', 4, None, 200), 5)
+        # Memory caps the CPU-based count, but there is always one worker
+        self.assertEqual(default_workers('sync', 4, 1000, 200), 5)
+        self.assertEqual(default_workers('uvicorn', 4, 100, 200), 1)
+        self.assertEqual(self.load(GUNICORN_WORKERS='3')['workers'], 3)
+
+    def test_worker_classes(self):
+        config = self.load(GUNICORN_WORKER_CLASS='gthread', GUNICORN_THREADS='8', GUNICORN_MAX_REQUESTS='50')
+        self.assertEqual((config['worker_class'], config['threads']), ('gthread', 8))
+        self.assertEqual(config['wsgi_app'], 'intern_portal.wsgi:application')
+        self.assertEqual(config['max_requests'], 50)
+        self.assertTrue(config['preload_app'])
+
+        config = self.load(GUNICORN_WORKER_CLASS='uvicorn', GUNICORN_PRELOAD='False')
+        self.assertEqual(config['worker_class'], 'uvicorn_worker.UvicornWorker')
+        self.assertEqual(config['wsgi_app'], 'intern_portal.asgi:application')
+        self.assertEqual(config['environ']['ASYNC_API_VIEWS'], 'True')
+        self.assertFalse(config['preload_app'])
+
+        with self.assertRaises(ValueError):
+            self.load(GUNICORN_WORKER_CLASS='eventlet')
+
 
 class ApplicationAPITest(APITestCase):
     """Test Application API endpoints"""
@@ -376,6 +1598,172 @@ class ApplicationAPITest(APITestCase):
         # Should return 400 or raise IntegrityError (handled by DRF as 400)
         self.assertIn(response.status_code, [status.HTTP_400_BAD_REQUEST, status.HTTP_500_INTERNAL_SERVER_ERROR])
     
+    def test_my_applications_are_compact(self):
+        """Application lists embed summaries rather than full objects"""
+        Application.objects.create(
+            internship=self.internship,
+            student=self.student_profile,
+            cover_letter='I want to apply'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.student_token}')
+        
+        item = self.client.get('/api/applications/my_applications/').data['results'][0]
+        self.assertEqual(item['internship']['title'], 'Test Internship')
+        self.assertNotIn('poster', item['internship'])
+        self.assertEqual(item['student']['username'], 'student')
+        self.assertNotIn('cover_letter', item)
+        
+        item = self.client.get(
+            '/api/applications/my_applications/', {'expand': 'cover_letter,internship'}
+        ).data['results'][0]
+        self.assertEqual(item['cover_letter'], 'I want to apply')
+        self.assertIn('poster', item['internship'])
+    
+    def test_values_list_matches_serializer_output(self):
+        """The .values() list path renders the same bytes as ApplicationListSerializer"""
+        student = self.student_profile.user
+        student.first_name = 'Asha'
+        student.save()
+        Application.objects.create(internship=self.internship, student=self.student_profile)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        
+        for url in ('/api/applications/', f'/api/applications/{self.internship.id}/internship_applications/'):
+            fast = self.client.get(url)
+            slow = self.client.get(url, {'expand': 'none'})
+            self.assertEqual(fast.content, slow.content)
+            self.assertEqual(fast.data['results'][0]['student']['full_name'], 'Asha')
+    
+    def test_bulk_status(self):
+        """Companies can update many applications in one request"""
+        students = [
+            User.objects.create_user(username=f'bulk{i}', password='pass').profile for i in range(3)
+        ]
+        applications = [
+            Application.objects.create(internship=self.internship, student=student) for student in students
+        ]
+        applications[2].status = 'shortlisted'
+        applications[2].save()
+        
+        other_internship = create_internship(create_company('other'), 'Other')
+        foreign = Application.objects.create(internship=other_internship, student=self.student_profile)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        ids = [application.id for application in applications] + [foreign.id, 99999]
+        # Ownership SELECT, one UPDATE, one counter UPDATE per internship and
+        # previous status, plus the transaction savepoint pair
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                '/api/applications/bulk_status/', {'status': 'shortlisted', 'ids': ids}, format='json'
+            )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            [item['result'] for item in response.data['results']],
+            ['updated', 'updated', 'unchanged', 'not_found', 'not_found']
+        )
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'pending')
+        
+        response = self.client.post('/api/applications/bulk_status/', {
+            'status': 'rejected', 'filter': {'internship': self.internship.id, 'status': 'shortlisted'}
+        }, format='json')
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(
+            Application.objects.filter(internship=self.internship, status='rejected').count(), 3
+        )
+        self.internship.refresh_from_db()
+        self.assertEqual((self.internship.rejected_count, self.internship.shortlisted_count), (3, 0))
+    
+    def test_application_counters(self):
+        """Internship counters follow applications being created, moved and deleted"""
+        from io import StringIO
+        from django.core.management import call_command
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.student_token}')
+        response = self.client.post('/api/applications/', {
+            'internship_id': self.internship.id, 'cover_letter': 'Hello'
+        })
+        application_id = response.data['id']
+        self.internship.refresh_from_db()
+        self.assertEqual((self.internship.applications_count, self.internship.pending_count), (1, 1))
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        self.client.patch(f'/api/applications/{application_id}/', {'status': 'shortlisted'})
+        response = self.client.get(f'/api/internships/{self.internship.id}/')
+        self.assertEqual(response.data['applications_count'], 1)
+        self.assertEqual(response.data['status_counts']['pending'], 0)
+        self.assertEqual(response.data['status_counts']['shortlisted'], 1)
+        # Per-status counts are only shown to the posting company
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.student_token}')
+        self.assertIsNone(self.client.get(f'/api/internships/{self.internship.id}/').data['status_counts'])
+        
+        # Writes that bypass the counters drift until recount repairs them
+        Application.objects.filter(pk=application_id).update(status='accepted')
+        output = StringIO()
+        call_command('recount', stdout=output)
+        self.assertIn('Corrected the counters of 1 internships', output.getvalue())
+        self.internship.refresh_from_db()
+        self.assertEqual((self.internship.shortlisted_count, self.internship.accepted_count), (0, 1))
+        
+        Application.objects.get(pk=application_id).delete()
+        self.internship.refresh_from_db()
+        self.assertEqual((self.internship.applications_count, self.internship.accepted_count), (0, 0))
+
+    def test_editing_keeps_concurrent_counts(self):
+        """An application counted while an edit is in flight survives the edit's save"""
+        from unittest import mock
+        from portal.views import InternshipViewSet
+        perform_update = InternshipViewSet.perform_update
+
+        def apply_then_update(view, serializer):
+            # After the view read the internship, before it saves it
+            Application.objects.create(internship=serializer.instance, student=self.student_profile)
+            perform_update(view, serializer)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        with mock.patch.object(InternshipViewSet, 'perform_update', apply_then_update):
+            response = self.client.patch(f'/api/internships/{self.internship.id}/', {'title': 'Renamed'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.internship.refresh_from_db()
+        self.assertEqual(self.internship.title, 'Renamed')
+        self.assertEqual((self.internship.applications_count, self.internship.pending_count), (1, 1))
+
+    def test_bulk_status_filter_is_bounded(self):
+        """A filter may match at most MAX_IDS applications, updated in batches"""
+        from portal.serializers import BulkStatusSerializer
+        users = User.objects.bulk_create([
+            User(username=f'many{i}') for i in range(BulkStatusSerializer.MAX_IDS + 1)
+        ])
+        profiles = Profile.objects.bulk_create([Profile(user=user, role='student') for user in users])
+        Application.objects.bulk_create([
+            Application(internship=self.internship, student=profile) for profile in profiles
+        ])
+        data = {'status': 'rejected', 'filter': {'internship': self.internship.id, 'status': 'pending'}}
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        response = self.client.post('/api/applications/bulk_status/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('filter', response.data)
+        self.assertFalse(Application.objects.filter(status='rejected').exists())
+        
+        Application.objects.filter(student=profiles[0]).delete()
+        # Locking SELECT, two batched UPDATEs, one counter UPDATE, savepoint pair
+        with self.assertNumQueries(6):
+            response = self.client.post('/api/applications/bulk_status/', data, format='json')
+        self.assertEqual(response.data['updated'], BulkStatusSerializer.MAX_IDS)
+        self.assertEqual(Application.objects.filter(status='rejected').count(), BulkStatusSerializer.MAX_IDS)
+    
+    def test_bulk_status_validation(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        for data in ({'status': 'hired', 'ids': [1]}, {'status': 'accepted'}, {'status': 'accepted', 'ids': []},
+                     {'status': 'accepted', 'filter': {}}):
+            response = self.client.post('/api/applications/bulk_status/', data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.student_token}')
+        response = self.client.post('/api/applications/bulk_status/', {'status': 'accepted', 'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
     def test_company_can_update_application_status(self):
         """Company should be able to update application status"""
         application = Application.objects.create(
@@ -392,6 +1780,240 @@ class ApplicationAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['status'], 'accepted')
 
+    def test_export_applications(self):
+        """Exports stream every application with student fields in one query"""
+        import csv
+        import io
+        import json
+        for index in range(3):
+            student = User.objects.create_user(
+                username=f'exported{index}', password='pass', email=f'exported{index}@example.com'
+            ).profile
+            student.college = 'IIT'
+            student.cv.name = f'cvs/exported{index}.pdf'
+            student.save()
+            Application.objects.create(
+                internship=self.internship, student=student, cover_letter='=HYPERLINK("x")'
+            )
+        url = f'/api/applications/{self.internship.id}/export/'
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+
+        with self.assertNumQueries(2):  # ownership check + the export query
+            response = self.client.get(url)
+            body = b''.join(response.streaming_content).decode('utf-8-sig')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('test-internship-applications.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([row['username'] for row in rows], ['exported0', 'exported1', 'exported2'])
+        self.assertEqual(rows[0]['email'], 'exported0@example.com')
+        self.assertTrue(rows[0]['cv'].startswith('http://testserver/media/cvs/exported0.pdf?w='))
+        self.assertEqual(rows[0]['cover_letter'], '\'=HYPERLINK("x")')
+
+        response = self.client.get(url, {'output': 'ndjson'})
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])['college'], 'IIT')
+        self.assertEqual(json.loads(lines[0])['cover_letter'], '=HYPERLINK("x")')
+
+    def test_cv_archive(self):
+        """The CV ZIP streams each applicant's CV, preferring the application copy"""
+        import io
+        import tempfile
+        import zipfile
+        from django.core.files.base import ContentFile
+        from django.test import override_settings
+        from portal import archives
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            self.student_profile.cv.save('profile.pdf', ContentFile(b'%PDF profile'))
+            with_copy = User.objects.create_user(username='with_copy', password='pass').profile
+            application = Application.objects.create(internship=self.internship, student=with_copy)
+            application.cv_copy.save('copy.pdf', ContentFile(b'%PDF copy' * 20000))
+            Application.objects.create(internship=self.internship, student=self.student_profile)
+            missing = User.objects.create_user(username='missing', password='pass').profile
+            missing.cv.name = 'cvs/gone.pdf'
+            missing.save()
+            gone = Application.objects.create(internship=self.internship, student=missing)
+            url = f'/api/applications/{self.internship.id}/cvs/'
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['Content-Type'], 'application/zip')
+            body = b''.join(response.streaming_content)
+            response.close()
+            with zipfile.ZipFile(io.BytesIO(body)) as archive:
+                names = archive.namelist()
+                self.assertEqual(archive.read(names[0]), b'%PDF copy' * 20000)
+                self.assertEqual(archive.read(names[1]), b'%PDF profile')
+                self.assertEqual(archive.read('MISSING.txt').decode().split(), [f'missing-{gone.id}.pdf'])
+            self.assertEqual(names[0], f'with_copy-{application.id}.pdf')
+            self.assertEqual(len(names), 3)
+
+            # Every slot is taken until the responses are closed
+            held = [archives.CVArchive.acquire([]) for _ in range(2)]
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            for archive in held:
+                archive.close()
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response.close()
+
+    def test_export_applications_permissions(self):
+        url = f'/api/applications/{self.internship.id}/export/'
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.company_token}')
+        self.assertEqual(self.client.get(url, {'output': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(f'/api/applications/{self.internship.id + 1}/export/').status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.student_token}')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ORJSONRendererTest(TestCase):
+    """portal.renderers must stay byte-compatible with DRF's JSON classes"""
+    
+    def test_render_matches_json_renderer(self):
+        import uuid
+        from datetime import datetime, time, timezone as dt_timezone
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from portal.renderers import ORJSONRenderer
+        
+        data = {
+            'decimal': Decimal('1.50'),
+            'aware': datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'naive': datetime(2026, 1, 2, 3, 4, 5),
+            'date': date(2026, 1, 2),
+            'time': time(3, 4, 5),
+            'uuid': uuid.UUID(int=1),
+            'lazy': gettext_lazy('Student'),
+            'text': 'naïve \u2028 \u2029 "quoted"',
+            'nested': [(1, 2.5), {3: None, True: 'yes'}],
+            'huge': 2 ** 70,
+        }
+        for media_type in (None, 'application/json; indent=4'):
+            self.assertEqual(
+                ORJSONRenderer().render(data, media_type),
+                JSONRenderer().render(data, media_type)
+            )
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+    
+    def test_parser(self):
+        from io import BytesIO
+        from rest_framework.exceptions import ParseError
+        from portal.renderers import ORJSONParser
+        
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"a": ["é", 1.5]}'.encode())), {'a': ['é', 1.5]})
+        for body in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(BytesIO(body))
+
+
+class RequestMetricsTest(APITestCase):
+    """Request timings and warnings, Prometheus metrics and health probes"""
+
+    def setUp(self):
+        cache.clear()
+        company = create_company('metrics_company')
+        for n in range(3):
+            create_internship(company, f'Role {n}')
+
+    def test_server_timing(self):
+        from django.test import override_settings
+        from django.test.utils import CaptureQueriesContext
+        from django.db import connection
+
+        with override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0), CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/internships/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entries = dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+        self.assertEqual(set(entries), {'db', 'serialize', 'render', 'total'})
+        self.assertIn(f'desc="{len(queries)} queries"', entries['db'])
+
+        with override_settings(REQUEST_METRICS_SAMPLE_RATE=0):
+            response = self.client.get('/api/internships/', HTTP_ACCEPT='application/json')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_flagged_requests_are_logged(self):
+        from django.test import override_settings
+
+        with override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0, REQUEST_QUERY_BUDGET=0):
+            with self.assertLogs('intern_portal.requests', 'WARNING') as logs:
+                self.client.get('/api/internships/')
+        self.assertIn('path=/api/internships/', logs.output[0])
+        self.assertEqual(logs.records[0].request_metrics['query_budget'], 0)
+
+        # The same statement with different parameters counts as a repeat
+        from portal.instrumentation import RequestMetrics
+        metrics = RequestMetrics()
+        execute = lambda sql, params, many, context: None
+        for pk in range(3):
+            metrics.execute(execute, 'SELECT 1 WHERE id = %s', (pk,), False, {})
+        metrics.execute(execute, 'SELECT 2', (), False, {})
+        self.assertEqual(metrics.queries, 4)
+        self.assertEqual(metrics.duplicates(3), [('SELECT 1 WHERE id = %s', 3)])
+
+    def test_prometheus_metrics(self):
+        from django.test import override_settings
+        from prometheus_client import REGISTRY
+
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        labels = {'view': 'InternshipViewSet.list', 'method': 'GET'}
+        requests = sample('portal_requests_total', status='200', **labels)
+        observed = sample('portal_request_duration_seconds_count', **labels)
+        sampled = sample('portal_request_queries_count', view='InternshipViewSet.list')
+        lookups = sample('portal_cache_lookups_total', cache='internship_responses')
+        hits = sample('portal_cache_hits_total', cache='internship_responses')
+        with override_settings(REQUEST_METRICS_SAMPLE_RATE=0):
+            self.client.get('/api/internships/')
+            self.client.get('/api/internships/')
+        self.assertEqual(sample('portal_requests_total', status='200', **labels), requests + 2)
+        self.assertEqual(sample('portal_request_duration_seconds_count', **labels), observed + 2)
+        # Query counts come from sampled requests only
+        self.assertEqual(sample('portal_request_queries_count', view='InternshipViewSet.list'), sampled)
+        self.assertEqual(sample('portal_cache_lookups_total', cache='internship_responses'), lookups + 2)
+        self.assertEqual(sample('portal_cache_hits_total', cache='internship_responses'), hits + 1)
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'portal_requests_total{method="GET",status="200",view="InternshipViewSet.list"}', response.content)
+        self.assertIn(b'portal_workers 1.0', response.content)
+        with override_settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_401_UNAUTHORIZED)
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_metrics_without_resource_module(self):
+        """Windows has no `resource` module: requests are still counted"""
+        from unittest import mock
+        from prometheus_client import REGISTRY
+
+        labels = {'view': 'InternshipViewSet.list', 'method': 'GET', 'status': '200'}
+        requests = REGISTRY.get_sample_value('portal_requests_total', labels) or 0
+        with mock.patch('portal.metrics.resource', None):
+            self.assertEqual(self.client.get('/api/internships/').status_code, status.HTTP_200_OK)
+        self.assertEqual(REGISTRY.get_sample_value('portal_requests_total', labels), requests + 1)
+
+    def test_health_probes(self):
+        from unittest import mock
+        from django.db import OperationalError
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/healthz').content, b'ok')
+        self.assertEqual(self.client.get('/readyz').json(), {'status': 'ok'})
+        with mock.patch('django.db.backends.utils.CursorWrapper.execute', side_effect=OperationalError):
+            response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json(), {'status': 'unavailable', 'database': 'OperationalError'})
+
 
 # ==================== PYTEST EXAMPLES ====================
 
@@ -0,0 +1,451 @@
+"""
+Background processing of uploaded CVs and logos.
+
+Requests only check extension and size (portal.utils) and park the file
+under quarantine/ with an UploadJob row, so they return at once. The
+process_uploads management command works through pending jobs. It
+sniffs the real type from the file's bytes and runs the MIME validators
+on it, extracts CV text for applicant search (portal.search), re-encodes
+logos as WebP plus a thumbnail, and only then moves the file to its
+final location.
+
+The queue is the database table: a worker claims a job with a single
+conditional UPDATE (pending -> processing), which is atomic on every
+backend, so any number of workers can run side by side without a broker.
+
+Large files can also arrive through a resumable UploadSession: the
+client declares the length, then sends the bytes in chunks, each at the
+offset the server reports (tus-style Upload-Offset headers), so an
+interrupted upload continues where it stopped. Chunks are written into a
+file in settings.UPLOAD_SESSION_DIR on local disk, whatever the default
+storage; the leading bytes are checked as soon as they arrive, and the
+complete file is moved to quarantine and queued like any other.
+"""
+import io
+import os
+import re
+import uuid
+import zipfile
+import zlib
+from datetime import timedelta
+from xml.etree import ElementTree
+
+from django.core.exceptions import ValidationError
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import search
+from .models import UploadJob, UploadSession
+from .utils import validate_cv_mime_type, validate_image_mime_type
+
+try:
+    import pypdf
+except ImportError:  # optional; a basic extractor is used without it
+    pypdf = None
+
+QUARANTINE_PREFIX = 'quarantine/'
+MAX_ATTEMPTS = 3
+# Processing jobs not updated for this long are assumed to be orphaned
+STALE_AFTER = timedelta(minutes=10)
+
+# Enough leading bytes for sniff_content_type() to recognise every allowed type
+SNIFF_LENGTH = 12
+SESSION_READ_SIZE = 64 * 1024
+
+MAX_CV_TEXT = 100000
+# Guards against decompression bombs in DOCX/PDF streams and images
+MAX_EXTRACTED_BYTES = 20 * 1024 * 1024
+MAX_LOGO_PIXELS = 25000000
+LOGO_MAX_SIZE = (1024, 1024)
+THUMBNAIL_SIZE = (128, 128)
+
+DOCX_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+EXTENSIONS = {
+    'application/pdf': '.pdf',
+    'application/msword': '.doc',
+    DOCX_TYPE: '.docx',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UploadRejected(Exception):
+    """The file is not what it claims to be; the job fails without retries."""
+
+
+class UploadConflict(Exception):
+    """A chunk was sent for an offset other than the session's current one."""
+
+
+def quarantine_name(original_name, key=None):
+    extension = os.path.splitext(original_name)[1].lower()
+    return f'{QUARANTINE_PREFIX}{key or uuid.uuid4().hex}{extension}'
+
+
+def queue_upload(name, kind, profile, original_name, application=None):
+    return UploadJob.objects.create(
+        kind=kind,
+        profile=profile,
+        application=application,
+        quarantine_name=name,
+        original_name=os.path.basename(original_name)[:255],
+    )
+
+
+def quarantine_upload(uploaded_file, kind, profile, application=None):
+    """Park ``uploaded_file`` for the worker and return its UploadJob."""
+    name = default_storage.save(quarantine_name(uploaded_file.name), uploaded_file)
+    return queue_upload(name, kind, profile, uploaded_file.name, application)
+
+
+# ---- MIME sniffing --------------------------------------------------------
+
+def sniff_content_type(data):
+    """The MIME type of a file from its leading bytes, or None."""
+    if data.startswith(b'%PDF-'):
+        return 'application/pdf'
+    if data.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+        return 'application/msword'
+    if data.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if 'word/document.xml' in archive.namelist():
+                    return DOCX_TYPE
+        except zipfile.BadZipFile:
+            pass
+        return 'application/zip'
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if data.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def sniffed_file(data, name, validator, content_type=None):
+    """
+    A File over ``data`` whose content_type is the sniffed one (or
+    ``content_type``), after running the portal.utils MIME ``validator`` on it.
+    """
+    # Named, since the validators skip files that are falsy (nameless)
+    file = File(io.BytesIO(data), name=name)
+    file.content_type = content_type or sniff_content_type(data) or 'application/octet-stream'
+    try:
+        validator(file)
+    except ValidationError as e:
+        raise UploadRejected(' '.join(e.messages))
+    return file
+
+
+# ---- CV text extraction ---------------------------------------------------
+
+def extract_docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        if archive.getinfo('word/document.xml').file_size > MAX_EXTRACTED_BYTES:
+            return ''
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = (
+        ''.join(node.text or '' for node in paragraph.iter(f'{WORD_NAMESPACE}t'))
+        for paragraph in root.iter(f'{WORD_NAMESPACE}p')
+    )
+    return '\n'.join(paragraphs)
+
+
+PDF_STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+PDF_TEXT_RE = re.compile(rb'\((?:\\.|[^\\)])*\)\s*Tj|\[(?:\\.|[^\]])*\]\s*TJ')
+PDF_STRING_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)')
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+
+def unescape_pdf_string(value):
+    def replace(match):
+        escaped = match.group(1)
+        if escaped[:1].isdigit():
+            return bytes([int(escaped, 8) & 0xFF])
+        return PDF_ESCAPES.get(escaped, escaped)
+    return re.sub(rb'\\([0-7]{1,3}|.)', replace, value, flags=re.S)
+
+
+def extract_pdf_text(data):
+    """
+    Text from a PDF: pypdf when installed, otherwise the literal strings
+    shown by Tj/TJ operators in plain or Flate-compressed content streams
+    (enough for most generated CVs; scanned documents yield nothing).
+    """
+    if pypdf is not None:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+    lines = []
+    budget = MAX_EXTRACTED_BYTES
+    for stream in PDF_STREAM_RE.findall(data):
+        try:
+            content = zlib.decompressobj().decompress(stream, budget)
+        except zlib.error:
+            content = stream
+        budget -= len(content)
+        for operation in PDF_TEXT_RE.findall(content):
+            strings = PDF_STRING_RE.findall(operation)
+            lines.append(b''.join(unescape_pdf_string(value) for value in strings).decode('latin-1'))
+        if budget <= 0:
+            break
+    return '\n'.join(lines)
+
+
+def extract_cv_text(data, content_type):
+    if content_type == DOCX_TYPE:
+        text = extract_docx_text(data)
+    elif content_type == 'application/pdf':
+        text = extract_pdf_text(data)
+    else:
+        # Legacy .doc (OLE) files need external tools; keep the file, skip the text
+        text = ''
+    text = re.sub(r'[ \t\r\f\v]+', ' ', text)
+    text = re.sub(r'\n\s*\n+', '\n', text).strip()
+    return text[:MAX_CV_TEXT]
+
+
+# ---- Logo renditions ------------------------------------------------------
+
+def encode_webp(image, size):
+    image = image.copy()
+    image.thumbnail(size)
+    output = io.BytesIO()
+    image.save(output, 'WEBP', quality=85, method=4)
+    return ContentFile(output.getvalue())
+
+
+def logo_renditions(data):
+    """(full-size WebP, thumbnail WebP) for an image upload."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > MAX_LOGO_PIXELS:
+                raise UploadRejected('Image dimensions are too large.')
+            image.verify()
+        # verify() leaves the image unusable, so decode it again
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+            return encode_webp(image, LOGO_MAX_SIZE), encode_webp(image, THUMBNAIL_SIZE)
+    except (UnidentifiedImageError, Image.DecompressionBombError, SyntaxError, OSError) as e:
+        raise UploadRejected(f'Unreadable image: {e}')
+
+
+# ---- Worker ---------------------------------------------------------------
+
+def reclaim_stale_jobs(stale_after=STALE_AFTER):
+    """Put jobs whose worker died mid-way back in the queue."""
+    return UploadJob.objects.filter(
+        status='processing', updated_at__lt=timezone.now() - stale_after
+    ).update(status='pending', updated_at=timezone.now())
+
+
+def claim_next_job():
+    """Atomically take the oldest pending job, or None if the queue is empty."""
+    while True:
+        candidates = list(
+            UploadJob.objects.filter(status='pending').order_by('created_at', 'pk').values_list('pk', flat=True)[:10]
+        )
+        if not candidates:
+            return None
+        for pk in candidates:
+            claimed = UploadJob.objects.filter(pk=pk, status='pending').update(
+                status='processing', attempts=F('attempts') + 1, updated_at=timezone.now()
+            )
+            if claimed:
+                return UploadJob.objects.select_related('profile', 'application').get(pk=pk)
+
+
+def finish_job(job, status, error=''):
+    job.status = status
+    job.error = error
+    job.save(update_fields=['status', 'error', 'updated_at'])
+    if status != 'pending':
+        default_storage.delete(job.quarantine_name)
+
+
+def final_name(job, content_type):
+    stem = os.path.splitext(job.original_name)[0] or 'upload'
+    return stem + EXTENSIONS.get(content_type, '')
+
+
+def apply_job(job, data):
+    """Validate the quarantined bytes and move them into place."""
+    profile = job.profile
+    if job.kind == 'logo':
+        file = sniffed_file(data, job.original_name, validate_image_mime_type)
+        webp, thumbnail = logo_renditions(data)
+        stem = os.path.splitext(final_name(job, file.content_type))[0]
+        profile.logo.save(final_name(job, file.content_type), file, save=False)
+        profile.logo_webp.save(f'{stem}.webp', webp, save=False)
+        profile.logo_thumbnail.save(f'{stem}.webp', thumbnail, save=False)
+        profile.save(update_fields=['logo', 'logo_webp', 'logo_thumbnail', 'updated_at'])
+        return
+
+    file = sniffed_file(data, job.original_name, validate_cv_mime_type)
+    if job.kind == 'cv':
+        profile.cv_text = extract_cv_text(data, file.content_type)
+        profile.cv.save(final_name(job, file.content_type), file, save=False)
+        profile.save(update_fields=['cv', 'cv_text', 'updated_at'])
+        search.index_cv(profile)
+    else:
+        application = job.application
+        application.cv_copy.save(final_name(job, file.content_type), file, save=False)
+        application.save(update_fields=['cv_copy', 'updated_at'])
+
+
+def process_job(job):
+    """Run one claimed job to a final (or retryable) state; returns the status."""
+    newer = UploadJob.objects.filter(
+        profile_id=job.profile_id, kind=job.kind, application_id=job.application_id, pk__gt=job.pk
+    ).exclude(status='failed')
+    if newer.exists():
+        finish_job(job, 'superseded')
+        return job.status
+
+    try:
+        with default_storage.open(job.quarantine_name, 'rb') as source:
+            data = source.read()
+        apply_job(job, data)
+    except UploadRejected as e:
+        finish_job(job, 'failed', str(e))
+    except Exception as e:
+        if job.attempts >= MAX_ATTEMPTS:
+            finish_job(job, 'failed', f'Processing failed: {e}')
+        else:
+            finish_job(job, 'pending', str(e))
+    else:
+        finish_job(job, 'done')
+    return job.status
+
+
+def process_pending(limit=None):
+    """Process queued jobs until the queue is empty (or ``limit`` jobs); returns the count."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        process_job(job)
+        processed += 1
+    return processed
+
+
+# ---- Resumable sessions ---------------------------------------------------
+
+def session_path(session):
+    """The local file a session's chunks are written to."""
+    return os.path.join(settings.UPLOAD_SESSION_DIR, session.partial_name)
+
+
+def open_session(kind, profile, original_name, length, application=None):
+    """Start a resumable upload of ``length`` bytes; the file is created empty."""
+    key = uuid.uuid4()
+    session = UploadSession(
+        id=key,
+        kind=kind,
+        profile=profile,
+        application=application,
+        original_name=os.path.basename(original_name)[:255],
+        partial_name=key.hex,
+        length=length,
+    )
+    os.makedirs(settings.UPLOAD_SESSION_DIR, exist_ok=True)
+    open(session_path(session), 'xb').close()
+    session.save(force_insert=True)
+    return session
+
+
+def check_leading_bytes(session):
+    """Reject a session as soon as its first bytes cannot start a valid file."""
+    with open(session_path(session), 'rb') as partial:
+        data = partial.read(SNIFF_LENGTH)
+    content_type = sniff_content_type(data)
+    if content_type == 'application/zip':
+        # Only a complete DOCX can be told from other ZIPs; the worker checks it
+        content_type = DOCX_TYPE
+    validator = validate_image_mime_type if session.kind == 'logo' else validate_cv_mime_type
+    sniffed_file(data, session.original_name, validator, content_type or 'application/octet-stream')
+
+
+def append_chunk(session, offset, stream, size):
+    """
+    Write up to ``size`` bytes from ``stream`` at ``offset`` and advance
+    the session by what arrived, so a dropped connection keeps its
+    progress. Once complete the file is queued and ``session.job`` set.
+    Raises UploadConflict for a stale offset and UploadRejected for bytes
+    that are not an allowed file (the session is then discarded).
+    """
+    if session.job_id is not None or offset != session.offset:
+        raise UploadConflict(session.offset)
+    if offset + size > session.length:
+        raise UploadRejected('Chunk extends past the declared upload length.')
+
+    written = 0
+    with open(session_path(session), 'r+b') as partial:
+        partial.seek(offset)
+        while written < size:
+            try:
+                chunk = stream.read(min(SESSION_READ_SIZE, size - written))
+            except OSError:  # client went away mid-chunk
+                break
+            if not chunk:
+                break
+            partial.write(chunk)
+            written += len(chunk)
+
+    # Conditional, like claim_next_job(): of two requests racing for the
+    # same offset only one advances it
+    advanced = UploadSession.objects.filter(pk=session.pk, offset=offset, job__isnull=True).update(
+        offset=offset + written, updated_at=timezone.now()
+    )
+    if not advanced:
+        session.refresh_from_db(fields=['offset', 'job'])
+        raise UploadConflict(session.offset)
+    session.offset = offset + written
+
+    if offset < min(SNIFF_LENGTH, session.length) <= session.offset:
+        try:
+            check_leading_bytes(session)
+        except UploadRejected:
+            discard_session(session)
+            raise
+
+    if session.offset == session.length:
+        with open(session_path(session), 'rb') as partial:
+            name = default_storage.save(quarantine_name(session.original_name, session.partial_name), File(partial))
+        os.remove(session_path(session))
+        session.job = queue_upload(name, session.kind, session.profile, session.original_name, session.application)
+        session.save(update_fields=['job', 'updated_at'])
+    return session
+
+
+def discard_session(session):
+    """Delete a session and, unless it was handed to the worker, its partial file."""
+    if session.job_id is None:
+        try:
+            os.remove(session_path(session))
+        except FileNotFoundError:
+            pass
+    session.delete()
+
+
+def expire_sessions(max_age=None):
+    """Discard sessions untouched for settings.UPLOAD_SESSION_TTL seconds; returns the count."""
+    max_age = timedelta(seconds=settings.UPLOAD_SESSION_TTL) if max_age is None else max_age
+    expired = UploadSession.objects.filter(updated_at__lt=timezone.now() - max_age)
+    count = 0
+    for session in expired.iterator():
+        discard_session(session)
+        count += 1
+    return count
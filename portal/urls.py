@@ -1,13 +1,27 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
-from .views import InternshipViewSet, ApplicationViewSet, ProfileView, register_user
+from .views import InternshipViewSet, ApplicationViewSet, UploadJobViewSet, UploadSessionViewSet, ProfileView, register_user
 
 router = DefaultRouter()
 router.register(r'internships', InternshipViewSet, basename='internship')
 router.register(r'applications', ApplicationViewSet, basename='application')
+router.register(r'uploads', UploadJobViewSet, basename='upload')
+router.register(r'upload-sessions', UploadSessionViewSet, basename='upload-session')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('profile/', ProfileView.as_view(), name='profile'),
     path('register/', register_user, name='register'),
 ]
+
+if settings.ASYNC_API_VIEWS:
+    from . import async_views
+
+    # Ahead of the router's routes for the same URLs
+    urlpatterns = [
+        path('internships/', async_views.internship_list_view),
+        # Numeric ids only: internships/recommended/ and other actions stay with the router
+        re_path(r'^internships/(?P<pk>[0-9]+)/$', async_views.internship_detail_view),
+        path('applications/my_applications/', async_views.my_applications_view),
+    ] + urlpatterns
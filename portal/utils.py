@@ -1,5 +1,6 @@
 from django.core.exceptions import ValidationError
 import os
+import re
 
 
 def validate_file_size(file, max_size_mb=5):
@@ -85,3 +86,27 @@ def validate_image_mime_type(file):
             raise ValidationError(
                 f'Invalid image type. Must be JPEG, PNG, GIF, or WebP.'
             )
+
+
+def canonicalize_skill(name):
+    """
+    Canonical form used to match skills: trimmed, lower-cased and with
+    internal whitespace collapsed, so "  Machine   Learning" == "machine learning".
+    """
+    return re.sub(r'\s+', ' ', name or '').strip().lower()
+
+
+def parse_skills(text):
+    """
+    Parse a comma-separated skills string.
+    Returns a dict of canonical name -> display name, in input order,
+    with duplicates and empty entries dropped. Both are cut to the 100
+    characters Skill stores.
+    """
+    skills = {}
+    for raw in (text or '').split(','):
+        display = re.sub(r'\s+', ' ', raw).strip()[:100]
+        name = canonicalize_skill(display)[:100]
+        if name and name not in skills:
+            skills[name] = display
+    return skills
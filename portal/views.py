@@ -1,45 +1,238 @@
-from rest_framework import viewsets, status, filters
+from collections import Counter
+from functools import partial
+
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes, authentication_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
-from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef, Value
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.files.storage import default_storage
 from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .models import Profile, Internship, Application
+from .models import Profile, Internship, Application, UploadJob, UploadSession
 from .serializers import (
-    ProfileSerializer, InternshipSerializer, 
-    ApplicationSerializer, ApplicationStatusSerializer, UserSerializer
+    ProfileSerializer, InternshipSerializer, InternshipListSerializer,
+    ApplicationSerializer, ApplicationListSerializer, ApplicationStatusSerializer, BulkStatusSerializer,
+    UploadJobSerializer, UploadSessionSerializer, UserSerializer, SparseFieldsetMixin
+)
+from .fast_serializers import InternshipListValuesSerializer, ApplicationListValuesSerializer
+from .authentication import load_account
+from .exports import EXPORT_FORMATS, export_response
+from .archives import CVArchive, archive_entries, archive_response
+from .media import can_access, clean_media_name, media_response
+from .uploads import (
+    UploadConflict, UploadRejected, append_chunk, discard_session, open_session, quarantine_upload
 )
 from .permissions import IsCompany, IsStudent, IsCompanyOwner
+from .search import search_applicants, search_internships, RankedOrderingFilter
+from .skills import filter_by_skills
+from .recommendations import recommend
+from .pagination import StandardResultsPagination, HybridPagination
+from . import caching, conditional, counters
+
+
+class SparseFieldsetViewMixin:
+    """
+    Pass `?fields=a,b` and `?expand=c` through to serializers that
+    support sparse fieldsets.
+    """
+    def get_list_param(self, name):
+        return [item for item in self.request.query_params.get(name, '').split(',') if item]
+    
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), SparseFieldsetMixin):
+            kwargs.setdefault('fields', self.get_list_param('fields'))
+            kwargs.setdefault('expand', self.get_list_param('expand'))
+        return super().get_serializer(*args, **kwargs)
 
 
-class StandardResultsPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+class ValuesListMixin(SparseFieldsetViewMixin):
+    """
+    Serve list payloads without `expand` through `values_serializer_class`
+    (see portal.fast_serializers), which reads `.values()` rows instead of
+    model instances. Anything else goes through the regular serializer.
+    """
+    values_serializer_class = None
+    
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+    
+    def uses_values_serializer(self):
+        return self.values_serializer_class is not None and not self.get_list_param('expand')
+    
+    def get_values_serializer(self):
+        return self.values_serializer_class(request=self.request, fields=self.get_list_param('fields'))
+    
+    def list_response(self, queryset):
+        if not self.uses_values_serializer():
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+        
+        serializer = self.get_values_serializer()
+        rows = serializer.values(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
 
 
-class InternshipViewSet(viewsets.ModelViewSet):
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for the `conditional_actions` among `list`
+    and `retrieve` (see portal.conditional). `version_fields` are the
+    `updated_at` columns, on the model and across forward relations, that
+    the response depends on.
+    """
+    conditional_actions = ('list', 'retrieve')
+    version_fields = ('updated_at',)
+    
+    def get_version_queryset(self):
+        return self.get_queryset()
+    
+    def conditional_response(self, request, queryset, respond, require_rows=False):
+        return conditional.conditional_response(
+            request, queryset, self.version_fields, respond, require_rows=require_rows
+        )
+    
+    def list(self, request, *args, **kwargs):
+        respond = partial(super().list, request, *args, **kwargs)
+        if 'list' not in self.conditional_actions:
+            return respond()
+        return self.conditional_response(request, self.get_version_queryset(), respond)
+    
+    def retrieve(self, request, *args, **kwargs):
+        respond = partial(super().retrieve, request, *args, **kwargs)
+        if 'retrieve' not in self.conditional_actions:
+            return respond()
+        queryset = self.get_version_queryset().filter(pk=kwargs.get('pk'))
+        return self.conditional_response(request, queryset, respond, require_rows=True)
+
+
+class CachedResponseMixin:
+    """
+    Serve `list` and `retrieve` from the response cache in portal.caching
+    for anonymous users and students. Companies get their own internships
+    (including inactive ones), so their requests always bypass the cache.
+    """
+    # True while building a response that is shared through the cache
+    shared_response = False
+    
+    def get_cache_profile(self, request):
+        """(cacheable, student profile or None) for this request."""
+        if request.query_params.get('my_internships'):
+            return False, None
+        user = request.user
+        profile = getattr(user, 'profile', None) if user.is_authenticated else None
+        if profile is None:
+            return True, None
+        if profile.role == 'student':
+            return True, profile
+        return False, None
+    
+    def get_cache_target(self, request, pk):
+        """(cacheable, student profile or None, pk as an int) for this request."""
+        cacheable, student = self.get_cache_profile(request)
+        if pk is not None:
+            try:
+                pk = int(pk)
+            except ValueError:
+                cacheable = False
+        return cacheable, student, pk
+    
+    def cached_response(self, request, handler, *args, **kwargs):
+        cacheable, student, pk = self.get_cache_target(request, kwargs.get('pk'))
+        if not cacheable:
+            return handler(request, *args, **kwargs)
+        
+        key = caching.response_cache_key(request, self.action, pk)
+        data = caching.get_cached_response(key)
+        cache_status = 'HIT'
+        if data is None:
+            cache_status = 'MISS'
+            self.shared_response = True
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            caching.set_cached_response(key, data)
+        if student is not None:
+            data = caching.merge_has_applied(data, student)
+        return Response(data, headers={'X-Cache': cache_status})
+    
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+
+class InternshipViewSet(ConditionalGetMixin, CachedResponseMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Internship.objects.all()
     serializer_class = InternshipSerializer
-    pagination_class = StandardResultsPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description', 'skills_required', 'location']
+    values_serializer_class = InternshipListValuesSerializer
+    # Internship.updated_at is also touched when applications change.
+    # Listings are left to the response cache: a version aggregate over
+    # every matching internship would cost more than a cache hit.
+    conditional_actions = ('retrieve',)
+    version_fields = ('updated_at', 'poster__updated_at')
+    pagination_class = HybridPagination
+    keyset_ordering = ('-created_at', '-id')
+    # Text search (`q`, or DRF's `search`) goes through portal.search
+    filter_backends = [RankedOrderingFilter]
     ordering_fields = ['created_at', 'stipend', 'last_date']
     ordering = ['-created_at']
     
+    def get_version_queryset(self):
+        return self.filter_queryset_params()
+    
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             permission_classes = [IsAuthenticated, IsCompany]
+        elif self.action == 'recommended':
+            permission_classes = [IsAuthenticated, IsStudent]
         else:
             permission_classes = [AllowAny]
         return [permission() for permission in permission_classes]
     
+    def get_serializer_class(self):
+        if self.action in ['list', 'recommended']:
+            return InternshipListSerializer
+        return InternshipSerializer
+    
+    def annotate_queryset(self, queryset):
+        """
+        Attach everything InternshipSerializer needs so a page costs a fixed
+        number of queries instead of several per row.
+        """
+        # applications_count is a column (portal.counters), not an aggregate
+        queryset = queryset.select_related('poster__user')
+        user = self.request.user
+        # Cached responses are built as anonymous users see them;
+        # CachedResponseMixin merges in has_applied per student.
+        if self.shared_response:
+            user = AnonymousUser()
+        if user.is_authenticated and hasattr(user, 'profile') and user.profile.role == 'student':
+            return queryset.annotate(
+                user_has_applied=Exists(
+                    Application.objects.filter(internship=OuterRef('pk'), student=user.profile)
+                )
+            )
+        return queryset.annotate(user_has_applied=Value(False))
+    
     def get_queryset(self):
+        return self.annotate_queryset(self.filter_queryset_params())
+    
+    def filter_queryset_params(self):
         queryset = Internship.objects.filter(is_active=True)
         
         # For retrieve action (getting single internship), allow company to see their own even if not active
@@ -64,17 +257,15 @@ class InternshipViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(poster=self.request.user.profile)
         
         # Search filters
-        q = self.request.query_params.get('q')
+        q = self.request.query_params.get('q') or self.request.query_params.get('search')
         if q:
-            queryset = queryset.filter(
-                Q(title__icontains=q) | 
-                Q(description__icontains=q) |
-                Q(skills_required__icontains=q)
-            )
+            queryset = search_internships(queryset, q)
         
+        # skills=python,django matches any of them; add skills_match=all to require every one
         skills = self.request.query_params.get('skills')
         if skills:
-            queryset = queryset.filter(skills_required__icontains=skills)
+            match = self.request.query_params.get('skills_match', 'any')
+            queryset = filter_by_skills(queryset, skills, match=match)
         
         location = self.request.query_params.get('location')
         if location:
@@ -87,7 +278,8 @@ class InternshipViewSet(viewsets.ModelViewSet):
         return queryset
     
     def perform_create(self, serializer):
-        serializer.save(poster=self.request.user.profile)
+        # The response embeds the full poster profile
+        serializer.save(poster=load_account(self.request.user))
     
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -106,31 +298,70 @@ class InternshipViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         return super().destroy(request, *args, **kwargs)
+    
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        """Active internships ranked by skill overlap with the current student"""
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response(
+                {"detail": "limit must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        scores = dict(recommend(request.user.profile.pk, limit))
+        internships = self.annotate_queryset(Internship.objects.filter(pk__in=scores))
+        internships = sorted(internships, key=lambda internship: (-scores[internship.pk], -internship.pk))
+        
+        data = self.get_serializer(internships, many=True).data
+        for item in data:
+            item['match_score'] = scores[item['id']]
+        return Response(data)
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
-    pagination_class = StandardResultsPagination
+    values_serializer_class = ApplicationListValuesSerializer
+    version_fields = (
+        'updated_at', 'internship__updated_at', 'internship__poster__updated_at', 'student__updated_at'
+    )
+    pagination_class = HybridPagination
+    keyset_ordering = ('-applied_at', '-id')
     permission_classes = [IsAuthenticated]
     
+    list_actions = ['list', 'my_applications', 'internship_applications']
+    # Ids per UPDATE in bulk_status (SQLite allows 999 parameters in older builds)
+    bulk_update_batch_size = 500
+    
     def get_queryset(self):
         user = self.request.user
         
         if hasattr(user, 'profile'):
             if user.profile.role == 'student':
                 # Students see their own applications
-                return Application.objects.filter(student=user.profile)
+                return self.related_queryset(Application.objects.filter(student=user.profile))
             elif user.profile.role == 'company':
                 # Companies see applications to their internships
-                return Application.objects.filter(internship__poster=user.profile)
+                applications = Application.objects.filter(internship__poster=user.profile)
+                return self.related_queryset(self.filter_applicants(applications))
         
         return Application.objects.none()
     
+    def filter_applicants(self, queryset):
+        """Narrow a company's applications to applicants whose CV matches ?q="""
+        q = self.request.query_params.get('q', '').strip()
+        return search_applicants(queryset, q) if q else queryset
+    
+    def related_queryset(self, queryset):
+        """Join the rows the serializer for this action walks into."""
+        return queryset.select_related('internship__poster__user', 'student__user')
+    
     def get_permissions(self):
         if self.action == 'create':
             permission_classes = [IsAuthenticated, IsStudent]
-        elif self.action in ['update', 'partial_update']:
+        elif self.action in ['update', 'partial_update', 'bulk_status']:
             permission_classes = [IsAuthenticated, IsCompany]
         else:
             permission_classes = [IsAuthenticated]
@@ -139,6 +370,8 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ['update', 'partial_update']:
             return ApplicationStatusSerializer
+        if self.action in self.list_actions:
+            return ApplicationListSerializer
         return ApplicationSerializer
     
     def perform_create(self, serializer):
@@ -156,7 +389,23 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'detail': 'This internship is no longer accepting applications'})
         
-        serializer.save(student=self.request.user.profile)
+        cv_copy = serializer.validated_data.pop('cv_copy', None)
+        student = load_account(self.request.user)
+        # Snapshot the profile CV; blobs are shared, so this copies nothing
+        # and the application keeps it if the student replaces theirs.
+        # Atomic, so the internship's counters (portal.counters) move with the row.
+        with transaction.atomic():
+            application = serializer.save(student=student, cv_copy=student.cv.name or None)
+        if cv_copy:
+            self.upload_jobs = [quarantine_upload(cv_copy, 'application_cv', application.student, application)]
+    
+    def create(self, request, *args, **kwargs):
+        self.upload_jobs = []
+        response = super().create(request, *args, **kwargs)
+        if self.upload_jobs:
+            # The CV copy is attached once the process_uploads worker has checked it
+            response.data['uploads'] = UploadJobSerializer(self.upload_jobs, many=True).data
+        return response
     
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -167,6 +416,61 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             )
         return super().update(request, *args, **kwargs)
     
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """
+        Set the status of many applications to the company's internships:
+        {"status": "shortlisted", "ids": [1, 2]} or
+        {"status": "rejected", "filter": {"internship": 3, "status": "pending"}}.
+        Ids that do not exist or belong to another company are reported as
+        not_found. A filter may match at most BulkStatusSerializer.MAX_IDS
+        applications.
+        """
+        from rest_framework.exceptions import ValidationError
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data['status']
+        ids = serializer.validated_data.get('ids')
+        limit = BulkStatusSerializer.MAX_IDS
+        
+        owned = Application.objects.filter(internship__poster=request.user.profile)
+        if ids is not None:
+            owned = owned.filter(pk__in=ids)
+        else:
+            owned = owned.filter(**serializer.validated_data['filter'])
+        
+        with transaction.atomic():
+            rows = owned.select_for_update(of=('self',)).values_list('pk', 'status', 'internship_id')
+            if ids is None:
+                # Lock no more than one row past the limit to find out it is exceeded
+                rows = rows.order_by('pk')[:limit + 1]
+            current = {pk: (application_status, internship_id) for pk, application_status, internship_id in rows}
+            if len(current) > limit:
+                raise ValidationError({
+                    'filter': [f'Matches more than {limit} applications; narrow it down or pass ids.']
+                })
+            changed = [pk for pk, (application_status, _) in current.items() if application_status != target]
+            now = timezone.now()
+            # In batches, to stay under the database's limit on query parameters
+            for start in range(0, len(changed), self.bulk_update_batch_size):
+                Application.objects.filter(
+                    pk__in=changed[start:start + self.bulk_update_batch_size]
+                ).update(status=target, updated_at=now)
+            # One counter update per (internship, previous status)
+            moves = Counter(current[pk] for pk in changed)
+            for (previous, internship_id), count in moves.items():
+                counters.status_changed(internship_id, previous, target, count)
+        
+        changed = set(changed)
+        results = [
+            {
+                'id': pk,
+                'result': 'not_found' if pk not in current else 'updated' if pk in changed else 'unchanged'
+            }
+            for pk in (ids if ids is not None else sorted(current))
+        ]
+        return Response({'status': target, 'updated': len(changed), 'results': results})
+    
     @action(detail=False, methods=['get'])
     def my_applications(self, request):
         """Get applications by the current student"""
@@ -176,14 +480,8 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        applications = Application.objects.filter(student=request.user.profile)
-        page = self.paginate_queryset(applications)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(applications, many=True)
-        return Response(serializer.data)
+        applications = self.related_queryset(Application.objects.filter(student=request.user.profile))
+        return self.conditional_response(request, applications, partial(self.list_response, applications))
     
     @action(detail=True, methods=['get'])
     def internship_applications(self, request, pk=None):
@@ -202,14 +500,156 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        applications = self.filter_applicants(Application.objects.filter(internship=internship))
+        applications = self.related_queryset(applications)
+        return self.conditional_response(request, applications, partial(self.list_response, applications))
+    
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Stream every application for one of the company's internships as
+        CSV (default) or NDJSON: ?output=csv|ndjson
+        """
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"output must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        internship, error = self.get_company_internship(request, pk)
+        if error is not None:
+            return error
+        
         applications = Application.objects.filter(internship=internship)
-        page = self.paginate_queryset(applications)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        return export_response(applications, request, output, f'{internship.title}-applications')
+    
+    @action(detail=True, methods=['get'])
+    def cvs(self, request, pk=None):
+        """
+        Stream a ZIP of every applicant's CV for one of the company's
+        internships (the copy sent with the application, else the profile CV)
+        """
+        internship, error = self.get_company_internship(request, pk)
+        if error is not None:
+            return error
+        
+        entries = archive_entries(Application.objects.filter(internship=internship))
+        archive = CVArchive.acquire(entries)
+        if archive is None:
+            return Response(
+                {"detail": "Too many CV downloads in progress, try again shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': '10'}
+            )
+        return archive_response(archive, f'{internship.title}-cvs')
+    
+    def get_company_internship(self, request, pk):
+        """(internship, None) if it belongs to the requesting company, else (None, error response)"""
+        if not hasattr(request.user, 'profile') or request.user.profile.role != 'company':
+            return None, Response(
+                {"detail": "Only companies can access this endpoint."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        internship = Internship.objects.filter(pk=pk, poster=request.user.profile).only('id', 'title').first()
+        if internship is None:
+            return None, Response(
+                {"detail": "Internship not found or you don't have permission."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return internship, None
+
+
+class UploadJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Processing state of the current user's uploads (see portal.uploads)"""
+    serializer_class = UploadJobSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        profile = getattr(self.request.user, 'profile', None)
+        if profile is None:
+            return UploadJob.objects.none()
+        return UploadJob.objects.filter(profile=profile).order_by('-created_at')
+
+
+class UploadSessionViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Resumable uploads (see portal.uploads). POST declares the file and
+    returns its URL; each PATCH sends the next chunk as a raw
+    application/offset+octet-stream body with the Upload-Offset it starts
+    at; HEAD (or GET) reports the offset to resume from after a failure.
+    The finished file is processed like a direct upload (`upload`).
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    CHUNK_CONTENT_TYPES = ('application/offset+octet-stream', 'application/octet-stream')
+    
+    def get_queryset(self):
+        profile = getattr(self.request.user, 'profile', None)
+        if profile is None:
+            return UploadSession.objects.none()
+        return UploadSession.objects.filter(profile=profile).select_related('job')
+    
+    def progress_response(self, session, status_code=status.HTTP_200_OK):
+        response = Response(self.get_serializer(session).data, status=status_code)
+        response['Upload-Offset'] = str(session.offset)
+        response['Upload-Length'] = str(session.length)
+        response['Cache-Control'] = 'no-store'
+        return response
+    
+    def create(self, request, *args, **kwargs):
+        profile = getattr(request.user, 'profile', None)
+        if profile is None:
+            from rest_framework.exceptions import PermissionDenied
+            raise PermissionDenied('Only accounts with a profile can upload files.')
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        session = open_session(
+            data['kind'], profile, data['original_name'], data['length'], data.get('application')
+        )
+        response = self.progress_response(session, status.HTTP_201_CREATED)
+        response['Location'] = request.build_absolute_uri(f'{session.pk}/')
+        return response
+    
+    def retrieve(self, request, *args, **kwargs):
+        return self.progress_response(self.get_object())
+    
+    def partial_update(self, request, *args, **kwargs):
+        session = self.get_object()
+        if request.content_type.split(';')[0].strip() not in self.CHUNK_CONTENT_TYPES:
+            return Response(
+                {"detail": "Chunks must be sent as application/offset+octet-stream."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            size = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "Upload-Offset and Content-Length headers are required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if size > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response(
+                {"detail": f"Chunks cannot exceed {settings.UPLOAD_CHUNK_MAX_SIZE} bytes."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
         
-        serializer = self.get_serializer(applications, many=True)
-        return Response(serializer.data)
+        try:
+            # The raw request stream: the body is never buffered in memory
+            session = append_chunk(session, offset, request.stream, size)
+        except UploadConflict:
+            response = self.progress_response(session, status.HTTP_409_CONFLICT)
+            response.data = {"detail": "Upload-Offset does not match the upload.", "offset": session.offset}
+            return response
+        except UploadRejected as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return self.progress_response(session)
+    
+    def perform_destroy(self, instance):
+        discard_session(instance)
 
 
 class ProfileView(APIView):
@@ -223,8 +663,13 @@ class ProfileView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        serializer = ProfileSerializer(request.user.profile)
-        return Response(serializer.data)
+        profile = load_account(request.user)
+        return conditional.conditional_response(
+            request,
+            Profile.objects.filter(pk=profile.pk),
+            ['updated_at'],
+            lambda: Response(ProfileSerializer(profile).data)
+        )
     
     def patch(self, request):
         """Update current user's profile"""
@@ -235,13 +680,12 @@ class ProfileView(APIView):
             )
         
         serializer = ProfileSerializer(
-            request.user.profile, 
+            load_account(request.user), 
             data=request.data, 
             partial=True
         )
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
+            return self.save_profile(serializer)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     def put(self, request):
@@ -253,13 +697,30 @@ class ProfileView(APIView):
             )
         
         serializer = ProfileSerializer(
-            request.user.profile, 
+            load_account(request.user), 
             data=request.data
         )
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
+            return self.save_profile(serializer)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    def save_profile(self, serializer):
+        """
+        Save the profile; uploaded CV and logo files are queued for the
+        process_uploads worker instead and reported under `uploads` (202).
+        """
+        files = {
+            kind: serializer.validated_data.pop(field)
+            for field, kind in (('cv', 'cv'), ('logo', 'logo'))
+            if serializer.validated_data.get(field)
+        }
+        profile = serializer.save()
+        if not files:
+            return Response(serializer.data)
+        
+        jobs = [quarantine_upload(file, kind, profile) for kind, file in files.items()]
+        data = dict(serializer.data, uploads=UploadJobSerializer(jobs, many=True).data)
+        return Response(data, status=status.HTTP_202_ACCEPTED)
 
 
 @api_view(['POST'])
@@ -342,3 +803,16 @@ def register_user(request):
             {"detail": f"Registration failed: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@api_view(['GET', 'HEAD'])
+@permission_classes([AllowAny])
+def serve_media(request, path):
+    """
+    Serve an uploaded file to whoever may see it (see portal.media);
+    anyone else gets the same 404 as for a missing file
+    """
+    name = clean_media_name(path)
+    if name is None or not can_access(request, name) or not default_storage.exists(name):
+        raise Http404
+    return media_response(request, name)
@@ -1,48 +1,58 @@
 """
-Production WSGI Server for Windows
-Uses Waitress (Windows-compatible alternative to Gunicorn)
+Production server launcher
+
+Runs gunicorn with gunicorn.conf.py, which takes its settings from
+GUNICORN_* environment variables (worker class, worker count, preloading,
+recycling, keep-alive; see that file). Extra arguments are passed on to
+gunicorn:
+
+    python run_production.py
+    GUNICORN_WORKER_CLASS=uvicorn python run_production.py --log-level debug
+
+Gunicorn does not run on Windows; there the WSGI app is served by
+Waitress instead, with GUNICORN_THREADS threads.
 """
 
 import os
+import runpy
+import sys
 
 # Set production environment BEFORE importing Django
 os.environ['DEBUG'] = 'False'
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intern_portal.settings')
 
-from waitress import serve
-from intern_portal.wsgi import application
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG = os.path.join(BASE_DIR, 'gunicorn.conf.py')
+
+
+def serve_waitress():
+    from waitress import serve
+    from intern_portal.wsgi import application
+
+    threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+    print(f"Waitress on 0.0.0.0:8000, {threads} threads")
+    serve(application, host='0.0.0.0', port=8000, threads=threads, url_scheme='http', channel_timeout=120)
+
 
 if __name__ == '__main__':
+    if os.name == 'nt':
+        serve_waitress()
+        sys.exit()
+
+    # The settings gunicorn will resolve from the same environment
+    config = runpy.run_path(CONFIG)
     print("=" * 60)
     print("PRODUCTION SERVER STARTING")
     print("=" * 60)
-    print("")
-    print("Server Configuration:")
-    print("  * Host: 0.0.0.0")
-    print("  * Port: 8000")
-    print("  * Threads: 4")
-    print("")
-    print("Access Points:")
-    print("  * Frontend:  http://localhost:8000")
-    print("  * API:       http://localhost:8000/api/")
-    print("  * Admin:     http://localhost:8000/admin/")
-    print("")
-    print("Default Credentials:")
-    print("  * Admin:    admin / admin123")
-    print("  * Company:  techcorp / password123")
-    print("  * Students: john_doe, jane_smith, alex_kumar / password123")
-    print("")
-    print("=" * 60)
-    print("Press Ctrl+C to stop the server")
-    print("=" * 60)
-    print("")
-    
-    # Start Waitress production server
-    serve(
-        application,
-        host='0.0.0.0',
-        port=8000,
-        threads=4,
-        url_scheme='http',
-        channel_timeout=120
-    )
+    print(f"  * Bind:          {config['bind']}")
+    print(f"  * App:           {config['wsgi_app']}")
+    print(f"  * Worker class:  {config['worker_kind']}")
+    print(f"  * Workers:       {config['workers']}"
+          + (f" x {config['threads']} threads" if config['threads'] > 1 else ""))
+    print(f"  * Preload:       {config['preload_app']}")
+    print(f"  * Max requests:  {config['max_requests']} (+0-{config['max_requests_jitter']})")
+    print(f"  * Keep-alive:    {config['keepalive']}s, timeout {config['timeout']}s")
+    print("=" * 60, flush=True)
+
+    os.chdir(BASE_DIR)
+    os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '--config', CONFIG, *sys.argv[1:]])
@@ -58,12 +58,6 @@ echo "Press Ctrl+C to stop the server"
 echo "================================"
 echo ""
 
-# Start Gunicorn server
-gunicorn \
-    --bind 0.0.0.0:8000 \
-    --workers 3 \
-    --timeout 120 \
-    --access-logfile - \
-    --error-logfile - \
-    --log-level info \
-    intern_portal.wsgi:application
+# Start Gunicorn server (settings in gunicorn.conf.py)
+export GUNICORN_ACCESS_LOG=${GUNICORN_ACCESS_LOG:--}
+exec python run_production.py